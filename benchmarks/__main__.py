@@ -0,0 +1,219 @@
+# ------------------------------------------------------------------------------
+# CodeHawk C Analyzer
+# Author: Henny Sipma
+# ------------------------------------------------------------------------------
+# The MIT License (MIT)
+#
+# Copyright (c) 2026  Aarno Labs LLC
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ------------------------------------------------------------------------------
+"""Command-line interface to the synthetic result-processing benchmarks.
+
+> python -m benchmarks generate <targetpath>
+
+writes a synthetic project (analysis results only) to targetpath.
+
+> python -m benchmarks run --output results.json [--baseline base.json]
+
+generates a project in a temporary (or given) work directory, times the
+load, link, update_spos, save, and report stages, and saves the results in
+json; if a baseline is given the results are compared against it.
+
+> python -m benchmarks compare results.json base.json --threshold 0.10
+
+compares two saved results; the exit code is 1 if any stage regressed by
+more than the threshold.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+from typing import Any, Dict, NoReturn
+
+from benchmarks.synthetic import SyntheticSpec, generate_project
+
+
+def add_spec_arguments(parser: argparse.ArgumentParser) -> None:
+    default = SyntheticSpec()
+    for field in SyntheticSpec.fields:
+        parser.add_argument(
+            "--" + field,
+            type=int,
+            default=getattr(default, field),
+            help="number of " + field + " (default: %(default)s)")
+
+
+def spec_from_args(args: argparse.Namespace) -> SyntheticSpec:
+    return SyntheticSpec.from_dict(
+        {field: getattr(args, field) for field in SyntheticSpec.fields})
+
+
+def load_results(filename: str) -> Dict[str, Any]:
+    try:
+        with open(filename, "r") as fp:
+            return json.load(fp)
+    except (OSError, ValueError) as e:
+        print("Unable to read benchmark results from " + filename + ": "
+              + str(e))
+        exit(1)
+
+
+def report_comparison(
+        current: Dict[str, Any],
+        baseline: Dict[str, Any],
+        args: argparse.Namespace) -> NoReturn:
+    from benchmarks.runner import compare_results
+
+    (lines, regressions) = compare_results(
+        current,
+        baseline,
+        threshold=args.threshold,
+        mindelta=args.mindelta,
+        statistic=args.statistic)
+    print("\n".join(lines))
+    if len(regressions) > 0:
+        print("\nRegression (> " + str(100.0 * args.threshold) + "%) in: "
+              + ", ".join(regressions))
+        exit(1)
+    exit(0)
+
+
+def benchmark_generate(args: argparse.Namespace) -> NoReturn:
+    spec = spec_from_args(args)
+    sizes = generate_project(args.targetpath, spec, projectname=args.name)
+    print("Generated " + str(spec) + " in " + args.targetpath)
+    for (kind, size) in sorted(sizes.items()):
+        print("  " + kind.ljust(10) + str(size).rjust(14) + " bytes")
+    exit(0)
+
+
+def benchmark_run(args: argparse.Namespace) -> NoReturn:
+    from benchmarks.runner import run_benchmark
+    from chc.util.profileutil import spans_to_string
+
+    spec = spec_from_args(args)
+    if args.workdir is not None:
+        workdir = args.workdir
+        os.makedirs(workdir, exist_ok=True)
+    else:
+        workdir = tempfile.mkdtemp(prefix="chc-benchmark-")
+    try:
+        results = run_benchmark(
+            spec, workdir, repeat=args.repeat, projectname=args.name)
+    finally:
+        if args.workdir is None:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    print("\n".join(spans_to_string(results["profile"])))
+    if args.output is not None:
+        with open(args.output, "w") as fp:
+            json.dump(results, fp, indent=2)
+        print("Saved benchmark results in " + args.output)
+    else:
+        print(json.dumps(results["stages"], indent=2))
+
+    if args.baseline is not None:
+        report_comparison(results, load_results(args.baseline), args)
+    exit(0)
+
+
+def benchmark_compare(args: argparse.Namespace) -> NoReturn:
+    report_comparison(
+        load_results(args.results), load_results(args.baseline), args)
+
+
+def add_compare_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help=("relative slowdown of a stage that counts as a regression "
+              + "(default: %(default)s)"))
+    parser.add_argument(
+        "--mindelta",
+        type=float,
+        default=0.005,
+        help=("minimum absolute slowdown in seconds that counts as a "
+              + "regression (default: %(default)s)"))
+    parser.add_argument(
+        "--statistic",
+        choices=["min", "median"],
+        default="min",
+        help="stage time compared (default: %(default)s)")
+
+
+def parse() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        description=__doc__)
+    if len(sys.argv) == 1:
+        parser.print_help(sys.stderr)
+        exit(0)
+    subparsers = parser.add_subparsers(title="subcommands")
+
+    parser_generate = subparsers.add_parser("generate")
+    parser_generate.add_argument(
+        "targetpath", help="directory in which to write the results")
+    parser_generate.add_argument(
+        "--name", default="synthetic", help="name of the project")
+    add_spec_arguments(parser_generate)
+    parser_generate.set_defaults(func=benchmark_generate)
+
+    parser_run = subparsers.add_parser("run")
+    parser_run.add_argument(
+        "--output", help="name of json file in which to save the results")
+    parser_run.add_argument(
+        "--baseline", help="json file with results to compare against")
+    parser_run.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="number of times each stage is run (default: %(default)s)")
+    parser_run.add_argument(
+        "--workdir",
+        help=("directory for the generated project (kept); by default a "
+              + "temporary directory is used and removed"))
+    parser_run.add_argument(
+        "--name", default="synthetic", help="name of the project")
+    add_spec_arguments(parser_run)
+    add_compare_arguments(parser_run)
+    parser_run.set_defaults(func=benchmark_run)
+
+    parser_compare = subparsers.add_parser("compare")
+    parser_compare.add_argument(
+        "results", help="json file with the current results")
+    parser_compare.add_argument(
+        "baseline", help="json file with the baseline results")
+    add_compare_arguments(parser_compare)
+    parser_compare.set_defaults(func=benchmark_compare)
+
+    args = parser.parse_args()
+    return args
+
+
+if __name__ == "__main__":
+
+    args = parse()
+    args.func(args)
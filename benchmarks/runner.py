@@ -0,0 +1,256 @@
+# ------------------------------------------------------------------------------
+# CodeHawk C Analyzer
+# Author: Henny Sipma
+# ------------------------------------------------------------------------------
+# The MIT License (MIT)
+#
+# Copyright (c) 2026  Aarno Labs LLC
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ------------------------------------------------------------------------------
+"""Timing of the result-processing stages on a synthetic project.
+
+Each repetition runs the stages in order on a fresh copy of the generated
+results:
+
+- load: read all file and function results (dictionaries, declarations,
+  proof obligations, api, invariants)
+- link: link compinfos and varinfos across files (without saving)
+- update_spos: create the callsite supporting proof obligations
+- save: save spo, pod, predicate, interface, and declaration files and the
+  global xrefs
+- report: compute the project proof obligation statistics
+
+Stages are timed as spans of the phase profiler; the results record the
+per-repetition times, the minimum and median per stage, and the counters of
+the last repetition, together with the spec and the sizes of the generated
+files, so that a later run can be compared against them.
+"""
+
+import os
+import platform
+import shutil
+import statistics
+import sys
+import time
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from benchmarks.synthetic import SyntheticSpec, generate_project
+
+from chc.app.CApplication import CApplication
+from chc.app.CHVersion import chcversion
+
+import chc.reporting.ProofObligations as RP
+
+from chc.util.profileutil import chcprofiler
+
+
+stages = ["load", "link", "update_spos", "save", "report"]
+
+
+def _load(capp: CApplication) -> None:
+
+    def f(cfile: Any) -> None:
+        cfile.declarations
+        cfile.contextdictionary
+        cfile.predicatedictionary
+        cfile.interfacedictionary
+        for fn in cfile.get_functions():
+            fn.cfundecls
+            fn.sbody.stmts
+            fn.api.api_assumptions
+            fn.proofs.ppolist
+            fn.proofs.spolist
+            fn.invarianttable.invariants
+
+    capp.iter_files(f)
+
+
+def _link(capp: CApplication) -> None:
+    capp.relink(save=False)
+
+
+def _update_spos(capp: CApplication) -> None:
+    capp.iter_functions(lambda fn: fn.update_spos())
+
+
+def _save(capp: CApplication) -> None:
+
+    def f(cfile: Any) -> None:
+        for fn in cfile.get_functions():
+            fn.save_spos()
+            fn.save_pod()
+        cfile.save_predicate_dictionary()
+        cfile.save_interface_dictionary()
+        cfile.save_declarations()
+
+    capp.iter_files(f)
+    capp.save_xrefs()
+
+
+def _report(capp: CApplication) -> None:
+    RP.project_proofobligation_stats_dict_to_string(
+        RP.project_proofobligation_stats_to_dict(capp))
+
+
+stagefunctions: Dict[str, Callable[[CApplication], None]] = {
+    "load": _load,
+    "link": _link,
+    "update_spos": _update_spos,
+    "save": _save,
+    "report": _report}
+
+
+def run_once(targetpath: str, projectname: str) -> Dict[str, Any]:
+    """Runs all stages once; returns the profile and the po counts."""
+
+    chcprofiler.enable()
+    capp = CApplication(
+        targetpath,
+        projectname,
+        targetpath,
+        os.path.join(targetpath, "cch_contracts"))
+    for stage in stages:
+        with chcprofiler.span(stage):
+            stagefunctions[stage](capp)
+    profile = chcprofiler.to_dict()
+    chcprofiler.disable()
+    result: Dict[str, Any] = {}
+    result["profile"] = profile
+    result["ppos"] = len(capp.get_ppos())
+    result["spos"] = len(capp.get_spos())
+    return result
+
+
+def stage_times(profile: Dict[str, Any]) -> Dict[str, float]:
+    result: Dict[str, float] = {}
+    for child in profile["spans"].get("children", []):
+        result[child["name"]] = child["total"]
+    return result
+
+
+def run_benchmark(
+        spec: SyntheticSpec,
+        workdir: str,
+        repeat: int = 3,
+        projectname: str = "synthetic") -> Dict[str, Any]:
+    """Generates the project in workdir and times the stages repeat times."""
+
+    pristine = os.path.join(workdir, "pristine")
+    if os.path.isdir(pristine):
+        shutil.rmtree(pristine)
+    t0 = time.perf_counter()
+    sizes = generate_project(pristine, spec, projectname=projectname)
+    generationtime = time.perf_counter() - t0
+
+    runs: List[Dict[str, float]] = []
+    last: Dict[str, Any] = {}
+    for i in range(max(repeat, 1)):
+        runpath = os.path.join(workdir, "run")
+        if os.path.isdir(runpath):
+            shutil.rmtree(runpath)
+        shutil.copytree(pristine, runpath)
+        last = run_once(runpath, projectname)
+        runs.append(stage_times(last["profile"]))
+
+    result: Dict[str, Any] = {}
+    result["benchmark"] = "synthetic"
+    result["time"] = time.time()
+    result["chcversion"] = chcversion
+    result["python"] = platform.python_version()
+    result["platform"] = sys.platform
+    result["spec"] = spec.to_dict()
+    result["sizes"] = sizes
+    result["generation"] = round(generationtime, 6)
+    result["counts"] = {"ppos": last["ppos"], "spos": last["spos"]}
+    result["repeat"] = len(runs)
+    result["stages"] = {}
+    for stage in stages:
+        times = [r.get(stage, 0.0) for r in runs]
+        result["stages"][stage] = {
+            "min": min(times),
+            "median": round(statistics.median(times), 6),
+            "runs": times}
+    result["counters"] = last["profile"]["counters"]
+    result["profile"] = last["profile"]["spans"]
+    return result
+
+
+def compare_results(
+        current: Dict[str, Any],
+        baseline: Dict[str, Any],
+        threshold: float = 0.10,
+        mindelta: float = 0.005,
+        statistic: str = "min") -> Tuple[List[str], List[str]]:
+    """Compares stage times against a baseline.
+
+    A stage regresses if its time exceeds the baseline time by more than
+    the threshold (a fraction) and by more than mindelta seconds; the
+    latter keeps noise in very short stages from being reported.
+
+    Returns a list of report lines and the list of regressed stages.
+    """
+
+    lines: List[str] = []
+    regressions: List[str] = []
+    if current.get("spec") != baseline.get("spec"):
+        lines.append(
+            "Warning: spec differs from baseline: "
+            + str(current.get("spec")) + " vs " + str(baseline.get("spec")))
+    if current.get("counts") != baseline.get("counts"):
+        lines.append(
+            "Warning: po counts differ from baseline: "
+            + str(current.get("counts")) + " vs "
+            + str(baseline.get("counts")))
+    lines.append(
+        "stage".ljust(16)
+        + "baseline (s)".rjust(14)
+        + "current (s)".rjust(14)
+        + "change".rjust(10))
+    lines.append("-" * 60)
+    for stage in stages:
+        btime = _stage_time(baseline, stage, statistic)
+        ctime = _stage_time(current, stage, statistic)
+        if btime is None or ctime is None:
+            lines.append(stage.ljust(16) + "missing".rjust(14))
+            continue
+        if btime > 0.0:
+            change = "{:+9.1f}%".format(100.0 * (ctime - btime) / btime)
+        else:
+            change = "n/a".rjust(10)
+        regressed = (
+            ctime > btime * (1.0 + threshold) and ctime - btime > mindelta)
+        if regressed:
+            regressions.append(stage)
+        lines.append(
+            stage.ljust(16)
+            + "{:14.3f}".format(btime)
+            + "{:14.3f}".format(ctime)
+            + change
+            + ("  REGRESSION" if regressed else ""))
+    return (lines, regressions)
+
+
+def _stage_time(
+        d: Dict[str, Any], stage: str, statistic: str) -> Optional[float]:
+    s = d.get("stages", {}).get(stage)
+    if s is None:
+        return None
+    return s.get(statistic)
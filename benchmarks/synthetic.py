@@ -0,0 +1,643 @@
+# ------------------------------------------------------------------------------
+# CodeHawk C Analyzer
+# Author: Henny Sipma
+# ------------------------------------------------------------------------------
+# The MIT License (MIT)
+#
+# Copyright (c) 2026  Aarno Labs LLC
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ------------------------------------------------------------------------------
+"""Generator of synthetic analysis results of configurable size.
+
+The generator writes a complete analysis-results directory, as produced by
+the parser and by an analysis round of the OCaml analyzer, for a project of
+files with identical structure:
+
+- target_files.xml
+- per file: _cfile.xml, _cdict.xml, _ctxt.xml, _prd.xml, _ixf.xml
+- per function: _cfun.xml, _api.xml, _pod.xml, _ppo.xml, _spo.xml,
+  _vars.xml, _invs.xml
+
+Every function takes pointer parameters that it requires to be not-null
+(api assumptions), has primary and local supporting proof obligations with
+a mix of statuses, invariants at a number of locations, and calls functions
+in the next file of the project, so that linking resolves the callees and
+updating the supporting proof obligations creates callsite obligations from
+the api assumptions of the callees.
+
+All tables are built with IndexedTable and written in the format read by
+the corresponding dictionaries, so the results can be loaded with a regular
+CApplication without any of the OCaml binaries.
+"""
+
+import os
+import xml.etree.ElementTree as ET
+
+from typing import Any, Dict, List, Tuple
+
+from chc.util.IndexedTable import IndexedTable, IndexedTableValue
+from chc.util.StringIndexedTable import StringIndexedTable
+
+import chc.util.fileutil as UF
+import chc.util.xmlutil as UX
+
+
+cdictionary_tables = [
+    "attrparam-table",
+    "attribute-table",
+    "attributes-table",
+    "constant-table",
+    "exp-table",
+    "funarg-table",
+    "funargs-table",
+    "lhost-table",
+    "lval-table",
+    "offset-table",
+    "typ-table",
+    "typsig-table",
+    "typsiglist-table"]
+
+cdeclarations_tables = [
+    "location-table",
+    "initinfo-table",
+    "offset-init-table",
+    "typeinfo-table",
+    "varinfo-table",
+    "fieldinfo-table",
+    "compinfo-table",
+    "enumitem-table",
+    "enuminfo-table"]
+
+context_tables = ["nodes", "cfg-contexts", "exp-contexts", "contexts"]
+
+interface_tables = [
+    "api-parameter-table",
+    "s-offset-table",
+    "s-term-table",
+    "xpredicate-table",
+    "postrequest-table",
+    "postassume-table",
+    "ds-condition-table"]
+
+pod_tables = [
+    "output-parameter-rejection-reason-table",
+    "output-parameter-status-table",
+    "assumption-table",
+    "ppo-type-table",
+    "spo-type-table"]
+
+xpr_tables = [
+    "numerical-table",
+    "symbol-table",
+    "variable-table",
+    "xcst-table",
+    "xpr-table",
+    "xpr-list-table",
+    "xpr-list-list-table"]
+
+var_tables = [
+    "memory-base-table",
+    "memory-reference-data-table",
+    "constant-value-variable-table",
+    "c-variable-denotation-table"]
+
+inv_tables = ["non-relational-value-table", "invariant-fact-table"]
+
+
+class SyntheticSpec:
+    """Size parameters of a synthetic project.
+
+    Args:
+        files: number of c files
+        functions: number of functions per file
+        params: number of (pointer) parameters per function
+        ppos: number of primary proof obligations per function
+        spos: number of local supporting proof obligations per function
+        callsites: number of direct calls per function
+        invariants: number of locations with invariants per function
+    """
+
+    fields = [
+        "files", "functions", "params", "ppos", "spos", "callsites",
+        "invariants"]
+
+    def __init__(
+            self,
+            files: int = 4,
+            functions: int = 25,
+            params: int = 2,
+            ppos: int = 40,
+            spos: int = 10,
+            callsites: int = 3,
+            invariants: int = 10) -> None:
+        self.files = max(files, 1)
+        self.functions = max(functions, 1)
+        self.params = max(params, 1)
+        self.ppos = ppos
+        self.spos = spos
+        self.callsites = callsites
+        self.invariants = invariants
+
+    def to_dict(self) -> Dict[str, int]:
+        return {name: getattr(self, name) for name in self.fields}
+
+    @staticmethod
+    def from_dict(d: Dict[str, Any]) -> "SyntheticSpec":
+        return SyntheticSpec(
+            **{name: int(d[name]) for name in SyntheticSpec.fields if name in d})
+
+    def __str__(self) -> str:
+        return ", ".join(
+            name + "=" + str(getattr(self, name)) for name in self.fields)
+
+
+def _itv(index: int, tags: List[str], args: List[int]) -> IndexedTableValue:
+    return IndexedTableValue(index, tags, args)
+
+
+def _write_itv(node: ET.Element, itv: IndexedTableValue) -> None:
+    itv.write_xml(node)
+
+
+class _Tables:
+    """Named indexed tables, written in the order given."""
+
+    def __init__(self, names: List[str]) -> None:
+        self._names = names
+        self._tables = {name: IndexedTable(name) for name in names}
+
+    def add(self, name: str, tags: List[str], args: List[int]) -> int:
+        return self._tables[name].add_tags_args(tags, args, _itv)
+
+    def write_xml(self, node: ET.Element) -> None:
+        for name in self._names:
+            tnode = ET.Element(name)
+            self._tables[name].write_xml(tnode, _write_itv)
+            node.append(tnode)
+
+
+def _save(filename: str, info: str, node: ET.Element) -> None:
+    os.makedirs(os.path.dirname(filename), exist_ok=True)
+    root = UX.get_xml_header(os.path.basename(filename), info)
+    root.append(node)
+    with open(filename, "w") as fp:
+        fp.write(UX.doc_to_pretty(ET.ElementTree(root)))
+
+
+def function_name(fid: int, j: int) -> str:
+    return "f" + str(fid) + "_" + str(j)
+
+
+class _SyntheticFile:
+    """File-level dictionaries of one synthetic c file."""
+
+    def __init__(self, project: "SyntheticProject", fid: int) -> None:
+        self.project = project
+        self.spec = project.spec
+        self.fid = fid
+        self.cfilename = "file" + str(fid).zfill(3)
+        self.name = os.path.join("src", self.cfilename)
+        self.cd = _Tables(cdictionary_tables)
+        self.cdecls = _Tables(cdeclarations_tables)
+        self.ctxt = _Tables(context_tables)
+        self.prd = _Tables(["po-predicate-table"])
+        self.filenames = StringIndexedTable("filename-table")
+        self.strings = StringIndexedTable("string-table")
+        self.fileix = self.filenames.add(self.name + ".c")
+        self.gfuns: List[Tuple[int, int]] = []
+        self.gvardecls: Dict[str, Tuple[int, int, int]] = {}
+
+        # attributes 1 is the empty attribute list referred to by default
+        self.noattrs = self.cd.add("attributes-table", [], [])
+        self.tint = self.cd.add("typ-table", ["tint", "iint"], [])
+        self.tptr = self.cd.add("typ-table", ["tptr"], [self.tint])
+        funargs = [
+            self.cd.add(
+                "funarg-table", ["p" + str(i)], [self.tptr, self.noattrs])
+            for i in range(self.spec.params)]
+        self.tfun = self.cd.add(
+            "typ-table",
+            ["tfun"],
+            [self.tint, self.cd.add("funargs-table", [], funargs), 0])
+        self.nooffset = self.cd.add("offset-table", ["n"], [])
+        self.emptyexpctxt = self.ctxt.add("exp-contexts", [], [])
+
+    # -------------------------------------------------- c dictionary ---------
+
+    def mk_location(self, line: int) -> int:
+        return self.cdecls.add(
+            "location-table", [], [self.fileix, line * 40, line])
+
+    def varinfo_rep(
+            self,
+            name: str,
+            storage: str,
+            vid: int,
+            vtype: int,
+            vglob: int,
+            vdecl: int,
+            vparam: int = 0) -> Tuple[List[str], List[int]]:
+        """Returns the tags and args of a varinfo."""
+
+        return (
+            [name, storage],
+            [vid, vtype, self.noattrs, vglob, 0, vdecl, 0, vparam])
+
+    def mk_global_varinfo(
+            self, name: str, storage: str, vid: int, vdecl: int) -> int:
+        (tags, args) = self.varinfo_rep(name, storage, vid, self.tfun, 1, vdecl)
+        return self.cdecls.add("varinfo-table", tags, args)
+
+    def mk_lval(self, name: str, vid: int) -> int:
+        lhost = self.cd.add("lhost-table", ["var", name], [vid])
+        return self.cd.add("lval-table", [], [lhost, self.nooffset])
+
+    def mk_lval_exp(self, name: str, vid: int) -> int:
+        return self.cd.add("exp-table", ["lval"], [self.mk_lval(name, vid)])
+
+    def mk_const_exp(self, n: int) -> int:
+        c = self.cd.add("constant-table", ["int", str(n), "iint"], [])
+        return self.cd.add("exp-table", ["const"], [c])
+
+    def mk_binop_exp(self, op: str, e1: int, e2: int, t: int) -> int:
+        return self.cd.add("exp-table", ["binop", op], [e1, e2, t])
+
+    # -------------------------------------------------------- contexts -------
+
+    def mk_context(self, sid: int, expnodes: List[Tuple[str, int]]) -> int:
+        stmtnode = self.ctxt.add("nodes", ["stmt"], [sid])
+        cfgctxt = self.ctxt.add("cfg-contexts", [], [stmtnode])
+        if len(expnodes) == 0:
+            expctxt = self.emptyexpctxt
+        else:
+            expctxt = self.ctxt.add(
+                "exp-contexts",
+                [],
+                [self.ctxt.add("nodes", [n], [i]) for (n, i) in expnodes])
+        return self.ctxt.add("contexts", [], [cfgctxt, expctxt])
+
+    # ------------------------------------------------------ predicates -------
+
+    def mk_predicate(self, tag: str, args: List[int]) -> int:
+        return self.prd.add("po-predicate-table", [tag], args)
+
+    # -------------------------------------------------------- globals --------
+
+    def callee_varinfo(self, fid: int, j: int) -> Tuple[int, int]:
+        """Returns the varinfo index and vid of a function called."""
+
+        name = function_name(fid, j)
+        if fid == self.fid:
+            return (self.project.function_varinfo(fid, j), j)
+        if name not in self.gvardecls:
+            vid = self.spec.functions + len(self.gvardecls) + 1
+            loc = self.mk_location(1 + len(self.gvardecls))
+            ivinfo = self.mk_global_varinfo(name, "e", vid, loc)
+            self.gvardecls[name] = (ivinfo, loc, vid)
+        (ivinfo, _, vid) = self.gvardecls[name]
+        return (ivinfo, vid)
+
+    # ------------------------------------------------------------ save -------
+
+    def save(self, targetpath: str, projectname: str) -> None:
+        cfilepath = os.path.dirname(self.name)
+        args = (targetpath, projectname, cfilepath, self.cfilename)
+
+        xcfile = ET.Element("c-file")
+        xfunctions = ET.SubElement(xcfile, "functions")
+        for (ivinfo, iloc) in self.gfuns:
+            ET.SubElement(
+                xfunctions, "gfun", ivinfo=str(ivinfo), iloc=str(iloc))
+        xgvardecls = ET.SubElement(xcfile, "global-var-declarations")
+        for name in sorted(self.gvardecls):
+            (ivinfo, iloc, _) = self.gvardecls[name]
+            ET.SubElement(
+                xgvardecls, "gvardecl", ivinfo=str(ivinfo), iloc=str(iloc))
+        _save(UF.get_cfile_cfile(*args), "cfile", xcfile)
+
+        xcdict = ET.Element("cfile")
+        xdict = ET.SubElement(xcdict, "c-dictionary")
+        self.cd.write_xml(xdict)
+        xstrings = ET.SubElement(xdict, self.strings.name)
+        self.strings.write_xml(xstrings)
+        xdecls = ET.SubElement(xcdict, "c-declarations")
+        self.cdecls.write_xml(xdecls)
+        xfilenames = ET.SubElement(xdecls, self.filenames.name)
+        self.filenames.write_xml(xfilenames)
+        _save(UF.get_cfile_dictionaryname(*args), "cdict", xcdict)
+
+        xctxt = ET.Element("c-contexts")
+        self.ctxt.write_xml(xctxt)
+        _save(UF.get_cfile_contexttablename(*args), "contexts", xctxt)
+
+        xprd = ET.Element("po-dictionary")
+        self.prd.write_xml(xprd)
+        _save(
+            UF.get_cfile_predicate_dictionaryname(*args), "predicates", xprd)
+
+        xixf = ET.Element("interface-dictionary")
+        _Tables(interface_tables).write_xml(xixf)
+        _save(
+            UF.get_cfile_interface_dictionaryname(*args),
+            "interfacedictionary",
+            xixf)
+
+
+class _SyntheticFunction:
+    """Function-level results of one synthetic function."""
+
+    def __init__(self, cfile: _SyntheticFile, j: int) -> None:
+        self.cfile = cfile
+        self.spec = cfile.spec
+        self.j = j
+        self.name = function_name(cfile.fid, j)
+        self.baseline = 100 * j
+        self.locals = _Tables(["local-varinfo-table"])
+        self.pod = _Tables(pod_tables)
+        self.xd = _Tables(xpr_tables)
+        self.vd = _Tables(var_tables)
+        self.invd = _Tables(inv_tables)
+        self.formals: List[Tuple[str, int]] = []
+        self.stmts: List[ET.Element] = []
+        self.xppos: List[ET.Element] = []
+        self.xspos: List[ET.Element] = []
+        self.xcallsites: List[ET.Element] = []
+        self.xinvs: List[ET.Element] = []
+        self.xassumptions: List[ET.Element] = []
+
+    def line(self, offset: int) -> int:
+        return self.baseline + offset
+
+    def generate(self) -> None:
+        f = self.cfile
+        spec = self.spec
+
+        # formal parameters and their not-null api assumptions
+        assumptions: List[int] = []
+        for i in range(spec.params):
+            name = "p" + str(i)
+            vid = 1000 * self.j + i + 1
+            (tags, args) = f.varinfo_rep(
+                name, "n", vid, f.tptr, 0, f.mk_location(self.line(0)), i + 1)
+            self.locals.add("local-varinfo-table", tags, args)
+            self.formals.append((name, vid))
+            ipr = f.mk_predicate("nn", [f.mk_lval_exp(name, vid)])
+            assumptions.append(self.pod.add("assumption-table", ["aa"], [ipr]))
+            self.xassumptions.append(ET.Element("aa", ipr=str(ipr)))
+
+        # one statement per call, followed by the return statement
+        nstmts = spec.callsites + 1
+        for c in range(spec.callsites):
+            self.add_call(c + 1, c)
+        xret = ET.Element("stmt", sid=str(nstmts))
+        ET.SubElement(
+            xret,
+            "skind",
+            stag="return",
+            iloc=str(f.mk_location(self.line(99))),
+            iexp=str(f.mk_const_exp(0)))
+        self.stmts.append(xret)
+
+        # primary proof obligations
+        dependents: Dict[int, List[int]] = {}
+        for k in range(spec.ppos):
+            (name, vid) = self.formals[k % spec.params]
+            if k % 3 == 0:
+                ipr = f.mk_predicate("nn", [f.mk_lval_exp(name, vid)])
+            elif k % 3 == 1:
+                e = f.mk_binop_exp(
+                    "pluspi", f.mk_lval_exp(name, vid), f.mk_const_exp(k),
+                    f.tptr)
+                ipr = f.mk_predicate("ilb", [e])
+            else:
+                ipr = f.mk_predicate("i", [f.mk_lval(name, vid)])
+            iloc = f.mk_location(self.line(1 + (k % 90)))
+            ictxt = f.mk_context(1 + (k % nstmts), [("arg", k)])
+            ippo = self.pod.add("ppo-type-table", ["p"], [iloc, ictxt, ipr])
+            xppo = ET.Element("ppo", ippo=str(ippo))
+            if k % 5 == 0:
+                xppo.set("s", "o")
+            elif k % 5 == 1:
+                xppo.set("s", "g")
+                xppo.set("deps", "a")
+                ia = assumptions[k % spec.params]
+                xppo.set("ids", str(ia))
+                dependents.setdefault(k % spec.params, []).append(ippo)
+            else:
+                xppo.set("s", "g")
+                xppo.set("deps", "s" if k % 5 == 2 else "f")
+                ET.SubElement(xppo, "e", txt="synthetic " + str(k))
+            self.xppos.append(xppo)
+        for (i, xa) in enumerate(self.xassumptions):
+            if i in dependents:
+                xa.set("ppos", ",".join(str(p) for p in dependents[i]))
+
+        # local supporting proof obligations
+        for k in range(spec.spos):
+            (name, vid) = self.formals[k % spec.params]
+            ipr = f.mk_predicate("nn", [f.mk_lval_exp(name, vid)])
+            iloc = f.mk_location(self.line(1 + (k % 90)))
+            ictxt = f.mk_context(1 + (k % nstmts), [("spo", k)])
+            ispo = self.pod.add("spo-type-table", ["ls"], [iloc, ictxt, ipr])
+            xspo = ET.Element("po", ispo=str(ispo))
+            xspo.set("s", "g" if k % 2 == 0 else "o")
+            if k % 2 == 0:
+                xspo.set("deps", "s")
+            self.xspos.append(xspo)
+
+        # interval invariants on the parameters
+        for k in range(spec.invariants):
+            ictxt = f.mk_context(1 + (k % nstmts), [])
+            facts: List[int] = []
+            for (name, vid) in self.formals:
+                seqnr = self.vd.add(
+                    "c-variable-denotation-table", ["lv"], [vid, f.nooffset])
+                sym = self.xd.add("symbol-table", [name], [seqnr])
+                var = self.xd.add("variable-table", ["nv"], [sym])
+                lb = self.xd.add("numerical-table", [str(k)], [])
+                ub = self.xd.add("numerical-table", [str(k + 100)], [])
+                nrv = self.invd.add(
+                    "non-relational-value-table", ["iv"], [lb, ub])
+                facts.append(
+                    self.invd.add("invariant-fact-table", ["nrv"], [var, nrv]))
+            xloc = ET.Element("loc", ictxt=str(ictxt))
+            xloc.set("ifacts", ",".join(str(i) for i in facts))
+            self.xinvs.append(xloc)
+
+    def add_call(self, sid: int, c: int) -> None:
+        f = self.cfile
+        spec = self.spec
+        calleefid = (f.fid % spec.files) + 1
+        calleej = ((self.j + c) % spec.functions) + 1
+        callee = function_name(calleefid, calleej)
+        (ivinfo, calleevid) = f.callee_varinfo(calleefid, calleej)
+        iloc = f.mk_location(self.line(50 + c))
+        iargs = [
+            f.mk_lval_exp(*self.formals[(c + i) % spec.params])
+            for i in range(spec.params)]
+
+        xstmt = ET.Element("stmt", sid=str(sid))
+        xskind = ET.SubElement(xstmt, "skind", stag="instr", iloc=str(iloc))
+        xinstrs = ET.SubElement(xskind, "instrs")
+        xinstr = ET.SubElement(
+            xinstrs,
+            "instr",
+            itag="call",
+            iexp=str(f.mk_lval_exp(callee, calleevid)),
+            iloc=str(iloc))
+        xargs = ET.SubElement(xinstr, "args")
+        for iarg in iargs:
+            ET.SubElement(xargs, "exp", iexp=str(iarg))
+        self.stmts.append(xstmt)
+
+        xdc = ET.Element("dc", ivinfo=str(ivinfo), iloc=str(iloc))
+        xdc.set("ictxt", str(f.mk_context(sid, [])))
+        xdc.set("iargs", ",".join(str(i) for i in iargs))
+        xdc.set("header", "")
+        ET.SubElement(xdc, "api-conditions")
+        self.xcallsites.append(xdc)
+
+    def save(
+            self,
+            targetpath: str,
+            projectname: str,
+            ivinfo: int) -> None:
+        f = self.cfile
+        cfilepath = os.path.dirname(f.name)
+        args = (targetpath, projectname, cfilepath, f.cfilename, self.name)
+
+        xfun = ET.Element("function", name=self.name)
+        ET.SubElement(xfun, "svar", ivinfo=str(ivinfo))
+        xdecls = ET.SubElement(xfun, "declarations")
+        self.locals.write_xml(xdecls)
+        xbody = ET.SubElement(xfun, "sbody")
+        ET.SubElement(xbody, "bstmts").extend(self.stmts)
+        _save(UF.get_cfun_filename(*args), "cfun", xfun)
+
+        xfun = ET.Element("function", name=self.name)
+        xapi = ET.SubElement(xfun, "api")
+        ET.SubElement(xapi, "api-assumptions").extend(self.xassumptions)
+        for tag in [
+                "contract-assumptions",
+                "postcondition-requests",
+                "postcondition-guarantees",
+                "global-assumption-requests",
+                "library-calls",
+                "missing-summaries"]:
+            ET.SubElement(xapi, tag)
+        _save(UF.get_api_filename(*args), "api", xfun)
+
+        xfun = ET.Element("function", name=self.name)
+        self.pod.write_xml(xfun)
+        _save(UF.get_pod_filename(*args), "pod", xfun)
+
+        xfun = ET.Element("function", name=self.name)
+        ET.SubElement(xfun, "ppos").extend(self.xppos)
+        _save(UF.get_ppo_filename(*args), "ppos", xfun)
+
+        xfun = ET.Element("function", name=self.name)
+        xspos = ET.SubElement(xfun, "spos")
+        ET.SubElement(xspos, "localspos").extend(self.xspos)
+        xcallsites = ET.SubElement(xspos, "callsites")
+        ET.SubElement(xcallsites, "direct-calls").extend(self.xcallsites)
+        ET.SubElement(xcallsites, "indirect-calls")
+        ET.SubElement(xspos, "returnsites")
+        _save(UF.get_spo_filename(*args), "spos", xfun)
+
+        xfun = ET.Element("function", name=self.name)
+        xvard = ET.SubElement(xfun, "var-dictionary")
+        self.xd.write_xml(ET.SubElement(xvard, "xpr-dictionary"))
+        self.vd.write_xml(xvard)
+        _save(UF.get_vars_filename(*args), "vars", xfun)
+
+        xfun = ET.Element("function", name=self.name)
+        self.invd.write_xml(ET.SubElement(xfun, "inv-dictionary"))
+        ET.SubElement(xfun, "location-invariants").extend(self.xinvs)
+        _save(UF.get_invs_filename(*args), "invs", xfun)
+
+
+class SyntheticProject:
+    """Synthetic analysis results for a project of the given size."""
+
+    def __init__(self, spec: SyntheticSpec, projectname: str = "synthetic"):
+        self.spec = spec
+        self.projectname = projectname
+        self._files: Dict[int, _SyntheticFile] = {}
+        self._fvarinfos: Dict[Tuple[int, int], int] = {}
+
+    def function_varinfo(self, fid: int, j: int) -> int:
+        return self._fvarinfos[(fid, j)]
+
+    def generate(self, targetpath: str) -> Dict[str, int]:
+        """Writes the results to targetpath and returns the sizes written.
+
+        The sizes are the total number of bytes per kind of file (identified
+        by the suffix of the filename, e.g., cdict, ppo).
+        """
+
+        spec = self.spec
+        for fid in range(1, spec.files + 1):
+            f = _SyntheticFile(self, fid)
+            self._files[fid] = f
+            for j in range(1, spec.functions + 1):
+                loc = f.mk_location(100 * j)
+                ivinfo = f.mk_global_varinfo(function_name(fid, j), "n", j, loc)
+                self._fvarinfos[(fid, j)] = ivinfo
+                f.gfuns.append((ivinfo, loc))
+
+        for (fid, f) in self._files.items():
+            for j in range(1, spec.functions + 1):
+                fn = _SyntheticFunction(f, j)
+                fn.generate()
+                fn.save(
+                    targetpath, self.projectname, self.function_varinfo(fid, j))
+            f.save(targetpath, self.projectname)
+
+        xfiles = ET.Element("c-files")
+        for (fid, f) in self._files.items():
+            ET.SubElement(xfiles, "c-file", id=str(fid), name=f.name + ".c")
+        _save(
+            UF.get_targetfiles_filename(targetpath, self.projectname),
+            "target_files",
+            xfiles)
+        return result_sizes(
+            UF.get_analysisresults_path(targetpath, self.projectname))
+
+
+def result_sizes(path: str) -> Dict[str, int]:
+    """Returns the total size in bytes of the xml files per kind."""
+
+    result: Dict[str, int] = {}
+    for (d, _, fnames) in os.walk(path):
+        for fname in fnames:
+            if fname.endswith(".xml"):
+                kind = fname[:-4].split("_")[-1]
+                result[kind] = (
+                    result.get(kind, 0) + os.path.getsize(os.path.join(d, fname)))
+    return result
+
+
+def generate_project(
+        targetpath: str,
+        spec: SyntheticSpec,
+        projectname: str = "synthetic") -> Dict[str, int]:
+    """Generates a synthetic project in targetpath; returns the sizes."""
+
+    return SyntheticProject(spec, projectname).generate(targetpath)
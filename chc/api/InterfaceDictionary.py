@@ -44,7 +44,8 @@ from chc.api.STerm import STerm
 from chc.api.XPredicate import XPredicate
 
 import chc.util.fileutil as UF
-from chc.util.IndexedTable import IndexedTable, IndexedTableValue
+from chc.util.IndexedTable import (
+    IndexedTable, IndexedTableValue, IndexTranslationMemo)
 
 # import chc.api.GlobalAssumption as GA
 # import chc.api.PostRequest as PR
@@ -111,6 +112,7 @@ class InterfaceDictionary(object):
             "sterm": self.get_s_term_map,
             "soffset": self.get_s_offset_map,
             "xpred": self.get_xpredicate_map}
+        self._translations = IndexTranslationMemo()
         self._initialize(xnode)
 
     @property
@@ -215,7 +217,20 @@ class InterfaceDictionary(object):
     def mk_arg_no_offset(self) -> SOffset:
         return self.get_s_offset(self.mk_s_offset(["no"], []))
 
+    @property
+    def translations(self) -> IndexTranslationMemo:
+        """Memo of indices of terms and predicates from other files."""
+
+        return self._translations
+
+    def reset_translations(self) -> None:
+        self._translations.reset()
+
     def index_s_term(self, t: STerm) -> int:
+        return self.translations.translate(
+            t.ifd, "s-term", t.index, lambda: self._index_s_term(t))
+
+    def _index_s_term(self, t: STerm) -> int:
 
         if t.is_arg_value:
             t = cast(ST.STArgValue, t)
@@ -283,6 +298,10 @@ class InterfaceDictionary(object):
         return self.get_xpredicate(index)
 
     def index_xpredicate(self, p: XPredicate) -> int:
+        return self.translations.translate(
+            p.ifd, "xpredicate", p.index, lambda: self._index_xpredicate(p))
+
+    def _index_xpredicate(self, p: XPredicate) -> int:
 
         def f(index: int, tags: List[str], args: List[int]) -> XPredicate:
             itv = IndexedTableValue(index, tags, args)
@@ -661,6 +680,7 @@ class InterfaceDictionary(object):
     def _initialize(self, xnode: Optional[ET.Element]) -> None:
         if xnode is None:
             return
+        self.reset_translations()
         for t in self.tables:
             xtable = xnode.find(t.name)
             if xtable is None:
@@ -33,6 +33,7 @@ import xml.etree.ElementTree as ET
 
 import chc.util.fileutil as UF
 import chc.util.IndexedTable as IT
+from chc.util.profileutil import chcprofiler
 
 
 if TYPE_CHECKING:
@@ -82,6 +83,8 @@ class InterfaceDictionaryRegistry:
         if (anchor, tag) not in self.register:
             raise UF.CHCError("Unknown bdictionary type: " + tag)
         instance = self.register[(anchor, tag)](ifd, ixval)
+        if chcprofiler.enabled:
+            chcprofiler.count("objects", type(ifd).__name__)
         return cast(IdR, instance)
 
 
@@ -31,6 +31,7 @@ from typing import cast, Callable, Dict, List, Tuple, Type, TypeVar, TYPE_CHECKI
 
 import chc.util.fileutil as UF
 import chc.util.IndexedTable as IT
+from chc.util.profileutil import chcprofiler
 
 if TYPE_CHECKING:
     from chc.app.CFile import CFile
@@ -91,6 +92,8 @@ class AssignDictionaryRegistry:
         if (anchor, tag) not in self.register:
             raise UF.CHCError("Unknown assign dictionary type: " + tag)
         instance = self.register[(anchor, tag)](ad, ixval)
+        if chcprofiler.enabled:
+            chcprofiler.count("objects", type(ad).__name__)
         return cast(ADiR, instance)
 
 
@@ -0,0 +1,356 @@
+# ------------------------------------------------------------------------------
+# CodeHawk C Analyzer
+# Author: Henny Sipma
+# ------------------------------------------------------------------------------
+# The MIT License (MIT)
+#
+# Copyright (c) 2026  Aarno Labs LLC
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ------------------------------------------------------------------------------
+"""Read-only snapshot of the project-level state of an application.
+
+Setting up an application for a worker process normally requires reading
+the target files, the xrefs of all files, and the declarations of all files
+(to locate the global definitions). A snapshot holds the results of this
+setup in a single file that is memory-mapped on load:
+
+- xref tables: the global xrefs of all files, in the format of XrefTables
+- index arrays: the file that defines each global vid, and the call graph,
+  as arrays of 32-bit integers
+- meta data: the project name, the target files, and the compinfo names and
+  varinfo storage classes of the global declarations, in json
+
+An application created with a snapshot (see CApplication) attaches to these
+tables without reading any per-file artifacts; the results of a file are
+loaded only when the file is accessed. Its call graph is built from the call
+edges (loading only the functions that make calls), and its global
+declarations take the compinfo names and storage classes from the snapshot,
+as established by the linker. Snapshots are not updated: they reflect the
+state of the application at the time they were saved (c-project analyze and
+juliet analyze with --save-snapshot). A snapshot is used, if it is current,
+by the c-project commands report, query pos, export-ndjson (shared by the
+export workers), and scan-output-parameters, and by juliet report and score.
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, List, Optional, Set, Tuple, TYPE_CHECKING
+
+from chc.app.XrefTables import XrefTables, write_xref_tables_to
+
+import chc.util.fileutil as UF
+from chc.util.loggingutil import chklogger
+
+if TYPE_CHECKING:
+    from chc.app.CApplication import CApplication
+
+
+snapshot_magic = b"CHCSNAP1"
+
+# magic, followed by offset and size of the xref tables, the index arrays,
+# and the meta data
+_header = struct.Struct("<8s6q")
+
+# gviddefs (gvid, fid), call edges by caller, call edges by callee
+snapshot_array_count = 12
+
+_arrays_header = struct.Struct("<" + str(snapshot_array_count) + "i")
+
+# A call edge is (caller fid, caller vid, callee fid, callee vid, context),
+# where context is the index of the program context of the call site in the
+# context dictionary of the caller's file.
+CallEdge = Tuple[int, int, int, int, int]
+
+
+def _edge_arrays(edges: List[CallEdge]) -> List[array]:
+    """Returns the columns of the sorted edges."""
+
+    columns = [array("i") for _ in range(5)]
+    for edge in sorted(edges):
+        for (column, value) in zip(columns, edge):
+            column.append(value)
+    return columns
+
+
+def _index_arrays(
+        gviddefs: Dict[int, int], edges: List[CallEdge]) -> List[array]:
+    result: List[array] = []
+    result.append(array("i", sorted(gviddefs)))
+    result.append(array("i", [gviddefs[gvid] for gvid in result[0]]))
+    result.extend(_edge_arrays(edges))
+    result.extend(_edge_arrays(
+        [(e[2], e[3], e[0], e[1], e[4]) for e in edges]))
+    return result
+
+
+def _call_edges(capp: "CApplication") -> List[CallEdge]:
+    result: List[CallEdge] = []
+    for ((fid, vid), callees) in capp.callgraph.items():
+        for ((calleefid, calleevid), cs) in callees:
+            result.append((fid, vid, calleefid, calleevid, cs.context.index))
+    return result
+
+
+def write_snapshot(capp: "CApplication", filename: str) -> None:
+    """Saves a snapshot of the project-level state of capp to filename.
+
+    The call graph requires the supporting proof obligations of all
+    functions to be loaded. The file is written under a temporary name and
+    then renamed, so a reader never sees a partial file.
+    """
+
+    # the xrefs and global definitions of the files are registered with the
+    # index manager when the files are initialized
+    files = capp.files
+    (vid2gvid, ckey2gckey) = capp.indexmanager.xref_maps()
+    arrays = _index_arrays(capp.indexmanager.gviddefs, _call_edges(capp))
+    if sys.byteorder != "little":
+        for a in arrays:
+            a.byteswap()
+    meta: Dict[str, Any] = {}
+    meta["projectname"] = capp.projectname
+    meta["files"] = [
+        [fid, cfile.name + ".c"] for (fid, cfile) in files.items()]
+    meta["compinfo-names"] = {
+        str(gckey): sorted(names)
+        for (gckey, names) in capp.declarations.compinfo_names.items()}
+    meta["varinfo-storage-classes"] = {
+        str(gvid): sorted(classes)
+        for (gvid, classes)
+        in capp.declarations.varinfo_storage_classes.items()}
+    metadata = json.dumps(meta, sort_keys=True).encode("utf-8")
+
+    tmpfilename = filename + ".tmp"
+    with open(tmpfilename, "wb") as fp:
+        fp.write(_header.pack(snapshot_magic, 0, 0, 0, 0, 0, 0))
+        xrefoffset = _header.size
+        xrefsize = write_xref_tables_to(fp, vid2gvid, ckey2gckey)
+        arraysoffset = xrefoffset + xrefsize
+        fp.write(_arrays_header.pack(*[len(a) for a in arrays]))
+        for a in arrays:
+            a.tofile(fp)
+        arrayssize = _arrays_header.size + 4 * sum(len(a) for a in arrays)
+        metaoffset = arraysoffset + arrayssize
+        fp.write(metadata)
+        fp.seek(0)
+        fp.write(_header.pack(
+            snapshot_magic,
+            xrefoffset, xrefsize,
+            arraysoffset, arrayssize,
+            metaoffset, len(metadata)))
+    os.replace(tmpfilename, filename)
+    chklogger.logger.info(
+        "Saved snapshot %s (%d files, %d call edges)",
+        filename, len(meta["files"]), len(arrays[2]))
+
+
+def open_project_snapshot(
+        targetpath: str, projectname: str) -> Optional["CAppSnapshot"]:
+    """Returns the saved snapshot of a project, if it is valid and current.
+
+    A snapshot is current if it is not older than the xref tables and the
+    global definitions, which are rewritten whenever the project is relinked,
+    and the analysis stamp, which is rewritten at the start of every analyzer
+    round (the call edges are taken from the call sites of the analysis).
+    """
+
+    filename = UF.get_snapshot_filename(targetpath, projectname)
+    if not os.path.isfile(filename):
+        return None
+    mtime = os.path.getmtime(filename)
+    for dependency in [
+            UF.get_xref_tables_filename(targetpath, projectname),
+            UF.get_global_definitions_filename(targetpath, projectname),
+            UF.get_analysis_stamp_filename(targetpath, projectname)]:
+        if os.path.isfile(dependency) and os.path.getmtime(dependency) > mtime:
+            chklogger.logger.info(
+                "Snapshot %s is older than %s", filename, dependency)
+            return None
+    snapshot = CAppSnapshot(filename)
+    if not snapshot.is_valid or snapshot.projectname != projectname:
+        return None
+    return snapshot
+
+
+def _range(
+        keys: memoryview, key: int, lo: int, hi: int) -> Tuple[int, int]:
+    return (bisect_left(keys, key, lo, hi), bisect_right(keys, key, lo, hi))
+
+
+class CAppSnapshot:
+    """Memory-mapped snapshot of the project-level state of an application.
+
+    Args:
+        filename: name of a file written by write_snapshot (if the file
+            cannot be used, is_valid is false)
+    """
+
+    def __init__(self, filename: str) -> None:
+        self._filename = filename
+        self._mmap: Optional[mmap.mmap] = None
+        self._xreftables: Optional[XrefTables] = None
+        self._arrays: List[memoryview] = []
+        self._metarange = (0, 0)
+        self._meta: Optional[Dict[str, Any]] = None
+        self._open()
+
+    @property
+    def filename(self) -> str:
+        return self._filename
+
+    @property
+    def is_valid(self) -> bool:
+        return (
+            self._xreftables is not None
+            and self._xreftables.is_valid
+            and len(self._arrays) == snapshot_array_count)
+
+    @property
+    def xreftables(self) -> XrefTables:
+        if self._xreftables is None:
+            raise UF.CHCError("Snapshot " + self.filename + " is not valid")
+        return self._xreftables
+
+    @property
+    def meta(self) -> Dict[str, Any]:
+        if self._meta is None:
+            self._meta = {}
+            if self._mmap is not None:
+                (offset, size) = self._metarange
+                self._meta = json.loads(
+                    self._mmap[offset:offset + size].decode("utf-8"))
+        return self._meta
+
+    @property
+    def projectname(self) -> str:
+        return self.meta.get("projectname", "")
+
+    @property
+    def files(self) -> Dict[int, str]:
+        """Returns a map from file-indexes to target file names (with .c)."""
+
+        return {fid: name for (fid, name) in self.meta.get("files", [])}
+
+    @property
+    def gviddefs(self) -> Dict[int, int]:
+        """Returns a new map from gvid to the fid of the defining file."""
+
+        return dict(zip(self._arrays[0], self._arrays[1]))
+
+    @property
+    def compinfo_names(self) -> Dict[int, Set[str]]:
+        return {
+            int(gckey): set(names)
+            for (gckey, names) in self.meta.get("compinfo-names", {}).items()}
+
+    @property
+    def varinfo_storage_classes(self) -> Dict[int, Set[str]]:
+        return {
+            int(gvid): set(classes)
+            for (gvid, classes)
+            in self.meta.get("varinfo-storage-classes", {}).items()}
+
+    @property
+    def call_edge_count(self) -> int:
+        return len(self._arrays[2])
+
+    def get_defining_fid(self, gvid: int) -> Optional[int]:
+        gvids = self._arrays[0]
+        i = bisect_left(gvids, gvid)
+        if i < len(gvids) and gvids[i] == gvid:
+            return self._arrays[1][i]
+        return None
+
+    def _edges(
+            self, columns: List[memoryview], fid: int, vid: int
+    ) -> List[Tuple[int, int, int]]:
+        (lo, hi) = _range(columns[0], fid, 0, len(columns[0]))
+        (lo, hi) = _range(columns[1], vid, lo, hi)
+        return [
+            (columns[2][i], columns[3][i], columns[4][i])
+            for i in range(lo, hi)]
+
+    def get_callees(self, fid: int, vid: int) -> List[Tuple[int, int, int]]:
+        """Returns (callee fid, callee vid, context) for the calls of (fid, vid).
+
+        The context is the index of the program context of the call site in
+        the context dictionary of file fid.
+        """
+        return self._edges(self._arrays[2:7], fid, vid)
+
+    def get_file_callees(self, fid: int) -> List[Tuple[int, int, int, int]]:
+        """Returns (caller vid, callee fid, callee vid, context) for file fid."""
+
+        columns = self._arrays[2:7]
+        (lo, hi) = _range(columns[0], fid, 0, len(columns[0]))
+        return [
+            (columns[1][i], columns[2][i], columns[3][i], columns[4][i])
+            for i in range(lo, hi)]
+
+    def get_callers(self, fid: int, vid: int) -> List[Tuple[int, int, int]]:
+        """Returns (caller fid, caller vid, context) for the calls to (fid, vid).
+
+        The context is the index of the program context of the call site in
+        the context dictionary of the caller's file.
+        """
+        return self._edges(self._arrays[7:12], fid, vid)
+
+    def _open(self) -> None:
+        if sys.byteorder != "little" or array("i").itemsize != 4:
+            # arrays are saved as little-endian 32-bit integers
+            return
+        if not os.path.isfile(self.filename):
+            chklogger.logger.warning(
+                "Snapshot file %s was not found", self.filename)
+            return
+        size = os.path.getsize(self.filename)
+        if size < _header.size:
+            chklogger.logger.warning(
+                "Snapshot file %s is truncated", self.filename)
+            return
+        with open(self.filename, "rb") as fp:
+            data = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, xoffset, xsize, aoffset, asize, moffset, msize) = (
+            _header.unpack_from(data))
+        if magic != snapshot_magic or moffset + msize != size:
+            chklogger.logger.warning(
+                "Snapshot file %s is not valid", self.filename)
+            data.close()
+            return
+        lengths = _arrays_header.unpack_from(data, aoffset)
+        if _arrays_header.size + 4 * sum(lengths) != asize:
+            chklogger.logger.warning(
+                "Snapshot file %s is not valid", self.filename)
+            data.close()
+            return
+        self._mmap = data
+        self._xreftables = XrefTables(self.filename, xoffset, xsize)
+        view = memoryview(data)
+        pos = aoffset + _arrays_header.size
+        for n in lengths:
+            self._arrays.append(view[pos:pos + 4 * n].cast("i"))
+            pos += 4 * n
+        self._metarange = (moffset, msize)
@@ -31,24 +31,31 @@
 """
 
 from typing import (
-    Any, Callable, Dict, Iterable, List, Optional, Tuple, TYPE_CHECKING)
+    Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, TYPE_CHECKING)
 import os
 import multiprocessing
+import multiprocessing.connection
 import sys
+import time
 
 from chc.api.CGlobalContract import CGlobalContract
 
+from chc.app.CAppSnapshot import CAppSnapshot, write_snapshot
 from chc.app.CCompInfo import CCompInfo
-from chc.app.CFile import CFile
+from chc.app.CFile import CFile, read_cfile_dictionary_image
+from chc.app.CFileResidency import CFileResidency
 from chc.app.CVarInfo import CVarInfo
 from chc.app.IndexManager import IndexManager, FileVarReference, FileKeyReference
 from chc.app.CGlobalDeclarations import CGlobalDeclarations
 from chc.app.CGlobalDictionary import CGlobalDictionary
 
+from chc.linker.CLinker import CLinker
+
 from chc.source.CSrcFile import CSrcFile
 
 import chc.util.fileutil as UF
 from chc.util.loggingutil import chklogger
+from chc.util.profileutil import chcprofiler
 
 
 if TYPE_CHECKING:
@@ -59,6 +66,18 @@ if TYPE_CHECKING:
     from chc.proof.CFunctionPO import CFunctionPO
 
 
+# function and application used by the workers of map_files_parallel; they
+# are set before the (forked) workers are started and inherited by them
+_mapfunction: Optional[Callable[[CFile], Any]] = None
+_mapapp: Optional["CApplication"] = None
+
+
+def _map_file(fid: int) -> Tuple[int, Any]:
+    if _mapfunction is None or _mapapp is None:
+        raise UF.CHCError("map_files_parallel worker not initialized")
+    return (fid, _mapfunction(_mapapp.files[fid]))
+
+
 class CApplication(object):
     """Primary access point for source code and analysis results.
 
@@ -95,7 +114,10 @@ class CApplication(object):
             contractpath: str,
             singlefile: bool = False,
             keep_system_includes: bool = False,
-            excludefiles: List[str] = []) -> None:
+            excludefiles: List[str] = [],
+            loadprocesses: int = 1,
+            residentbudget: Optional[float] = None,
+            snapshot: Optional[CAppSnapshot] = None) -> None:
         self._projectpath = projectpath
         self._projectname = projectname
         self._targetpath = targetpath
@@ -103,6 +125,11 @@ class CApplication(object):
         self._singlefile = singlefile
         self._keep_system_includes = keep_system_includes
         self._excludefiles = excludefiles
+        self._loadprocesses = loadprocesses
+        self._residency: Optional[CFileResidency] = None
+        if residentbudget is not None:
+            self._residency = CFileResidency(residentbudget)
+        self._snapshot = snapshot
         self._indexmanager = IndexManager(singlefile)
         self._globalcontract: Optional[CGlobalContract] = None
         self._dictionary: Optional[CGlobalDictionary] = None
@@ -114,6 +141,7 @@ class CApplication(object):
         self._revcallgraph: Optional[
             Dict[Tuple[int, int],
                  List[Tuple[Tuple[int, int], "CFunctionCallsiteSPOs"]]]] = None
+        self._callinstrsbycallee: Optional[Dict[str, List["CCallInstr"]]] = None
 
     @property
     def projectpath(self) -> str:
@@ -158,6 +186,65 @@ class CApplication(object):
     def excludefiles(self) -> List[str]:
         return self._excludefiles
 
+    @property
+    def loadprocesses(self) -> int:
+        """Returns the number of processes used to read the file dictionaries.
+
+        With more than one process the dictionary files are parsed by worker
+        processes when the files are initialized; the resulting tables are
+        identical to those read in a single process.
+        """
+
+        return self._loadprocesses
+
+    @property
+    def residency(self) -> Optional[CFileResidency]:
+        """Returns the resident set of files, if a budget was given.
+
+        With a resident budget (in MB) the parsed state of the least recently
+        accessed files is released when the estimated size of all accessed
+        files exceeds the budget (see CFileResidency). Files are accessed
+        through iter_files (and the walks based on it), get_file, and
+        get_file_by_index. Since unsaved changes are lost on release, a
+        budget should only be given if every walk saves the changes it makes
+        to a file before moving on to the next one.
+        """
+
+        return self._residency
+
+    @property
+    def snapshot(self) -> Optional[CAppSnapshot]:
+        """Returns the snapshot this application was created from, if any.
+
+        With a snapshot (see CAppSnapshot) the files, the global xrefs, and
+        the locations of the global definitions are taken from the snapshot
+        rather than from the target files, the xref files, and the file
+        declarations, so that, e.g., a worker process can set up the
+        application without reading any per-file results. The application
+        should be used read-only; the snapshot is not updated.
+        """
+
+        return self._snapshot
+
+    def save_snapshot(self, filename: Optional[str] = None) -> str:
+        """Saves a snapshot of the project-level state; returns its filename.
+
+        The default filename is that of UF.get_snapshot_filename.
+        """
+        if self.is_singlefile:
+            raise UF.CHCError("Snapshots are not supported for single files")
+        if filename is None:
+            filename = UF.get_snapshot_filename(
+                self.targetpath, self.projectname)
+        with chcprofiler.span("save-snapshot"):
+            write_snapshot(self, filename)
+        return filename
+
+    def _touch(self, cfile: CFile) -> CFile:
+        if self.residency is not None:
+            self.residency.touch(cfile)
+        return cfile
+
     @property
     def files(self) -> Dict[int, CFile]:
         """Returns a map from file-indexes to CFile objects."""
@@ -240,7 +327,7 @@ class CApplication(object):
         """Access to file with full relative path and no extension."""
 
         if fname in self.filexref:
-            return self.files[self.filexref[fname]]
+            return self._touch(self.files[self.filexref[fname]])
         else:
             chklogger.logger.error("File not found: %s", fname)
             raise UF.CHCError(f"File with name {fname} not found")
@@ -250,7 +337,7 @@ class CApplication(object):
 
     def get_file_by_index(self, index: int) -> CFile:
         if index in self.files:
-            return self.files[index]
+            return self._touch(self.files[index])
         else:
             raise UF.CHCError(f"File with index {index} not found")
 
@@ -286,22 +373,102 @@ class CApplication(object):
         return []
 
     def iter_files(self, f: Callable[[CFile], None]) -> None:
-        chklogger.logger.info(
-            "Iter files over %d cfiles", len(list(self.cfiles)))
-        for file in list(self.cfiles):
-            f(file)
+        cfiles = list(self.cfiles)
+        chklogger.logger.info("Iter files over %d cfiles", len(cfiles))
+        for file in cfiles:
+            if self.residency is None:
+                f(file)
+                continue
+            self.residency.pin(file)
+            try:
+                f(file)
+            finally:
+                self.residency.unpin(file)
 
     def iter_files_parallel(
-            self, f: Callable[[CFile], None], processes: int) -> None:
-        for cfile in self.cfiles:
-            while len(multiprocessing.active_children()) >= processes:
-                pass
+            self,
+            f: Callable[[CFile], None],
+            processes: int,
+            timings: Optional[Dict[str, float]] = None,
+            cfiles: Optional[List[CFile]] = None) -> None:
+        """Applies f to all files, in at most processes worker processes.
+
+        If timings is given, the (approximate) wall-clock time of the worker
+        for each file is recorded in it, keyed by file name.
+
+        If cfiles is given, workers are started for these files in the given
+        order rather than for all files in index order.
+        """
+        running: Dict[str, Tuple[multiprocessing.Process, float]] = {}
+
+        def collect() -> None:
+            # block (without polling) until at least one worker has finished
+            multiprocessing.connection.wait(
+                [p.sentinel for (p, _) in running.values()])
+            for (name, (p, t0)) in list(running.items()):
+                if not p.is_alive():
+                    if timings is not None:
+                        timings[name] = time.perf_counter() - t0
+                    p.join()
+                    running.pop(name)
+
+        for cfile in (self.cfiles if cfiles is None else cfiles):
+            while len(running) >= processes:
+                collect()
 
             p = multiprocessing.Process(target=f, args=(cfile,))
             p.start()
+            running[cfile.name] = (p, time.perf_counter())
+
+        while len(running) > 0:
+            collect()
+
+    def map_files_parallel(
+            self,
+            f: Callable[[CFile], Any],
+            processes: int) -> Dict[int, Any]:
+        """Returns f(cfile) for all files, keyed by file index.
 
-        while len(multiprocessing.active_children()) > 0:
-            pass
+        The results are computed in at most processes forked worker
+        processes, which inherit the state of this application; the results
+        must be picklable.
+        """
+
+        global _mapfunction, _mapapp
+
+        fids = list(self.files.keys())
+        if processes <= 1 or len(fids) <= 1:
+            return {fid: f(self.files[fid]) for fid in fids}
+        _mapfunction = f
+        _mapapp = self
+        try:
+            context = multiprocessing.get_context("fork")
+            with context.Pool(processes) as pool:
+                return dict(pool.imap(_map_file, fids))
+        finally:
+            _mapfunction = None
+            _mapapp = None
+
+    def iter_cfiles(
+            self,
+            filefilter: Callable[[str], bool] = lambda f: True
+    ) -> Iterator[CFile]:
+        """Yields the files whose name satisfies filefilter, in index order.
+
+        Like iter_files, a file is pinned in the resident set (if any) while
+        it is being processed, that is, until the next file is requested.
+        """
+        for cfile in list(self.cfiles):
+            if not filefilter(cfile.name):
+                continue
+            if self.residency is None:
+                yield cfile
+                continue
+            self.residency.pin(cfile)
+            try:
+                yield cfile
+            finally:
+                self.residency.unpin(cfile)
 
     def iter_functions(self, f: Callable[["CFunction"], None]) -> None:
         def g(fi: CFile) -> None:
@@ -316,6 +483,112 @@ class CApplication(object):
 
         self.iter_files_parallel(g, maxprocesses)
 
+    def relink(self, save: bool = True, processes: int = 1) -> None:
+        """Links the files of the application and adopts the results in place.
+
+        The compinfo and varinfo relationships established by the linker are
+        registered directly with the index manager and the global declarations
+        of this application, so the application can be used for analysis
+        without being reconstructed from the saved xrefs.
+
+        If save is true the xrefs and global definitions are also saved, for
+        use by the analyzer and by subsequent invocations; the xref files are
+        written by at most processes worker processes.
+
+        With more than one process the signatures of the global varinfos are
+        computed by worker processes (see CLinker.shared_varinfos), so that
+        only one varinfo of each class of equivalent ones has its type
+        indexed. Global keys and vids are assigned sequentially, in the order
+        in which the file declarations are merged, so that the global
+        definitions and xrefs do not depend on the number of processes used;
+        compinfos are linked sequentially, as the conjectures made for
+        recursive structs depend on that order. No files are released while
+        linking.
+        """
+        if self.residency is None:
+            self._relink(save, processes)
+        else:
+            with self.residency.suspended():
+                self._relink(save, processes)
+
+    def _relink(self, save: bool, processes: int) -> None:
+        chklogger.logger.info("Relink %d cfiles", len(self.files))
+        translations = self.declarations.dictionary.translations
+        (hits, misses) = (translations.hits, translations.misses)
+        self.declarations.dictionary.reset_translations()
+        linker = CLinker(self)
+        with chcprofiler.span("link-compinfos"):
+            linker.link_compinfos()
+        with chcprofiler.span("link-varinfos"):
+            linker.link_varinfos(processes=processes)
+        with chcprofiler.span("refresh-index"):
+            self.indexmanager.refresh_index(self.cfiles)
+        hits = translations.hits - hits
+        misses = translations.misses - misses
+        chklogger.logger.info(
+            "Translations into the global dictionary: %d hits, %d misses",
+            hits, misses)
+        chcprofiler.count("translations", "hits", hits)
+        chcprofiler.count("translations", "misses", misses)
+        for cfile in self.cfiles:
+            cfile.reset_translations()
+        self._callgraph = None
+        self._revcallgraph = None
+        self._callinstrsbycallee = None
+        if save:
+            with chcprofiler.span("save-xrefs"):
+                self.save_xrefs(processes=processes)
+                linker.save_global_compinfos()
+
+    def save_xrefs(self, processes: int = 1) -> None:
+        """Saves the global xrefs of all files, and the project xref tables.
+
+        With more than one process the files are divided into processes
+        shards, each of which is saved by a (forked) worker process. The
+        xref tables (see XrefTables) are saved last, so that they are newer
+        than all xref files.
+        """
+
+        def f(cfile: CFile) -> None:
+            self.indexmanager.save_xrefs(
+                self.targetpath,
+                self.projectname,
+                cfile.cfilepath,
+                cfile.cfilename,
+                cfile.index)
+
+        cfiles = list(self.cfiles)
+        if processes <= 1 or len(cfiles) <= 1:
+            self.iter_files(f)
+            self._save_xref_tables()
+            return
+
+        def g(shard: List[CFile]) -> None:
+            for cfile in shard:
+                f(cfile)
+
+        workers: List[multiprocessing.Process] = []
+        for i in range(min(processes, len(cfiles))):
+            p = multiprocessing.Process(target=g, args=(cfiles[i::processes],))
+            p.start()
+            workers.append(p)
+        for p in workers:
+            p.join()
+        failed = [p for p in workers if p.exitcode != 0]
+        if len(failed) > 0:
+            raise UF.CHCError(
+                "Saving xrefs failed in "
+                + str(len(failed))
+                + " of "
+                + str(len(workers))
+                + " worker processes")
+        self._save_xref_tables()
+
+    def _save_xref_tables(self) -> None:
+        if not self.indexmanager.is_single_file:
+            self.indexmanager.save_xref_tables(
+                UF.get_xref_tables_filename(self.targetpath, self.projectname))
+
     def check_digests(self) -> bool:
         for cfile in list(self.cfiles):
             for cfun in cfile.get_functions():
@@ -344,6 +617,35 @@ class CApplication(object):
                 result[cfun.name] = cfun.analysis_digests.maybe_outputparameters()
         return result
 
+    def outputparameter_summary(
+            self, processes: int = 1) -> Dict[str, Dict[str, Any]]:
+        """Returns the classification of the output parameters per function.
+
+        The digests of each function are classified in a single pass (in
+        parallel per file if processes > 1) into a map from function name to
+        the number of output parameters, the number of maybe output
+        parameters, and the (printed) viable output parameters.
+        """
+
+        def f(cfile: CFile) -> Dict[str, Dict[str, Any]]:
+            result: Dict[str, Dict[str, Any]] = {}
+            for cfun in cfile.get_functions():
+                (params, viable, maybe) = (
+                    cfun.analysis_digests.classified_outputparameters())
+                result[cfun.name] = {
+                    "outputparameters": len(params),
+                    "viable": [str(p.parameter) for p in viable],
+                    "maybe": len(maybe)}
+            return result
+
+        if processes > 1:
+            # computed once, before the workers are forked
+            self.get_callinstrs_by_callee()
+        summary: Dict[str, Dict[str, Any]] = {}
+        for fileresult in self.map_files_parallel(f, processes).values():
+            summary.update(fileresult)
+        return summary
+
     def resolve_vid_function(
             self, filevar: FileVarReference) -> Optional["CFunction"]:
         """Returns the function def for the local file-index fid and vid.
@@ -399,13 +701,21 @@ class CApplication(object):
             raise UF.CHCError(f"Function with index {index} not found")
 
     def get_callinstrs(self) -> List["CCallInstr"]:
-        result: List["CCallInstr"] = []
+        return list(self.iter_callinstrs())
 
-        def f(fi: CFile) -> None:
-            result.extend(fi.get_callinstrs())
+    def iter_callinstrs(self) -> Iterator["CCallInstr"]:
+        for cfile in self.iter_cfiles():
+            yield from cfile.iter_callinstrs()
 
-        self.iter_files(f)
-        return result
+    def get_callinstrs_by_callee(self) -> Dict[str, List["CCallInstr"]]:
+        """Returns the call instructions indexed by the (printed) callee."""
+
+        if self._callinstrsbycallee is None:
+            self._callinstrsbycallee = {}
+            for instr in self.iter_callinstrs():
+                self._callinstrsbycallee.setdefault(
+                    str(instr.callee), []).append(instr)
+        return self._callinstrsbycallee
 
     # ------------------- Application statistics -----------------------------
     def get_line_counts(self) -> str:
@@ -512,6 +822,7 @@ class CApplication(object):
         def f(fi: CFile) -> None:
             fi.reinitialize_tables()
 
+        self._callinstrsbycallee = None
         self.iter_files(f)
 
     def reload_ppos(self) -> None:
@@ -542,22 +853,52 @@ class CApplication(object):
         return result
 
     def get_ppos(self) -> List["CFunctionPO"]:
-        result: List["CFunctionPO"] = []
+        return list(self.iter_ppos())
 
-        def f(fn: "CFunction") -> None:
-            result.extend(fn.get_ppos())
+    def get_spos(self) -> List["CFunctionPO"]:
+        return list(self.iter_spos())
 
-        self.iter_functions(f)
-        return result
+    def iter_ppos(
+            self,
+            pofilter: Callable[["CFunctionPO"], bool] = lambda po: True,
+            filefilter: Callable[[str], bool] = lambda f: True,
+            release: bool = False) -> Iterator["CFunctionPO"]:
+        """Yields the primary proof obligations that satisfy pofilter.
+
+        Only the files whose name satisfies filefilter are visited. If release
+        is true, the proof obligations of each function (and the tables they
+        refer to) are released once they have been yielded, so that memory
+        use does not grow with the number of proof obligations in the
+        project.
+        """
+        for cfile in self.iter_cfiles(filefilter):
+            yield from cfile.iter_ppos(pofilter=pofilter, release=release)
 
-    def get_spos(self) -> List["CFunctionPO"]:
-        result: List["CFunctionPO"] = []
+    def iter_spos(
+            self,
+            pofilter: Callable[["CFunctionPO"], bool] = lambda po: True,
+            filefilter: Callable[[str], bool] = lambda f: True,
+            release: bool = False) -> Iterator["CFunctionPO"]:
+        """Yields the supporting proof obligations that satisfy pofilter.
 
-        def f(fn: "CFunction") -> None:
-            result.extend(fn.get_spos())
+        See iter_ppos for filefilter and release.
+        """
+        for cfile in self.iter_cfiles(filefilter):
+            yield from cfile.iter_spos(pofilter=pofilter, release=release)
 
-        self.iter_functions(f)
-        return result
+    def iter_pos(
+            self,
+            pofilter: Callable[["CFunctionPO"], bool] = lambda po: True,
+            filefilter: Callable[[str], bool] = lambda f: True,
+            release: bool = False) -> Iterator["CFunctionPO"]:
+        """Yields the primary and supporting proof obligations of each function.
+
+        The proof obligations of a function are loaded (and released) once,
+        rather than once for the primary and once for the supporting proof
+        obligations. See iter_ppos for filefilter and release.
+        """
+        for cfile in self.iter_cfiles(filefilter):
+            yield from cfile.iter_pos(pofilter=pofilter, release=release)
 
     def get_open_ppos(self) -> List["CFunctionPO"]:
         result: List["CFunctionPO"] = []
@@ -591,13 +932,39 @@ class CApplication(object):
         for (index, fname) in filenames.items():
             self._files[index] = self._initialize_file(index, fname)
 
+    def _initialize_from_snapshot(self, snapshot: CAppSnapshot) -> None:
+        chklogger.logger.info("Initialize from snapshot %s", snapshot.filename)
+        if not snapshot.is_valid:
+            raise UF.CHCError(
+                "Snapshot " + snapshot.filename + " is not valid")
+        if snapshot.projectname != self.projectname:
+            raise UF.CHCError(
+                "Snapshot "
+                + snapshot.filename
+                + " is of project "
+                + snapshot.projectname)
+
+        self._files = {}
+        self.indexmanager.attach_snapshot(snapshot)
+        for (fid, cfilename_c) in sorted(snapshot.files.items()):
+            if cfilename_c in self.excludefiles:
+                continue
+            cfile = self._create_file(fid, cfilename_c)
+            self._files[fid] = cfile
+            self.indexmanager.add_file(cfile)
+
     def _initialize_from_target_files(self) -> None:
+        if self.snapshot is not None:
+            self._initialize_from_snapshot(self.snapshot)
+            return
+
         chklogger.logger.info("Initialize from target files")
         tgtxnode = UF.get_targetfiles_xnode(self.targetpath, self.projectname)
         if tgtxnode is None:
             raise UF.CHCXmlParseError(self.targetpath, 0, (0, 0))
 
         self._files = {}
+        cfiles: List[CFile] = []
 
         for c in tgtxnode.findall("c-file"):
             cfilename_c = c.get("name")
@@ -611,7 +978,36 @@ class CApplication(object):
                     "No id found for target file %s", cfilename_c)
             else:
                 fid = int(id)
-                self._files[fid] = self._initialize_file(fid, cfilename_c)
+                cfiles.append(self._create_file(fid, cfilename_c))
+
+        if self.loadprocesses > 1 and len(cfiles) > 1:
+            self._load_file_dictionaries(cfiles, self.loadprocesses)
+
+        self.indexmanager.load_xref_tables(
+            UF.get_xref_tables_filename(self.targetpath, self.projectname),
+            cfiles)
+
+        for cfile in cfiles:
+            self._files[cfile.index] = cfile
+            self.indexmanager.add_file(cfile)
+            chklogger.logger.info("initialized cfile %s", cfile.name)
+
+    def _load_file_dictionaries(
+            self, cfiles: List[CFile], processes: int) -> None:
+        """Reads the dictionary files in worker processes and installs them."""
+
+        chklogger.logger.info(
+            "Load %d file dictionaries with %d processes",
+            len(cfiles), processes)
+        chunksize = max(1, len(cfiles) // (4 * processes))
+        with chcprofiler.span("load-dictionaries"):
+            with multiprocessing.Pool(processes) as pool:
+                images = pool.imap(
+                    read_cfile_dictionary_image,
+                    [cfile.dictionary_args for cfile in cfiles],
+                    chunksize)
+                for (cfile, image) in zip(cfiles, images):
+                    cfile.install_dictionary_image(image)
 
     def initialize_single_file(self, fname: str) -> None:
         xcfile = UF.get_cfile_xnode(
@@ -626,6 +1022,12 @@ class CApplication(object):
             chklogger.logger.error("c_file could not be extracted %s", fname)
 
     def _initialize_file(self, index: int, fname: str) -> CFile:
+        cfile = self._create_file(index, fname)
+        self.indexmanager.add_file(cfile)
+        chklogger.logger.info("initialized cfile %s", fname)
+        return cfile
+
+    def _create_file(self, index: int, fname: str) -> CFile:
         xcfilepath = os.path.dirname(fname)
         cfilename = os.path.basename(fname)
         if xcfilepath == "":
@@ -634,15 +1036,14 @@ class CApplication(object):
             cfilepath = xcfilepath
         chklogger.logger.info(
             "Initialize file name: %s, file path: %s", cfilename, str(cfilepath))
-        cfile = CFile(self, index, cfilename[:-2], cfilepath)
-        self.indexmanager.add_file(cfile)
-        chklogger.logger.info("initialized cfile %s", fname)
-        return cfile
+        return CFile(self, index, cfilename[:-2], cfilepath)
 
     @property
     def callgraph(self) -> Dict[
             Tuple[int, int],
             List[Tuple[Tuple[int, int], "CFunctionCallsiteSPOs"]]]:
+        if self._callgraph is None and self.snapshot is not None:
+            self._callgraph = self._snapshot_callgraph(self.snapshot)
         if self._callgraph is None:
             self._callgraph = {}
             for (fid, cfile) in self.files.items():
@@ -657,6 +1058,36 @@ class CApplication(object):
                                     (fundef.tuple, cs))
         return self._callgraph
 
+    def _snapshot_callgraph(self, snapshot: CAppSnapshot) -> Dict[
+            Tuple[int, int],
+            List[Tuple[Tuple[int, int], "CFunctionCallsiteSPOs"]]]:
+        """Returns the call graph with the call edges of the snapshot.
+
+        Only the functions of files that make calls are loaded, and callees
+        are not resolved again; the callsites are listed in the same order as
+        in the call graph computed from the files.
+        """
+
+        result: Dict[
+            Tuple[int, int],
+            List[Tuple[Tuple[int, int], "CFunctionCallsiteSPOs"]]] = {}
+        for (fid, cfile) in self.files.items():
+            edges: Dict[int, Dict[int, Tuple[int, int]]] = {}
+            for (vid, calleefid, calleevid, context) in (
+                    snapshot.get_file_callees(fid)):
+                edges.setdefault(vid, {})[context] = (calleefid, calleevid)
+            if len(edges) == 0:
+                continue
+            for (vid, cfun) in cfile.functions.items():
+                if vid not in edges:
+                    continue
+                for cs in cfun.proofs.spos.callsite_spos.values():
+                    callee = edges[vid].get(cs.context.index)
+                    if callee is not None:
+                        result.setdefault((fid, vid), [])
+                        result[(fid, vid)].append((callee, cs))
+        return result
+
     @property
     def revcallgraph(self) -> Dict[
             Tuple[int, int],
@@ -45,9 +45,23 @@ if TYPE_CHECKING:
 
 
 class CDeclarations(ABC):
+    """Declarations, with caches of derived type information.
+
+    The caches are keyed by type index (and typedef name) in the dictionary
+    that goes with these declarations; they are discarded together with the
+    declarations when these are reloaded.
+    """
 
     def __init__(self) -> None:
-        pass
+        self._typsizes: Dict[int, int] = {}  # type index -> size
+        self._expansions: Dict[str, "CTyp"] = {}  # typedef name -> type
+
+    def get_typ_size(self, typ: "CTyp") -> int:
+        """Returns the size of typ, computed once per type index."""
+
+        if typ.index not in self._typsizes:
+            self._typsizes[typ.index] = typ.compute_size()
+        return self._typsizes[typ.index]
 
     @property
     @abstractmethod
@@ -32,7 +32,16 @@ import xml.etree.ElementTree as ET
 
 from abc import ABC, abstractmethod
 from typing import (
-    cast, Any, Callable, Dict, List, Mapping, Optional, Tuple, TYPE_CHECKING)
+    cast,
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    TYPE_CHECKING)
 
 from chc.app.CAttributes import CAttr, CAttribute, CAttributes
 from chc.app.CConst import CConst
@@ -45,7 +54,8 @@ from chc.app.CTyp import CTyp, CFunArg, CFunArgs
 from chc.app.CTypsig import CTypsig, CTypsigList
 
 import chc.util.fileutil as UF
-from chc.util.IndexedTable import IndexedTable, IndexedTableValue
+from chc.util.IndexedTable import (
+    IndexedTable, IndexedTableValue, IndexTranslationMemo)
 from chc.util.loggingutil import chklogger
 from chc.util.StringIndexedTable import StringIndexedTable
 
@@ -75,6 +85,21 @@ if TYPE_CHECKING:
     from chc.app.CVarInfo import CVarInfo
 
 
+def subst_key(subst: Mapping[Any, Any]) -> Hashable:
+    """Returns a hashable representation of a substitution of expressions.
+
+    The substituted expressions are represented by the file index of their
+    dictionary (-1 for the global dictionary) and their index, so the key
+    can be used in translation memos without holding on to dictionaries.
+    """
+
+    if len(subst) == 0:
+        return None
+    return tuple(
+        (str(k), -1 if v.cd.is_global else v.cd.cfile.index, v.index)
+        for (k, v) in sorted(subst.items(), key=lambda p: str(p[0])))
+
+
 class CDictionary(ABC):
     """Indexed types.
 
@@ -129,6 +154,7 @@ class CDictionary(ABC):
             "typsig": self.get_typsig_map,
             "typsiglist": self.get_typsig_list_map}
         # self.string_table = StringIndexedTable("string-table")
+        self._translations = IndexTranslationMemo()
 
     @property
     @abstractmethod
@@ -304,6 +330,23 @@ class CDictionary(ABC):
     def convert_ckey(self, ckey: int, fid: int = -1) -> int:
         return ckey
 
+    # -------------------- Translation from other dictionaries ---------------
+
+    @property
+    def translations(self) -> IndexTranslationMemo:
+        """Memo of indices of objects translated into this dictionary."""
+
+        return self._translations
+
+    def reset_translations(self) -> None:
+        """Discards all recorded translations.
+
+        To be called when the cross references between files change, as the
+        indices of translated types and variables may change with them.
+        """
+
+        self._translations.reset()
+
     # -------------------- Index items by category ---------------------------
 
     def mk_attrparam(self, tags: List[str], args: List[int]) -> int:
@@ -416,6 +459,10 @@ class CDictionary(ABC):
         return self.attribute_table.add_tags_args(a.tags, args, f)
 
     def index_attributes(self, aa: CAttributes) -> int:
+        return self.translations.translate(
+            aa.cd, "attributes", aa.index, lambda: self._index_attributes(aa))
+
+    def _index_attributes(self, aa: CAttributes) -> int:
 
         def f(index: int, tags: List[str], args: List[int]) -> CAttributes:
             itv = IndexedTableValue(index, tags, args)
@@ -573,6 +620,18 @@ class CDictionary(ABC):
             e: CExp,
             subst: Dict[int, CExp] = {},
             fid: int = -1) -> int:
+        return self.translations.translate(
+            e.cd,
+            "exp",
+            e.index,
+            lambda: self._index_exp(e, subst, fid),
+            context=(fid, subst_key(subst)))
+
+    def _index_exp(
+            self,
+            e: CExp,
+            subst: Dict[int, CExp] = {},
+            fid: int = -1) -> int:
 
         args: List[int]
 
@@ -716,6 +775,15 @@ class CDictionary(ABC):
 
     def index_lval(
             self, lval: CLval, subst: Dict[int, CExp] = {}, fid: int = -1) -> int:
+        return self.translations.translate(
+            lval.cd,
+            "lval",
+            lval.index,
+            lambda: self._index_lval(lval, subst, fid),
+            context=(fid, subst_key(subst)))
+
+    def _index_lval(
+            self, lval: CLval, subst: Dict[int, CExp] = {}, fid: int = -1) -> int:
         args: List[int] = [
             self.index_lhost(lval.lhost, subst=subst, fid=fid),
             self.index_offset(lval.offset, fid=fid)]
@@ -743,7 +811,11 @@ class CDictionary(ABC):
 
         raise UF.CHError("cdict: no case yet for " + str(o))
 
-    def index_typ(self, t: CTyp) -> int:  # TBF
+    def index_typ(self, t: CTyp) -> int:
+        return self.translations.translate(
+            t.cd, "typ", t.index, lambda: self._index_typ(t))
+
+    def _index_typ(self, t: CTyp) -> int:  # TBF
 
         # omit attributes argument if there are no attributes
         def ia(attrs: CAttributes) -> List[int]:
@@ -824,7 +896,7 @@ class CDictionary(ABC):
             tnode = ET.Element(t.name)
             t.write_xml(tnode, f)
             node.append(tnode)
-            if not self.is_global:
+            if not self.is_global and chklogger.info_enabled:
                 chklogger.logger.info(
                     "%s: Write table %s with %d entries",
                     self.cfile.name, t.name, t.size())
@@ -860,12 +932,13 @@ class CDictionary(ABC):
     # -------------------------- initialization --------------------------------
 
     def initialize(self, xnode: ET.Element, force: bool = False) -> None:
+        self.reset_translations()
         for t in self.tables:
             t.reset()
             xtable = xnode.find(t.name)
             if xtable is not None:
                 t.read_xml(xtable, "n")
-                if not self.is_global:
+                if not self.is_global and chklogger.info_enabled:
                     chklogger.logger.info(
                         "%s: Read xml table %s with %d entries",
                         self.cfile.name, t.name, t.size())
@@ -878,3 +951,24 @@ class CDictionary(ABC):
         else:
             raise UF.CHCError(
                 "Error reading stringtable: " + self.string_table.name)
+
+    def initialize_from_image(self, image: Dict[str, Any]) -> None:
+        """Initializes the tables from the images produced by a worker.
+
+        The image maps table names to the result of get_table_image, and the
+        name of the string table to the result of get_string_table_image.
+        """
+
+        self.reset_translations()
+        for t in self.tables:
+            t.reset()
+            if t.name in image:
+                t.read_image(image[t.name])
+            else:
+                raise UF.CHCError("Error reading table " + t.name)
+        self.string_table.reset()
+        if self.string_table.name in image:
+            self.string_table.read_image(image[self.string_table.name])
+        else:
+            raise UF.CHCError(
+                "Error reading stringtable: " + self.string_table.name)
@@ -35,6 +35,7 @@ from typing import cast, Callable, Dict, List, Tuple, Type, TypeVar, TYPE_CHECKI
 import chc.util.fileutil as UF
 import chc.util.IndexedTable as IT
 from chc.util.loggingutil import chklogger
+from chc.util.profileutil import chcprofiler
 
 if TYPE_CHECKING:
     from chc.app.CDeclarations import CDeclarations
@@ -108,6 +109,8 @@ class CDictionaryRegistry:
         if (anchor, tag) not in self.register:
             raise UF.CHCError("Unknown cdictionary type: " + tag)
         instance = self.register[(anchor, tag)](cd, ixval)
+        if chcprofiler.enabled:
+            chcprofiler.count("objects", type(cd).__name__)
         return cast(CDiR, instance)
 
 
@@ -140,6 +143,8 @@ class CDeclarationsRegistry:
         if (anchor, tag) not in self.register:
             raise UF.CHCError("Unknown cdeclarations type: " + tag)
         instance = self.register[(anchor, tag)](cd, ixval)
+        if chcprofiler.enabled:
+            chcprofiler.count("objects", type(cd).__name__)
         return cast(CDecR, instance)
 
 
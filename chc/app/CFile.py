@@ -28,11 +28,13 @@
 # ------------------------------------------------------------------------------
 """C-file main access point."""
 
+import io
 import os
 import xml.etree.ElementTree as ET
 
 from typing import (
-    Any, Callable, Dict, Iterable, List, Optional, Tuple, TYPE_CHECKING)
+    Any, Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple,
+    TYPE_CHECKING)
 
 from chc.api.InterfaceDictionary import InterfaceDictionary
 from chc.api.CFileContracts import CFileContracts
@@ -51,7 +53,7 @@ from chc.app.CFileGlobals import CGType
 from chc.app.CFileGlobals import CGVarDecl
 from chc.app.CFileGlobals import CGVarDef
 from chc.app.CGXrefs import CGXrefs
-from chc.app.CPrettyPrinter import CPrettyPrinter
+from chc.app.CPrettyPrinter import CPrettyCache, CPrettyPrinter
 
 from chc.proof.CFilePredicateDictionary import CFilePredicateDictionary
 from chc.proof.CFunctionPO import CFunctionPO
@@ -60,7 +62,9 @@ from chc.proof.CFunctionPPO import CFunctionPPO
 from chc.source.CSrcFile import CSrcFile
 
 import chc.util.fileutil as UF
+import chc.util.IndexedTable as IT
 from chc.util.loggingutil import chklogger
+import chc.util.StringIndexedTable as SI
 import chc.util.xmlutil as UX
 
 
@@ -71,6 +75,40 @@ if TYPE_CHECKING:
     from chc.app.CVarInfo import CVarInfo
 
 
+# names of the string tables in the dictionary and declarations nodes
+stringtablenames = ["string-table", "filename-table"]
+
+
+def read_cfile_dictionary_image(
+        args: Tuple[str, str, Optional[str], str]) -> Dict[str, Dict[str, Any]]:
+    """Reads the dictionary file of a c file into table images.
+
+    Intended to be run in a worker process: args is (targetpath, projectname,
+    cfilepath, cfilename); the result can be installed in the corresponding
+    CFile with install_dictionary_image without parsing the xml again.
+    """
+
+    (targetpath, projectname, cfilepath, cfilename) = args
+    xnode = UF.get_cfile_dictionary_xnode(
+        targetpath, projectname, cfilepath, cfilename)
+    if xnode is None:
+        raise UF.CHCError("File dictionary file not found: " + cfilename)
+    result: Dict[str, Dict[str, Any]] = {}
+    for nodename in ["c-dictionary", "c-declarations"]:
+        xtables = xnode.find(nodename)
+        if xtables is None:
+            raise UF.CHCError(
+                "Node " + nodename + " not found in dictionary of " + cfilename)
+        images: Dict[str, Any] = {}
+        for xtable in xtables:
+            if xtable.tag in stringtablenames:
+                images[xtable.tag] = SI.get_string_table_image(xtable)
+            else:
+                images[xtable.tag] = IT.get_table_image(xtable)
+        result[nodename] = images
+    return result
+
+
 class CFunctionNotFoundException(Exception):
     def __init__(self, cfile: "CFile", functionname: str) -> None:
         self.cfile = cfile
@@ -220,35 +258,50 @@ class CFile(object):
         return "\n".join(lines)
 
     def cil_source(self) -> str:
-        lines: List[str] = []
+        fp = io.StringIO()
+        self.write_cil_source(fp)
+        return fp.getvalue()
+
+    def write_cil_source(self, fp: TextIO) -> None:
+        """Writes the CIL source to fp, one global or function at a time.
+
+        All printers share a cache of rendered types, expressions, and lvals.
+        Function bodies that were not loaded before are released again after
+        they are written, so memory use does not grow with the file size.
+        """
+
+        cache = CPrettyCache()
         srcfilename = self.name + ".cil.c"
-        lines.append("// " + srcfilename + "\n")
+        fp.write("// " + srcfilename + "\n")
+
+        def write(s: str) -> None:
+            fp.write("\n\n")
+            fp.write(s)
+
         gtypes = self.gtypes.values()
         gcompdefs = self.gcomptagdefs.values()
-        gcompdecls = self.gcomptagdecls.values()
-        genumdefs = self.genumtagdefs.values()
-        genumdecls = self.genumtagdecls.values()
         gvardefs = self.gvardefs.values()
-        gvardecls = self.gvardecls.values()
         if len(gtypes) > 0:
-            lines.append("// type definitions")
+            write("// type definitions")
         for gtype in gtypes:
-            pp = CPrettyPrinter()
-            lines.append(pp.cgtypedef_str(gtype))
+            pp = CPrettyPrinter(cache=cache)
+            write(pp.cgtypedef_str(gtype))
         if len(gcompdefs) > 0:
-            lines.append("// struct definitions")
+            write("// struct definitions")
         for gcompdef in gcompdefs:
-            pp = CPrettyPrinter()
-            lines.append(pp.cgcomptag_str(gcompdef))
+            pp = CPrettyPrinter(cache=cache)
+            write(pp.cgcomptag_str(gcompdef))
         if len(gvardefs) > 0:
-            lines.append("// static and global variable definitions\n")
+            write("// static and global variable definitions\n")
         for gvar in gvardefs:
-            pp = CPrettyPrinter()
-            lines.append(pp.cgvardef_str(gvar))
+            pp = CPrettyPrinter(cache=cache)
+            write(pp.cgvardef_str(gvar))
         for fn in self.functions.values():
-            pp = CPrettyPrinter()
-            lines.append(pp.function_definition_to_string(fn))
-        return "\n\n".join(lines)
+            loaded = fn.has_sbody_loaded
+            pp = CPrettyPrinter(cache=cache)
+            write(pp.function_definition_to_string(fn))
+            if not loaded:
+                fn.reset_sbody()
 
     @property
     def functioncount(self) -> int:
@@ -361,6 +414,30 @@ class CFile(object):
     def reset_dictionary(self) -> None:
         self._dictionary = None
 
+    def install_dictionary_image(self, image: Dict[str, Dict[str, Any]]) -> None:
+        """Sets the dictionary and declarations from read_cfile_dictionary_image."""
+
+        self._dictionary = CFileDictionary(self, None, image["c-dictionary"])
+        self._declarations = CFileDeclarations(
+            self, None, image["c-declarations"])
+
+    @property
+    def dictionary_args(self) -> Tuple[str, str, Optional[str], str]:
+        """Returns the arguments to read_cfile_dictionary_image for this file."""
+
+        return (
+            self.targetpath, self.projectname, self.cfilepath, self.cfilename)
+
+    def reset_translations(self) -> None:
+        """Discards the memoized translations of the loaded dictionaries."""
+
+        if self._dictionary is not None:
+            self._dictionary.reset_translations()
+        if self._predicatedictionary is not None:
+            self._predicatedictionary.reset_translations()
+        if self._interfacedictionary is not None:
+            self._interfacedictionary.reset_translations()
+
     @property
     def contextdictionary(self) -> CContextDictionary:
         if self._contextdictionary is None:
@@ -493,6 +570,24 @@ class CFile(object):
         for fn in self.get_functions():
             fn.reinitialize_tables()
 
+    def release_state(self) -> None:
+        """Drops all parsed state of this file; it is reloaded on next access.
+
+        Changes that have not been saved are lost.
+        """
+        chklogger.logger.info("Release state: %s", self.name)
+        self._xnode = None
+        self._cfileglobals = None
+        self._dictionary = None
+        self._contextdictionary = None
+        self._declarations = None
+        self._predicatedictionary = None
+        self._interfacedictionary = None
+        self._assigndictionary = None
+        self._functions = None
+        self._contracts = None
+        self._sourcefile = None
+
     def has_function_by_name(self, fnname: str) -> bool:
         return fnname in self.functionxref
 
@@ -552,11 +647,11 @@ class CFile(object):
         return result
 
     def get_callinstrs(self) -> List["CCallInstr"]:
-        result: List["CCallInstr"] = []
+        return list(self.iter_callinstrs())
 
+    def iter_callinstrs(self) -> Iterator["CCallInstr"]:
         for fn in self.get_functions():
-            result.extend(fn.call_instrs)
-        return result
+            yield from fn.call_instrs
 
     def reload_spos(self) -> None:
         for fn in self.get_functions():
@@ -575,14 +670,58 @@ class CFile(object):
                 continue
 
     def get_ppos(self) -> List[CFunctionPO]:
-        result: List[CFunctionPO] = []
+        return list(self.iter_ppos())
+
+    def iter_ppos(
+            self,
+            pofilter: Callable[[CFunctionPO], bool] = lambda po: True,
+            release: bool = False) -> Iterator[CFunctionPO]:
+        """Yields the primary proof obligations that satisfy pofilter.
+
+        If release is true, the proof obligations of a function (and the
+        tables they refer to) are released once they have been yielded.
+        """
+        return self._iter_pos(CFunction.get_ppos, pofilter, release)
+
+    def iter_spos(
+            self,
+            pofilter: Callable[[CFunctionPO], bool] = lambda po: True,
+            release: bool = False) -> Iterator[CFunctionPO]:
+        """Yields the supporting proof obligations that satisfy pofilter.
+
+        If release is true, the proof obligations of a function (and the
+        tables they refer to) are released once they have been yielded.
+        """
+        return self._iter_pos(CFunction.get_spos, pofilter, release)
+
+    def iter_pos(
+            self,
+            pofilter: Callable[[CFunctionPO], bool] = lambda po: True,
+            release: bool = False) -> Iterator[CFunctionPO]:
+        """Yields the primary and supporting proof obligations, per function.
+
+        If release is true, the proof obligations of a function (and the
+        tables they refer to) are released once they have been yielded.
+        """
+        return self._iter_pos(
+            lambda fn: fn.get_ppos() + fn.get_spos(), pofilter, release)
+
+    def _iter_pos(
+            self,
+            getpos: Callable[[CFunction], List[CFunctionPO]],
+            pofilter: Callable[[CFunctionPO], bool],
+            release: bool) -> Iterator[CFunctionPO]:
         for fn in self.get_functions():
             try:
-                result.extend(fn.get_ppos())
+                pos = getpos(fn)
             except UF.CHCError as e:
                 chklogger.logger.error(str(e))
                 continue
-        return result
+            for po in pos:
+                if pofilter(po):
+                    yield po
+            if release:
+                fn.release_state()
 
     def get_open_ppos(self) -> List[CFunctionPO]:
         """Returns a list of open primary proof obligations."""
@@ -609,28 +748,20 @@ class CFile(object):
         return result
 
     def get_spos(self) -> List[CFunctionPO]:
-        result: List[CFunctionPO] = []
-        for fn in self.get_functions():
-            try:
-                result.extend(fn.get_spos())
-            except UF.CHCError as e:
-                chklogger.logger.error(str(e))
-                continue
-        return result
+        return list(self.iter_spos())
 
     def get_line_ppos(self) -> Dict[int, Dict[str, Any]]:
         result: Dict[int, Dict[str, Any]] = {}
-        fnppos = self.get_ppos()
-        for ppo in fnppos:
-            line = ppo.line
-            pred = ppo.predicate_name
-            if line not in result:
-                result[line] = {}
-            if pred not in result[line]:
-                result[line][pred] = {}
-                result[line][pred]["function"] = "TBD"
-                result[line][pred]["ppos"] = []
-                result[line][pred]["ppos"].append(ppo)
+        for fn in self.get_functions():
+            for (line, ppos) in fn.get_ppos_by_line().items():
+                lineresult = result.setdefault(line, {})
+                for ppo in ppos:
+                    pred = ppo.predicate_name
+                    if pred not in lineresult:
+                        lineresult[pred] = {}
+                        lineresult[pred]["function"] = "TBD"
+                        lineresult[pred]["ppos"] = []
+                        lineresult[pred]["ppos"].append(ppo)
         return result
 
     def get_fn_spos(self, fname: str) -> List[CFunctionPO]:
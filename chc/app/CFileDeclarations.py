@@ -118,7 +118,12 @@ class CFileDeclarations(CDeclarations):
     Declarations are dependent on CFileDictionary
     """
 
-    def __init__(self, cfile: "CFile", xnode: ET.Element) -> None:
+    def __init__(
+            self,
+            cfile: "CFile",
+            xnode: Optional[ET.Element],
+            image: Optional[Dict[str, Any]] = None) -> None:
+        CDeclarations.__init__(self)
         self._cfile = cfile
 
         # File definition dictionary
@@ -156,7 +161,13 @@ class CFileDeclarations(CDeclarations):
             "varinfo": self.get_varinfo_map}
 
         # self.string_table = SI.StringIndexedTable("string-table")
-        self._initialize(xnode)
+        if image is not None:
+            self._initialize_from_image(image)
+        elif xnode is not None:
+            self._initialize(xnode)
+        else:
+            raise UF.CHCError(
+                "No declarations data provided for file " + cfile.name)
 
     @property
     def dictionary(self) -> "CFileDictionary":
@@ -318,7 +329,11 @@ class CFileDeclarations(CDeclarations):
     # ------------------- Miscellaneous other services -----------------------
 
     def expand(self, name: str) -> CTyp:
-        return self.cfile.cfileglobals.expand(name)
+        """Returns the fully expanded type of typedef name (memoized)."""
+
+        if name not in self._expansions:
+            self._expansions[name] = self.cfile.cfileglobals.expand(name)
+        return self._expansions[name]
 
     def get_max_line(self) -> int:
         findex = self.index_filename(self.cfile.name + ".c")
@@ -401,3 +416,18 @@ class CFileDeclarations(CDeclarations):
         else:
             raise UF.CHCError(
                 "Filename table not found in file declarations")
+
+    def _initialize_from_image(self, image: Dict[str, Any]) -> None:
+        for t in self.tables:
+            if t.name in image:
+                t.reset()
+                t.read_image(image[t.name])
+            else:
+                raise UF.CHCError(
+                    "Table " + t.name + " not found in file declarations")
+        if self.filename_table.name in image:
+            self.filename_table.reset()
+            self.filename_table.read_image(image[self.filename_table.name])
+        else:
+            raise UF.CHCError(
+                "Filename table not found in file declarations")
@@ -30,7 +30,7 @@
 
 import xml.etree.ElementTree as ET
 
-from typing import Any, cast, Dict, List, TYPE_CHECKING
+from typing import Any, cast, Dict, List, Optional, TYPE_CHECKING
 
 from chc.app.CCompInfo import CCompInfo
 from chc.app.CExp import (CExp, CExpLval)
@@ -74,10 +74,20 @@ class CFileDictionary(CDictionary):
     All other indexing is handled by the superclass.
     """
 
-    def __init__(self, cfile: "CFile", xnode: ET.Element) -> None:
+    def __init__(
+            self,
+            cfile: "CFile",
+            xnode: Optional[ET.Element],
+            image: Optional[Dict[str, Any]] = None) -> None:
         CDictionary.__init__(self)
         self._cfile = cfile
-        self._initialize(xnode)
+        if image is not None:
+            self.initialize_from_image(image)
+        elif xnode is not None:
+            self._initialize(xnode)
+        else:
+            raise UF.CHCError(
+                "No dictionary data provided for file " + cfile.name)
 
     @property
     def is_global(self) -> bool:
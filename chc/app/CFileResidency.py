@@ -0,0 +1,222 @@
+# ------------------------------------------------------------------------------
+# CodeHawk C Analyzer
+# Author: Henny Sipma
+# ------------------------------------------------------------------------------
+# The MIT License (MIT)
+#
+# Copyright (c) 2026  Aarno Labs LLC
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ------------------------------------------------------------------------------
+"""Bounded set of files whose parsed state is kept in memory.
+
+The parsed state of a file (dictionaries, declarations, globals, functions
+and their proof obligations) is loaded on demand and is normally kept until
+the application is discarded. With a residency budget the application keeps
+the files it accessed in least-recently-used order, and releases the state
+of the least recently used files when the estimated size of the resident
+files exceeds the budget; released files are loaded again when they are next
+accessed.
+
+The size of a file is estimated from the size of its analysis results on
+disk, multiplied by an expansion factor (the parsed state of the xml files
+takes roughly ten times their size on disk).
+
+Releasing state discards changes that have not been saved; files are not
+released while they are pinned (e.g., by CApplication.iter_files, while the
+walk function is applied to them), and not at all while the residency is
+suspended (e.g., during linking).
+"""
+
+import collections
+import os
+
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Set, TYPE_CHECKING
+
+import chc.util.fileutil as UF
+from chc.util.loggingutil import chklogger
+
+if TYPE_CHECKING:
+    from chc.app.CFile import CFile
+
+
+default_expansion_factor = 10.0
+
+
+def results_size(cfile: "CFile") -> int:
+    """Returns the total size (in bytes) of the analysis results of cfile."""
+
+    path = UF.get_cfile_filepath(
+        cfile.targetpath, cfile.projectname, cfile.cfilepath, cfile.cfilename)
+    result = 0
+    for (d, _, fnames) in os.walk(path):
+        for fname in fnames:
+            try:
+                result += os.path.getsize(os.path.join(d, fname))
+            except OSError:
+                pass
+    return result
+
+
+class CFileResidency:
+    """Least-recently-used set of resident files with a memory budget.
+
+    Args:
+        budget: memory budget in MB for the estimated size of the resident
+            files (the most recently accessed file is always resident)
+        factor: ratio of the size of the parsed state to the size on disk
+    """
+
+    def __init__(
+            self,
+            budget: float,
+            factor: float = default_expansion_factor) -> None:
+        self._budget = int(budget * 1024 * 1024)
+        self._factor = factor
+        self._resident: "collections.OrderedDict[int, CFile]" = (
+            collections.OrderedDict())
+        self._sizes: Dict[int, int] = {}   # fid -> estimated size
+        self._pins: Dict[int, int] = {}    # fid -> pin count
+        self._released: Set[int] = set()
+        self._suspended = 0
+        self._residentsize = 0
+        self._counters: Dict[str, int] = {
+            "accesses": 0,
+            "hits": 0,
+            "loads": 0,
+            "reloads": 0,
+            "evictions": 0,
+            "peak-resident-files": 0,
+            "peak-resident-size": 0}
+
+    @property
+    def budget(self) -> int:
+        """Returns the budget in bytes."""
+
+        return self._budget
+
+    @property
+    def resident_size(self) -> int:
+        """Returns the estimated size of the resident files in bytes."""
+
+        return self._residentsize
+
+    @property
+    def resident_files(self) -> List[int]:
+        """Returns the indices of the resident files, least recent first."""
+
+        return list(self._resident.keys())
+
+    def estimated_size(self, cfile: "CFile") -> int:
+        if cfile.index not in self._sizes:
+            self._sizes[cfile.index] = int(self._factor * results_size(cfile))
+        return self._sizes[cfile.index]
+
+    def touch(self, cfile: "CFile") -> None:
+        """Records an access to cfile, releasing other files if needed."""
+
+        fid = cfile.index
+        self._counters["accesses"] += 1
+        if fid in self._resident:
+            self._counters["hits"] += 1
+            self._resident.move_to_end(fid)
+            return
+        if fid in self._released:
+            self._counters["reloads"] += 1
+            self._released.discard(fid)
+        else:
+            self._counters["loads"] += 1
+        self._resident[fid] = cfile
+        self._residentsize += self.estimated_size(cfile)
+        self._counters["peak-resident-files"] = max(
+            self._counters["peak-resident-files"], len(self._resident))
+        self._counters["peak-resident-size"] = max(
+            self._counters["peak-resident-size"], self._residentsize)
+        self.evict()
+
+    def pin(self, cfile: "CFile") -> None:
+        """Records an access to cfile and keeps it resident until unpinned."""
+
+        self.touch(cfile)
+        self._pins[cfile.index] = self._pins.get(cfile.index, 0) + 1
+
+    def unpin(self, cfile: "CFile") -> None:
+        n = self._pins.get(cfile.index, 0)
+        if n <= 1:
+            self._pins.pop(cfile.index, None)
+        else:
+            self._pins[cfile.index] = n - 1
+
+    @contextmanager
+    def suspended(self) -> Iterator[None]:
+        """No files are released within this context."""
+
+        self._suspended += 1
+        try:
+            yield
+        finally:
+            self._suspended -= 1
+            self.evict()
+
+    def evict(self) -> None:
+        """Releases least recently used files until within the budget."""
+
+        if self._suspended > 0:
+            return
+        # the most recently used file is never released
+        for fid in list(self._resident.keys())[:-1]:
+            if self._residentsize <= self.budget:
+                break
+            if fid in self._pins:
+                continue
+            cfile = self._resident.pop(fid)
+            self._residentsize -= self._sizes[fid]
+            self._released.add(fid)
+            self._counters["evictions"] += 1
+            chklogger.logger.info(
+                "Release %s (estimated %d bytes)", cfile.name, self._sizes[fid])
+            cfile.release_state()
+
+    def stats(self) -> Dict[str, Any]:
+        result: Dict[str, Any] = {}
+        result["budget"] = self.budget
+        result["resident-files"] = len(self._resident)
+        result["resident-size"] = self.resident_size
+        result.update(self._counters)
+        return result
+
+
+def residency_stats_to_string(stats: Dict[str, Any]) -> str:
+    mb = 1024.0 * 1024.0
+    lines: List[str] = []
+    lines.append("File residency (budget: {:.1f} MB)".format(stats["budget"] / mb))
+    lines.append("-" * 48)
+    lines.append("accesses".ljust(32) + str(stats["accesses"]).rjust(16))
+    lines.append("  resident".ljust(32) + str(stats["hits"]).rjust(16))
+    lines.append("  loaded".ljust(32) + str(stats["loads"]).rjust(16))
+    lines.append("  reloaded".ljust(32) + str(stats["reloads"]).rjust(16))
+    lines.append("evictions".ljust(32) + str(stats["evictions"]).rjust(16))
+    lines.append(
+        "peak resident files".ljust(32)
+        + str(stats["peak-resident-files"]).rjust(16))
+    lines.append(
+        "peak resident size (MB)".ljust(32)
+        + "{:.1f}".format(stats["peak-resident-size"] / mb).rjust(16))
+    return "\n".join(lines)
@@ -205,6 +205,15 @@ class CFunction:
                     self.xmsg("sbody element is missing from cfun file"))
         return self._sbody
 
+    @property
+    def has_sbody_loaded(self) -> bool:
+        return self._sbody is not None
+
+    def reset_sbody(self) -> None:
+        """Releases the function body; it is reloaded on the next access."""
+
+        self._sbody = None
+
     @property
     def cfundecls(self) -> CFunDeclarations:
         if self._cfundecls is None:
@@ -317,9 +326,8 @@ class CFunction:
         return self._analysis_digests
 
     def callsites(self) -> List[CCallInstr]:
-        callinstrs = self.capp.get_callinstrs()
         result: List[CCallInstr] = []
-        for instr in callinstrs:
+        for instr in self.capp.iter_callinstrs():
             if str(instr.callee) == self.name:
                 result.append(instr)
         return result
@@ -389,6 +397,21 @@ class CFunction:
         self._analysis_digests = None
         self._proofs = None
 
+    def release_state(self) -> None:
+        """Drops the proof obligations and the tables they refer to.
+
+        They are reloaded from file when next accessed; changes that have
+        not been saved are lost.
+        """
+        self._proofs = None
+        self._podictionary = None
+        self._api = None
+        self._vard = None
+        self._invd = None
+        self._invarianttable = None
+        self._analysis_digests = None
+        self._returnsites = None
+
     def get_formal_vid(self, name: str) -> int:
         for v in self.formals:
             if self.formals[v].vname == name:
@@ -582,6 +605,20 @@ class CFunction:
     def get_spos(self) -> List[CFunctionPO]:
         return self.proofs.spolist
 
+    def get_ppos_by_line(self) -> Dict[int, List[CFunctionPO]]:
+        return self.proofs.ppos_by_line
+
+    def get_spos_by_line(self) -> Dict[int, List[CFunctionPO]]:
+        return self.proofs.spos_by_line
+
+    def get_line_ppos(self, line: int) -> List[CFunctionPO]:
+        """Returns the ppos on the given line (only these are decoded)."""
+
+        return list(self.proofs.get_line_ppos(line))
+
+    def get_line_spos(self, line: int) -> List[CFunctionPO]:
+        return self.proofs.get_line_spos(line)
+
     def get_open_ppos(self) -> List[CFunctionPO]:
         try:
             return self.proofs.open_ppos
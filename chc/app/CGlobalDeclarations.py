@@ -52,6 +52,7 @@ from chc.util.loggingutil import chklogger
 if TYPE_CHECKING:
     from chc.api.CGlobalContract import CGlobalContract
     from chc.app.CApplication import CApplication
+    from chc.app.CAppSnapshot import CAppSnapshot
     from chc.app.CFile import CFile
     from chc.app.CInitInfo import CSingleInitInfo, CCompoundInitInfo
 
@@ -100,6 +101,7 @@ class CGlobalDeclarations(CDeclarations):
     """
 
     def __init__(self, capp: "CApplication", xnode: Optional[ET.Element]) -> None:
+        CDeclarations.__init__(self)
         self._capp = capp
 
         # Global definitions and declarations dictionary
@@ -137,6 +139,8 @@ class CGlobalDeclarations(CDeclarations):
         self.default_function_prototypes: List[Tuple[int, CVarInfo]] = []
 
         self._initialize(xnode)
+        if capp.snapshot is not None:
+            self._initialize_from_snapshot(capp.snapshot)
         if self.compinfo_table.size() == 0:
             self.index_opaque_struct()
 
@@ -322,6 +326,8 @@ class CGlobalDeclarations(CDeclarations):
             self.incompatibles[ckey] = set([])
         self.incompatibles[ckey].add(gckey)
         self.reset_conjectures()
+        # types translated under the failed conjecture refer to stale keys
+        self.dictionary.reset_translations()
         keystoberemoved: List[int] = []
         for k in self.compinfo_names.keys():
             if k >= checkpoint:
@@ -621,6 +627,58 @@ class CGlobalDeclarations(CDeclarations):
 
         return self.get_gvid(varref)
 
+    def global_varinfo_name(self, fid: int, varinfo: CVarInfo) -> str:
+        if varinfo.vstorage == "s":
+            # create a file-specific name for static variables
+            return varinfo.vname + "__file__" + str(fid) + "__"
+        else:
+            return varinfo.vname
+
+    def varinfo_signature(
+            self, fid: int, varinfo: CVarInfo) -> Optional[Tuple[Any, ...]]:
+        """Returns the tags and args of the global varinfo for a file varinfo.
+
+        Two file varinfos with the same signature, computed in the same
+        process, are mapped by make_global_varinfo to the same global varinfo,
+        and the second one adds no entries to any of the global tables.
+        Varinfos for which this cannot be guaranteed have no signature:
+        default function prototypes, varinfos with an initializer, and
+        varinfos whose type cannot be indexed without registering a compinfo.
+        """
+
+        if varinfo.vtype.is_default_function_prototype:
+            return None
+        if varinfo.has_initializer():
+            return None
+        compinfocount = self.compinfo_table.size()
+        ckeycount = len(self.ckey2gckey.get(fid, {}))
+        try:
+            vtypeix = self.dictionary.index_typ(
+                varinfo.vtype.expand().strip_attributes())
+        except UF.CHError:
+            return None
+        if (
+                self.compinfo_table.size() != compinfocount
+                or len(self.ckey2gckey.get(fid, {})) != ckeycount):
+            return None
+        vargs = varinfo.args
+        vtype = self.dictionary.get_typ(vtypeix)
+        vaddrof = 1 if vtype.is_function else vargs[6]
+        return (
+            self.global_varinfo_name(fid, varinfo),
+            vtypeix, vargs[3], vargs[4], vaddrof, vargs[7])
+
+    def link_global_varinfo(
+            self, fid: int, varinfo: CVarInfo, gvid: int) -> None:
+        """Connects a file varinfo to an existing global varinfo."""
+
+        if gvid not in self.varinfo_storage_classes:
+            self._varinfo_storage_classes[gvid] = set([""])
+        vstorageclass = varinfo.tags[1]
+        if vstorageclass not in self.varinfo_storage_classes[gvid]:
+            self._varinfo_storage_classes[gvid].add(vstorageclass)
+        self.vid2gvid[fid][varinfo.vid] = gvid
+
     def make_global_varinfo(self, fid: int, varinfo: CVarInfo) -> None:
         """Returns the global varinfo that corresponds to a file varinfo."""
 
@@ -630,11 +688,7 @@ class CGlobalDeclarations(CDeclarations):
             return
 
         vid = varinfo.vid
-        if varinfo.vstorage == "s":
-            # create a file-specific name for static variables
-            vname = varinfo.vname + "__file__" + str(fid) + "__"
-        else:
-            vname = varinfo.vname
+        vname = self.global_varinfo_name(fid, varinfo)
         vtype = varinfo.vtype.expand().strip_attributes()
         vtypeix = self.dictionary.index_typ(vtype)
         vtype = self.dictionary.get_typ(vtypeix)
@@ -675,13 +729,7 @@ class CGlobalDeclarations(CDeclarations):
 
         gvarinfoindex = self.varinfo_table.add_tags_args(tags, args, f)
         gvarinfo = self.get_varinfo(gvarinfoindex)
-        gvid = gvarinfo.vid
-        if gvid not in self.varinfo_storage_classes:
-            self._varinfo_storage_classes[gvid] = set([""])
-        vstorageclass = varinfo.tags[1]
-        if vstorageclass not in self.varinfo_storage_classes[gvid]:
-            self._varinfo_storage_classes[gvid].add(vstorageclass)
-        self.vid2gvid[fid][vid] = gvarinfo.vid
+        self.link_global_varinfo(fid, varinfo, gvarinfo.vid)
         chklogger.logger.debug(
             "Fid: %s, vid:%s, gvid:%s: %s",
             str(fid),
@@ -689,19 +737,37 @@ class CGlobalDeclarations(CDeclarations):
             str(gvarinfo.vid),
             gvarinfo.vname)
 
-    def index_file_varinfos(self, fid: int, varinfos: List[CVarInfo]) -> None:
-        chklogger.logger.debug(
-            "Index %d file varinfos for fid: %d (%s)",
-            len(varinfos), fid,
-            ", ".join(v.vname
-                      + "("
-                      + str(v.vid)
-                      + ", line: "
-                      + str(v.line if v.vdecl is not None else "?")
-                      + ")" for v in varinfos))
+    def index_file_varinfos(
+            self,
+            fid: int,
+            varinfos: List[CVarInfo],
+            shared: Dict[Tuple[int, int], Tuple[int, int]] = {}) -> None:
+        """Indexes and connects the global varinfos from a c file.
+
+        shared maps (fid, vid) to an earlier file varinfo with the same
+        signature (see varinfo_signature); such varinfos are connected to the
+        global varinfo of the earlier one without indexing their type.
+        """
+
+        if chklogger.debug_enabled:
+            chklogger.logger.debug(
+                "Index %d file varinfos for fid: %d (%s)",
+                len(varinfos), fid,
+                ", ".join(v.vname
+                          + "("
+                          + str(v.vid)
+                          + ", line: "
+                          + str(v.line if v.vdecl is not None else "?")
+                          + ")" for v in varinfos))
         if len(varinfos) > 0:
             self.vid2gvid[fid] = {}
             for v in varinfos:
+                earlier = shared.get((fid, v.vid))
+                if earlier is not None:
+                    gvid = self.vid2gvid.get(earlier[0], {}).get(earlier[1])
+                    if gvid is not None:
+                        self.link_global_varinfo(fid, v, gvid)
+                        continue
                 self.make_global_varinfo(fid, v)
 
     def resolve_default_function_prototypes(self) -> None:
@@ -800,31 +866,23 @@ class CGlobalDeclarations(CDeclarations):
                 raise Exception("Missing element `" + t.name + "`")
             t.reset()
             t.read_xml(xtable, "n")
+        if self.capp.snapshot is not None:
+            # taken from the snapshot (see _initialize_from_snapshot)
+            return
         xml_compinfo_names = xnode.find("compinfo-names")
         if xml_compinfo_names is None:
             raise Exception("Missing element `compinfo-names`")
-        xml_compinfo_names_n = xml_compinfo_names.find("n")
-        if xml_compinfo_names_n is None:
-            raise Exception("Missing element `n`")
-        for n in xml_compinfo_names_n:
-            xml_ckey = n.get("ckey")
-            if xml_ckey is None:
-                raise Exception("Missing element `ckey`")
-            xml_names = n.get("names")
-            if xml_names is None:
-                raise Exception("Missing element `names`")
-            self.compinfo_names[int(xml_ckey)] = set(xml_names.split(","))
+        self._read_xml_compinfo_names(xml_compinfo_names)
         xml_varinfo_storage_classes = xnode.find("varinfo-storage-classes")
         if xml_varinfo_storage_classes is None:
             raise Exception("Missing element `varinfo-storage-classes`")
-        for n in xml_varinfo_storage_classes:
-            xml_vid = n.get("vid")
-            if xml_vid is None:
-                raise Exception("Missing element `vid`")
-            xml_s = n.get("s")
-            if xml_s is None:
-                raise Exception("Missing element `s`")
-            self.varinfo_storage_classes[int(xml_vid)] = set([xml_s])
+        self._read_xml_varinfo_storage_classes(xml_varinfo_storage_classes)
+
+    def _initialize_from_snapshot(self, snapshot: "CAppSnapshot") -> None:
+        # the compinfo names and storage classes as established by the
+        # linker; the globaldefinitions file keeps only unambiguous ones
+        self.compinfo_names = snapshot.compinfo_names
+        self._varinfo_storage_classes = snapshot.varinfo_storage_classes
 
     def _read_xml_varinfo_storage_classes(self, xnode: ET.Element) -> None:
         for n in xnode.findall("n"):
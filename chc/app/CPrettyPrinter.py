@@ -24,8 +24,16 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 # ------------------------------------------------------------------------------
+"""Pretty printer for CIL globals, functions, types, and expressions.
 
-from typing import cast, List, Optional, TYPE_CHECKING
+Types, expressions, and lvals are rendered once per dictionary entry: the
+rendered strings are kept in a CPrettyCache, keyed on (dictionary, table,
+index), which can be shared by all printers that render the same file.
+"""
+
+import io
+
+from typing import cast, Dict, List, Optional, Tuple, TYPE_CHECKING, Union
 
 import chc.app.CAttributes as CA
 import chc.app.CExp as CE
@@ -40,6 +48,7 @@ from chc.app.CVarInfo import CVarInfo
 from chc.app.CVisitor import CVisitor
 
 if TYPE_CHECKING:
+    from chc.app.CDictionary import CDictionary
     from chc.app.CFileGlobals import CGCompTag, CGType, CGVarDef
     from chc.app.CCompInfo import CCompInfo
     from chc.app.CFieldInfo import CFieldInfo
@@ -99,35 +108,82 @@ floatnames = {"float": "float", "fdouble": "double", "flongdouble": "long double
 class CPrettyCode:
 
     def __init__(self) -> None:
-        self._outputlines: List[str] = []
+        self._buffer = io.StringIO()
+        self._haslines = False
         self._pos: int = 0
 
     @property
     def outputlines(self) -> List[str]:
-        return self._outputlines
+        if not self._haslines:
+            return []
+        return self._buffer.getvalue().split("\n")
 
     @property
     def pos(self) -> int:
         return self._pos
 
     def newline(self, indent: int = 0) -> None:
-        self._outputlines.append(" " * indent)
+        if self._haslines:
+            self._buffer.write("\n")
+        self._haslines = True
+        self._buffer.write(" " * indent)
         self._pos = indent
 
     def write(self, s: str) -> None:
-        self._outputlines[-1] += s
+        self._haslines = True
+        self._buffer.write(s)
         self._pos += len(s)
 
     def __str__(self) -> str:
-        return "\n".join(self.outputlines)
+        return self._buffer.getvalue()
+
+
+class CPrettyCache:
+    """Rendered strings of types, expressions, and lvals.
+
+    Entries are keyed on (dictionary, table, index); the rendering of these
+    records does not depend on indentation or position, so it can be reused
+    by every printer that shares the cache.
+    """
+
+    def __init__(self) -> None:
+        self._strings: Dict[Tuple["CDictionary", str, int], str] = {}
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    def get(self, cd: "CDictionary", table: str, index: int) -> Optional[str]:
+        result = self._strings.get((cd, table, index))
+        if result is None:
+            self._misses += 1
+        else:
+            self._hits += 1
+        return result
+
+    def set(self, cd: "CDictionary", table: str, index: int, s: str) -> None:
+        self._strings[(cd, table, index)] = s
+
+    def __len__(self) -> int:
+        return len(self._strings)
 
 
 class CPrettyPrinter(CVisitor):
 
-    def __init__(self, indentation: int = 2) -> None:
+    def __init__(
+            self,
+            indentation: int = 2,
+            cache: Optional[CPrettyCache] = None) -> None:
         self._indentation = indentation
         self._indent = 0
         self._ccode = CPrettyCode()
+        self._cache = CPrettyCache() if cache is None else cache
 
     def cgtypedef_str(self, gty: "CGType") -> str:
         gty.accept(self)
@@ -167,6 +223,33 @@ class CPrettyPrinter(CVisitor):
     def ccode(self) -> CPrettyCode:
         return self._ccode
 
+    @property
+    def cache(self) -> CPrettyCache:
+        return self._cache
+
+    def write_record(
+            self, table: str, r: Union[CT.CTyp, CE.CExp, CL.CLval]) -> None:
+        """Writes the (cached) rendering of a type, expression, or lval."""
+
+        s = self.cache.get(r.cd, table, r.index)
+        if s is None:
+            ccode = self._ccode
+            self._ccode = CPrettyCode()
+            r.accept(self)
+            s = str(self._ccode)
+            self._ccode = ccode
+            self.cache.set(r.cd, table, r.index, s)
+        self.ccode.write(s)
+
+    def write_typ(self, t: CT.CTyp) -> None:
+        self.write_record("typ", t)
+
+    def write_exp(self, e: CE.CExp) -> None:
+        self.write_record("exp", e)
+
+    def write_lval(self, lval: CL.CLval) -> None:
+        self.write_record("lval", lval)
+
     def increase_indent(self) -> None:
         self._indent += self.indentation
 
@@ -198,7 +281,7 @@ class CPrettyPrinter(CVisitor):
     def visit_cgvardef(self, cgvardef: "CGVarDef") -> None:
         cgvardef.location.accept(self)
         self.ccode.newline(indent=0)
-        cgvardef.varinfo.vtype.accept(self)
+        self.write_typ(cgvardef.varinfo.vtype)
         self.ccode.write(" ")
         self.ccode.write(cgvardef.vname)
         if cgvardef.initializer is not None:
@@ -208,7 +291,7 @@ class CPrettyPrinter(CVisitor):
     def visit_typeinfo(self, typeinfo: "CTypeInfo") -> None:
         self.ccode.newline(indent=0)
         self.ccode.write("typedef ")
-        typeinfo.type.accept(self)
+        self.write_typ(typeinfo.type)
         self.ccode.write(" ")
         self.ccode.write(typeinfo.name)
         self.ccode.write(";")
@@ -219,11 +302,11 @@ class CPrettyPrinter(CVisitor):
 
     def visit_fieldinfo(self, fieldinfo: "CFieldInfo") -> None:
         self.ccode.newline(indent=self.indent)
-        fieldinfo.ftype.accept(self)
+        self.write_typ(fieldinfo.ftype)
         self.ccode.write(f" {fieldinfo.fname};")
 
     def visit_single_initinfo(self, initinfo: "CSingleInitInfo") -> None:
-        initinfo.exp.accept(self)
+        self.write_exp(initinfo.exp)
 
     def visit_compound_initinfo(self, initinfo: "CCompoundInitInfo") -> None:
         if initinfo.typ.is_struct or initinfo.typ.is_union:
@@ -259,7 +342,7 @@ class CPrettyPrinter(CVisitor):
 
     def visit_namedtyp(self, t: CT.CTypNamed) -> None:
         t.attributes.accept(self)
-        t.expand().accept(self)
+        self.write_typ(t.expand())
 
     def visit_comptyp(self, t: CT.CTypComp) -> None:
         t.attributes.accept(self)
@@ -283,21 +366,21 @@ class CPrettyPrinter(CVisitor):
 
     def visit_ptrtyp(self, t: CT.CTypPtr) -> None:
         t.attributes.accept(self)
-        t.pointedto_type.accept(self)
+        self.write_typ(t.pointedto_type)
         self.ccode.write(" *")
 
     def visit_arraytyp(self, t: CT.CTypArray) -> None:
-        t.array_basetype.accept(self)
+        self.write_typ(t.array_basetype)
         self.ccode.write("[")
         if t.array_size_expr is not None:
             # self.ccode.write("?")
-            t.array_size_expr.accept(self)
+            self.write_exp(t.array_size_expr)
         self.ccode.write("]")
 
     def visit_funtyp(self, t: CT.CTypFun) -> None:
         """Emits a function type without name."""
 
-        t.return_type.accept(self)
+        self.write_typ(t.return_type)
         self.ccode.write(" (")
         if t.funargs is not None:
             t.funargs.accept(self)
@@ -339,20 +422,20 @@ class CPrettyPrinter(CVisitor):
                 atype = cast(CT.CTypArray, basetype)
                 sizexps.append(atype.array_size_expr)
                 basetype = atype.array_basetype
-            basetype.accept(self)
+            self.write_typ(basetype)
             self.ccode.write(" ")
             self.ccode.write(vinfo.vname)
             for s in sizexps:
                 self.ccode.write("[")
                 if s:
-                    s.accept(self)
+                    self.write_exp(s)
                 self.ccode.write("]")
             self.ccode.write(";")
             self.ccode.newline()
             return str(self.ccode)
 
         self.ccode.newline()
-        vinfo.vtype.accept(self)
+        self.write_typ(vinfo.vtype)
         self.ccode.write(" ")
         self.ccode.write(vinfo.vname)
         if srcloc is not None:
@@ -383,7 +466,7 @@ class CPrettyPrinter(CVisitor):
         if ftype.return_type.is_function_pointer:
             returntyp = cast(CT.CTypPtr, ftype.return_type)
             retfntyp = cast(CT.CTypFun, returntyp.pointedto_type)
-            retfntyp.return_type.accept(self)
+            self.write_typ(retfntyp.return_type)
             self.ccode.write(" (*")
             self.ccode.write(vinfo.vname)
             self.ccode.write("(")
@@ -396,7 +479,7 @@ class CPrettyPrinter(CVisitor):
             if srcloc is not None:
                 self.write_chkx_srcloc_attribute(srcloc, vinfo.line, binloc)
         else:
-            ftype.return_type.accept(self)
+            self.write_typ(ftype.return_type)
             self.ccode.write(" ")
             self.ccode.write(vinfo.vname)
         self.ccode.write("(")
@@ -411,7 +494,7 @@ class CPrettyPrinter(CVisitor):
     def write_function_locals(self, vinfos: List["CVarInfo"]) -> None:
         for vinfo in vinfos:
             self.ccode.newline(indent=self.indent)
-            vinfo.vtype.accept(self)
+            self.write_typ(vinfo.vtype)
             self.ccode.write(" ")
             self.ccode.write(vinfo.vname)
             self.ccode.write(";")
@@ -426,7 +509,7 @@ class CPrettyPrinter(CVisitor):
                 t.funargs.accept(self)
             self.ccode.write(")")
         else:
-            t.return_type.accept(self)
+            self.write_typ(t.return_type)
             self.ccode.write(" (*")
             self.ccode.write(name)
             self.ccode.write(")(")
@@ -468,7 +551,7 @@ class CPrettyPrinter(CVisitor):
             #        ptargtyp, argtyp.attributes.attributes[0], funarg.name)
             #    return
 
-        funarg.typ.accept(self)
+        self.write_typ(funarg.typ)
         self.ccode.write(" ")
         self.ccode.write(funarg.name)
 
@@ -497,7 +580,7 @@ class CPrettyPrinter(CVisitor):
             raise Exception("Expected an integer argument for arraylen")
         aparam = cast(CA.CAttrInt, aparam)
 
-        t.accept(self)
+        self.write_typ(t)
         self.ccode.write(" ")
         self.ccode.write(name)
         self.ccode.write("[")
@@ -535,7 +618,7 @@ class CPrettyPrinter(CVisitor):
     def visit_if_stmt(self, ifstmt: CS.CIfStmt) -> None:
         self.ccode.newline(indent=self.indent)
         self.ccode.write("if (")
-        ifstmt.condition.accept(self)
+        self.write_exp(ifstmt.condition)
         self.ccode.write(") {")
         if ifstmt.ifstmt is not None:
             self.increase_indent()
@@ -570,7 +653,7 @@ class CPrettyPrinter(CVisitor):
         self.ccode.newline(indent=self.indent)
         if returnstmt.exp is not None:
             self.ccode.write("return ")
-            returnstmt.exp.accept(self)
+            self.write_exp(returnstmt.exp)
             self.ccode.write(";")
         else:
             self.ccode.write("return;")
@@ -581,23 +664,23 @@ class CPrettyPrinter(CVisitor):
 
     def visit_assign_instr(self, assigninstr: CI.CAssignInstr) -> None:
         self.ccode.newline(indent=self.indent)
-        assigninstr.lhs.accept(self)
+        self.write_lval(assigninstr.lhs)
         self.ccode.write(" = ")
-        assigninstr.rhs.accept(self)
+        self.write_exp(assigninstr.rhs)
         self.ccode.write(";")
 
     def visit_call_instr(self, callinstr: CI.CCallInstr) -> None:
         self.ccode.newline(indent=self.indent)
         if callinstr.lhs is not None:
-            callinstr.lhs.accept(self)
+            self.write_lval(callinstr.lhs)
             self.ccode.write(" = ")
-        callinstr.callee.accept(self)
+        self.write_exp(callinstr.callee)
         self.ccode.write("(")
         if len(callinstr.callargs) > 0:
             for a in callinstr.callargs[:-1]:
-                a.accept(self)
+                self.write_exp(a)
                 self.ccode.write(", ")
-            callinstr.callargs[-1].accept(self)
+            self.write_exp(callinstr.callargs[-1])
         self.ccode.write(");")
 
     def visit_asm_instr(self, asminstr: CI.CAsmInstr) -> None:
@@ -618,7 +701,7 @@ class CPrettyPrinter(CVisitor):
 
     def visit_lhostmem(self, lhostmem: CH.CLHostMem) -> None:
         self.ccode.write("*(")
-        lhostmem.exp.accept(self)
+        self.write_exp(lhostmem.exp)
         self.ccode.write(")")
 
     def visit_nooffset(self, nooffset: CO.CNoOffset) -> None:
@@ -633,7 +716,7 @@ class CPrettyPrinter(CVisitor):
         pass
 
     def visit_explval(self, explval: CE.CExpLval) -> None:
-        explval.lval.accept(self)
+        self.write_lval(explval.lval)
 
     def visit_sizeof(self, sizeof: CE.CExpSizeOf) -> None:
         pass
@@ -655,9 +738,9 @@ class CPrettyPrinter(CVisitor):
 
     def visit_binop(self, binop: CE.CExpBinOp) -> None:
         self.ccode.write("(")
-        binop.exp1.accept(self)
+        self.write_exp(binop.exp1)
         self.ccode.write(operators[binop.op])
-        binop.exp2.accept(self)
+        self.write_exp(binop.exp2)
         self.ccode.write(")")
 
     def visit_question(self, question: CE.CExpQuestion) -> None:
@@ -665,17 +748,17 @@ class CPrettyPrinter(CVisitor):
 
     def visit_cast(self, ecast: CE.CExpCastE) -> None:
         self.ccode.write("(")
-        ecast.typ.accept(self)
+        self.write_typ(ecast.typ)
         self.ccode.write(")")
-        ecast.exp.accept(self)
+        self.write_exp(ecast.exp)
 
     def visit_addrof(self, addrof: CE.CExpAddrOf) -> None:
         if addrof.lval.is_var:
             self.ccode.write("&")
-            addrof.lval.accept(self)
+            self.write_lval(addrof.lval)
         else:
             self.ccode.write("&(")
-            addrof.lval.accept(self)
+            self.write_lval(addrof.lval)
             self.ccode.write(")")
 
     def visit_addr_of_label(self, addroflabel: CE.CExpAddrOfLabel) -> None:
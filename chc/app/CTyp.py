@@ -98,11 +98,12 @@ class CTyp(CDictionaryRecord):
             newtypix = self.cd.mk_typ_index(self.tags, newargs)
             if newtypix != self.index:
                 newtyp = self.cd.get_typ(newtypix)
-                chklogger.logger.info(
-                    "Stripping attributes %s ; changing type from %s to %s",
-                    self.attributes_string,
-                    str(self),
-                    str(newtyp))
+                if chklogger.info_enabled:
+                    chklogger.logger.info(
+                        "Stripping attributes %s ; changing type from %s to %s",
+                        self.attributes_string,
+                        self,
+                        newtyp)
             return newtyp
 
     def get_typ(self, ix: int) -> "CTyp":
@@ -118,6 +119,15 @@ class CTyp(CDictionaryRecord):
     def size(self) -> int:
         return -1000
 
+    def compute_size(self) -> int:
+        """Computes the size of the type without consulting the size cache.
+
+        Types whose size depends on other types (named types, structs, arrays)
+        override this method and obtain their size through the declarations,
+        which cache it by type index.
+        """
+        return self.size
+
     @property
     def attributes(self) -> "CAttributes":
         aindex = attribute_index[self.tags[0]]
@@ -343,6 +353,9 @@ class CTypNamed(CTyp):
 
     @property
     def size(self) -> int:
+        return self.decls.get_typ_size(self)
+
+    def compute_size(self) -> int:
         return self.expand().size
 
     @property
@@ -401,6 +414,9 @@ class CTypComp(CTyp):
 
     @property
     def size(self) -> int:
+        return self.decls.get_typ_size(self)
+
+    def compute_size(self) -> int:
         return self.compinfo.size
 
     @property
@@ -564,6 +580,9 @@ class CTypArray(CTyp):
 
     @property
     def size(self) -> int:
+        return self.decls.get_typ_size(self)
+
+    def compute_size(self) -> int:
         try:
             if self.has_array_size_expr():
                 array_size_const = cast(
@@ -660,7 +679,7 @@ class CTypFun(CTyp):
             newtypix = self.cd.mk_typ_index(self.tags, newargs)
             newtyp = self.cd.get_typ(newtypix)
             chklogger.logger.info(
-                "Change function type from %s to %s", str(self), str(newtyp))
+                "Change function type from %s to %s", self, newtyp)
             return newtyp
         else:
             return self
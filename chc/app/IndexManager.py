@@ -28,17 +28,22 @@
 # ------------------------------------------------------------------------------
 """Global variable and struct definition relationships between files."""
 
+import os
+
 from dataclasses import dataclass
 
 import xml.etree.ElementTree as ET
 
-from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+from typing import Dict, Iterable, List, Optional, Tuple, TYPE_CHECKING
+
+from chc.app.XrefTables import XrefTables, write_xref_tables
 
 import chc.util.fileutil as UF
 from chc.util.loggingutil import chklogger
 import chc.util.xmlutil as UX
 
 if TYPE_CHECKING:
+    from chc.app.CAppSnapshot import CAppSnapshot
     from chc.app.CFileDeclarations import CFileDeclarations
     from chc.app.CFile import CFile
 
@@ -93,6 +98,15 @@ class CKeyReference:
 
 
 class IndexManager:
+    """Relationships between file indices and global indices of a project.
+
+    The maps from file vids/ckeys to global vids/ckeys and back are read
+    either from the per-file xref files or, if they are up to date, from
+    the memory-mapped xref tables of the project (see XrefTables). In the
+    latter case the dictionaries below only hold the relationships added
+    afterwards (e.g., by the linker), which take precedence over the
+    tables.
+    """
 
     def __init__(self, issinglefile: bool) -> None:
         self._issinglefile = issinglefile  # application consists of a single file
@@ -109,19 +123,28 @@ class IndexManager:
         # gvid -> fid  (file in which gvid is defined)
         self.gviddefs: Dict[int, int] = {}
 
+        self._xreftables: Optional[XrefTables] = None
+
+        # global definitions are taken from a snapshot (see attach_snapshot)
+        self._snapshotdefs = False
+
     @property
     def is_single_file(self) -> bool:
         return self._issinglefile
 
+    @property
+    def xreftables(self) -> Optional[XrefTables]:
+        return self._xreftables
+
     def get_vid_gvid_subst(self, fid: int) -> Dict[int, int]:
-        return self.vid2gvid[fid]
+        return self._fid_vids(fid)
 
     def get_fid_gvid_subset(self, fileindex: int) -> Dict[int, int]:
         result: Dict[int, int] = {}
-        for gvid in self.gvid2vid:
-            for fid in self.gvid2vid[gvid]:
-                if fid == fileindex:
-                    result[gvid] = self.gvid2vid[gvid][fid]
+        for gvid in self._gvids():
+            row = self._gvid_row(gvid)
+            if fileindex in row:
+                result[gvid] = row[fileindex]
         return result
 
     def resolve_vid(
@@ -140,13 +163,14 @@ class IndexManager:
         fid = filevar.fid
         vid = filevar.vid
         if fid in self.vid2gvid:
-            if vid in self.vid2gvid[fid]:
-                gvid = self.vid2gvid[fid][vid]    # global vid for (fid, vid)
+            gvid = self._lookup_gvid(fid, vid)    # global vid for (fid, vid)
+            if gvid is not None:
                 if gvid in self.gviddefs:
                     deffid = self.gviddefs[gvid]  # file that defines gvid
-                    if gvid in self.gvid2vid:
-                        if deffid in self.gvid2vid[gvid]:
-                            defvid = self.gvid2vid[gvid][deffid]
+                    row = self._gvid_row(gvid)
+                    if len(row) > 0:
+                        if deffid in row:
+                            defvid = row[deffid]
                             return FileVarReference(deffid, defvid)
                         chklogger.logger.debug(
                             "target fid: %s not found in gvid2vid[%s] for "
@@ -177,24 +201,17 @@ class IndexManager:
         """Returns a list all file variables that refer to the same global var."""
 
         result: List[FileVarReference] = []
-        for fid in self.gvid2vid[gvid]:
-            vid = self.gvid2vid[gvid][fid]
+        for (fid, vid) in self._gvid_row(gvid).items():
             result.append(FileVarReference(fid, vid))
         return result
 
     def has_gvid_reference(self, gvid: int, fid: int) -> bool:
-        if gvid in self.gvid2vid:
-            return fid in self.gvid2vid[gvid]
-        else:
-            return False
+        return fid in self._gvid_row(gvid)
 
     def get_gvid_reference(self, gvid: int, fid: int) -> Optional[int]:
         """Returns the vid that corresponds to gvid in the file with index fid."""
 
-        if gvid in self.gvid2vid:
-            if fid in self.gvid2vid[gvid]:
-                return self.gvid2vid[gvid][fid]
-        return None
+        return self._gvid_row(gvid).get(fid)
 
     """return a list of (fid,vid) pairs that refer to the same variable."""
 
@@ -210,14 +227,12 @@ class IndexManager:
         if self.is_single_file:
             return result
 
-        if filevar.fid in self.vid2gvid:
-            if filevar.vid in self.vid2gvid[filevar.fid]:
-                gvid = self.vid2gvid[filevar.fid][filevar.vid]
-                for fid in self.gvid2vid[gvid]:
-                    if fid == filevar.fid:
-                        continue
-                    vid = self.gvid2vid[gvid][fid]
-                    result.append(FileVarReference(fid, vid))
+        gvid = self._lookup_gvid(filevar.fid, filevar.vid)
+        if gvid is not None:
+            for (fid, vid) in self._gvid_row(gvid).items():
+                if fid == filevar.fid:
+                    continue
+                result.append(FileVarReference(fid, vid))
         return result
 
     """return the vid in the file with index fidtgt for vid in fidsrc.
@@ -236,9 +251,10 @@ class IndexManager:
 
         gvid = self.get_gvid(varref)
         if gvid is not None:
-            if gvid in self.gvid2vid:
-                if tgtfid in self.gvid2vid[gvid]:
-                    return self.gvid2vid[gvid][tgtfid]
+            row = self._gvid_row(gvid)
+            if len(row) > 0:
+                if tgtfid in row:
+                    return row[tgtfid]
                 else:
                     chklogger.logger.warning(
                         "failed to convert %s for file %d (found gvid: %d)",
@@ -253,20 +269,14 @@ class IndexManager:
             # for a single file the global vid is the same as the file vid
             return varref.vid
 
-        if varref.fid in self.vid2gvid:
-            if varref.vid in self.vid2gvid[varref.fid]:
-                return self.vid2gvid[varref.fid][varref.vid]
-        return None
+        return self._lookup_gvid(varref.fid, varref.vid)
 
     def get_vid(self, fid: int, gvid: int) -> Optional[int]:
         """Returns the vid of the gvid in the file with index fid."""
 
         if self.is_single_file:
             return gvid
-        if gvid in self.gvid2vid:
-            if fid in self.gvid2vid[gvid]:
-                return self.gvid2vid[gvid][fid]
-        return None
+        return self._gvid_row(gvid).get(fid)
 
     def get_gckey(self, filekey: FileKeyReference) -> Optional[int]:
         """Returns the global ckey index for a file ckey reference."""
@@ -275,9 +285,9 @@ class IndexManager:
             # for a single file the global ckey is the same the file ckey
             return filekey.ckey
 
-        if filekey.fid in self.ckey2gckey:
-            if filekey.ckey in self.ckey2gckey[filekey.fid]:
-                return self.ckey2gckey[filekey.fid][filekey.ckey]
+        gckey = self._lookup_gckey(filekey.fid, filekey.ckey)
+        if gckey is not None:
+            return gckey
 
         chklogger.logger.warning(
             "No global key found for file key %s", str(filekey))
@@ -293,9 +303,10 @@ class IndexManager:
 
         gckey = self.get_gckey(filekey)
         if gckey is not None:
-            if gckey in self.gckey2ckey:
-                if tgtfid in self.gckey2ckey[gckey]:
-                    return self.gckey2ckey[gckey][tgtfid]
+            row = self._gckey_row(gckey)
+            if len(row) > 0:
+                if tgtfid in row:
+                    return row[tgtfid]
                 else:
                     chklogger.logger.warning(
                         "Target fid %d not found for global key %d",
@@ -332,19 +343,107 @@ class IndexManager:
         self.gvid2vid.setdefault(gvid, {})
         self.gvid2vid[gvid][filevar.fid] = filevar.vid
 
-    def add_file(self, cfile: "CFile") -> None:
-        fid = cfile.index
-        if not self.is_single_file:
-            xxreffile = UF.get_cxreffile_xnode(
+    def load_xref_tables(
+            self, filename: str, cfiles: Iterable["CFile"]) -> bool:
+        """Uses the xref tables in filename if they are up to date.
+
+        The tables are up to date if they were saved after the xref files of
+        all cfiles, and hold the xrefs of exactly the files that have an xref
+        file. This method must be called before the files are added.
+
+        Returns true if the tables are used.
+        """
+        if self.is_single_file or not os.path.isfile(filename):
+            return False
+        tables = XrefTables(filename)
+        if not tables.is_valid:
+            return False
+        mtime = os.stat(filename).st_mtime_ns
+        for cfile in cfiles:
+            xreffilename = UF.get_cxreffile_filename(
                 cfile.targetpath,
                 cfile.projectname,
                 cfile.cfilepath,
                 cfile.cfilename)
-            if xxreffile is not None:
-                self._add_xrefs(xxreffile, fid)
-            self._add_globaldefinitions(cfile, fid)
+            if os.path.isfile(xreffilename):
+                if (
+                        os.stat(xreffilename).st_mtime_ns > mtime
+                        or not tables.has_file(cfile.index)):
+                    chklogger.logger.info(
+                        "Xref tables are older than %s", xreffilename)
+                    return False
+            elif tables.has_file(cfile.index):
+                chklogger.logger.info(
+                    "Xref tables include %s, which has no xrefs", cfile.name)
+                return False
+        self._xreftables = tables
+        chklogger.logger.info(
+            "Use xref tables %s (%d varinfo xrefs, %d compinfo xrefs)",
+            filename, len(tables.vid2gvid), len(tables.ckey2gckey))
+        return True
+
+    def attach_snapshot(self, snapshot: "CAppSnapshot") -> None:
+        """Uses the xref tables and global definitions of a snapshot.
+
+        Files added afterwards are not read: their xrefs are in the tables
+        and the locations of the global definitions are taken from the
+        snapshot. This method must be called before the files are added.
+        """
+        self._xreftables = snapshot.xreftables
+        self.gviddefs = snapshot.gviddefs
+        self._snapshotdefs = True
+
+    def xref_maps(
+            self) -> Tuple[Dict[int, Dict[int, int]], Dict[int, Dict[int, int]]]:
+        """Returns the maps fid -> vid -> gvid and fid -> ckey -> gckey."""
+
+        fids = set(self.vid2gvid.keys()) | set(self.ckey2gckey.keys())
+        if self._xreftables is not None:
+            fids.update(self._xreftables.vid2gvid.rowkeys())
+            fids.update(self._xreftables.ckey2gckey.rowkeys())
+        return (
+            {fid: self._fid_vids(fid) for fid in fids},
+            {fid: self._fid_ckeys(fid) for fid in fids})
+
+    def save_xref_tables(self, filename: str) -> None:
+        """Saves the xrefs of all files as xref tables (see XrefTables)."""
+
+        (vid2gvid, ckey2gckey) = self.xref_maps()
+        write_xref_tables(filename, vid2gvid, ckey2gckey)
+
+    def add_file(self, cfile: "CFile") -> None:
+        fid = cfile.index
+        if not self.is_single_file:
+            if (
+                    self._xreftables is not None
+                    and self._xreftables.has_file(fid)):
+                self.vid2gvid.setdefault(fid, {})
+                self.ckey2gckey.setdefault(fid, {})
+            elif self._xreftables is None:
+                xxreffile = UF.get_cxreffile_xnode(
+                    cfile.targetpath,
+                    cfile.projectname,
+                    cfile.cfilepath,
+                    cfile.cfilename)
+                if xxreffile is not None:
+                    self._add_xrefs(xxreffile, fid)
+            if not self._snapshotdefs:
+                self._add_globaldefinitions(cfile, fid)
         self.fidvidmax[fid] = fidvidmax_initial_value
 
+    def refresh_index(self, cfiles: Iterable["CFile"]) -> None:
+        """Recomputes the global definition locations after linking.
+
+        The global definitions of a file are registered when the file is
+        added, using the xrefs available at that time. After the linker has
+        registered new vid/ckey relationships in place, the locations of the
+        definitions have to be recomputed to be consistent with those
+        relationships, without reloading the xrefs from disk.
+        """
+        self.gviddefs = {}
+        for cfile in cfiles:
+            self._add_globaldefinitions(cfile, cfile.index)
+
     def save_xrefs(
             self,
             targetpath: str,
@@ -359,24 +458,80 @@ class IndexManager:
         vxrefsnode = ET.Element("varinfo-xrefs")
         xrefsnode.extend([cxrefsnode, vxrefsnode])
 
-        if fid in self.ckey2gckey:
-            for ckey in sorted(self.ckey2gckey[fid]):
-                xref = ET.Element("cxref")
-                xref.set("ckey", str(ckey))
-                xref.set("gckey", str(self.ckey2gckey[fid][ckey]))
-                cxrefsnode.append(xref)
+        ckeys = self._fid_ckeys(fid)
+        for ckey in sorted(ckeys):
+            xref = ET.Element("cxref")
+            xref.set("ckey", str(ckey))
+            xref.set("gckey", str(ckeys[ckey]))
+            cxrefsnode.append(xref)
 
-        if fid in self.vid2gvid:
-            for vid in sorted(self.vid2gvid[fid]):
-                xref = ET.Element("vxref")
-                xref.set("vid", str(vid))
-                xref.set("gvid", str(self.vid2gvid[fid][vid]))
-                vxrefsnode.append(xref)
+        vids = self._fid_vids(fid)
+        for vid in sorted(vids):
+            xref = ET.Element("vxref")
+            xref.set("vid", str(vid))
+            xref.set("gvid", str(vids[vid]))
+            vxrefsnode.append(xref)
 
         xreffilename = UF.get_cxreffile_filename(
             targetpath, projectname, cfilepath, cfilename)
-        xreffile = open(xreffilename, "w")
-        xreffile.write(UX.doc_to_pretty(ET.ElementTree(xrefroot)))
+        with open(xreffilename, "w") as xreffile:
+            xreffile.write(UX.doc_to_pretty(ET.ElementTree(xrefroot)))
+
+    def _lookup_gvid(self, fid: int, vid: int) -> Optional[int]:
+        if fid in self.vid2gvid and vid in self.vid2gvid[fid]:
+            return self.vid2gvid[fid][vid]
+        if self._xreftables is not None:
+            return self._xreftables.vid2gvid.get(fid, vid)
+        return None
+
+    def _lookup_gckey(self, fid: int, ckey: int) -> Optional[int]:
+        if fid in self.ckey2gckey and ckey in self.ckey2gckey[fid]:
+            return self.ckey2gckey[fid][ckey]
+        if self._xreftables is not None:
+            return self._xreftables.ckey2gckey.get(fid, ckey)
+        return None
+
+    def _gvids(self) -> List[int]:
+        result = set(self.gvid2vid.keys())
+        if self._xreftables is not None:
+            result.update(self._xreftables.gvid2vid.rowkeys())
+        return sorted(result)
+
+    def _gvid_row(self, gvid: int) -> Dict[int, int]:
+        """Returns fid -> vid for gvid (not to be modified)."""
+
+        if self._xreftables is None:
+            return self.gvid2vid.get(gvid, {})
+        result = self._xreftables.gvid2vid.row(gvid)
+        result.update(self.gvid2vid.get(gvid, {}))
+        return result
+
+    def _gckey_row(self, gckey: int) -> Dict[int, int]:
+        """Returns fid -> ckey for gckey (not to be modified)."""
+
+        if self._xreftables is None:
+            return self.gckey2ckey.get(gckey, {})
+        result = self._xreftables.gckey2ckey.row(gckey)
+        result.update(self.gckey2ckey.get(gckey, {}))
+        return result
+
+    def _fid_vids(self, fid: int) -> Dict[int, int]:
+        """Returns vid -> gvid for the file with index fid."""
+
+        result: Dict[int, int] = {}
+        if self._xreftables is not None:
+            result = self._xreftables.vid2gvid.row(fid)
+        result.update(self.vid2gvid.get(fid, {}))
+        return result
+
+    def _fid_ckeys(self, fid: int) -> Dict[int, int]:
+        """Returns ckey -> gckey for the file with index fid."""
+
+        result: Dict[int, int] = {}
+        if self._xreftables is not None:
+            result = self._xreftables.ckey2gckey.row(fid)
+        result.update(self.ckey2gckey.get(fid, {}))
+        return result
 
     def _add_xrefs(self, xnode: ET.Element, fid: int) -> None:
         if fid not in self.ckey2gckey:
@@ -437,6 +592,6 @@ class IndexManager:
             gvid = self.get_gvid(filevar)
             if gvid is not None:
                 chklogger.logger.info(
-                    "set function %s (%s) to file %s",
-                    gfun.varinfo.vname, str(gvid), str(fid))
+                    "set function %s (%d) to file %d",
+                    gfun.varinfo.vname, gvid, fid)
                 self.gviddefs[gvid] = fid
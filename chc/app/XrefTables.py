@@ -0,0 +1,258 @@
+# ------------------------------------------------------------------------------
+# CodeHawk C Analyzer
+# Author: Henny Sipma
+# ------------------------------------------------------------------------------
+# The MIT License (MIT)
+#
+# Copyright (c) 2026  Aarno Labs LLC
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ------------------------------------------------------------------------------
+"""Compact, memory-mapped tables of the global xrefs of a project.
+
+The xrefs of all files (file vid -> global vid and file ckey -> global
+ckey) are saved in a single binary file, in which every table is an array
+of 32-bit integers:
+
+- forward tables: the sorted fids, offsets per fid (CSR layout), and per
+  fid the sorted file indices with the corresponding global indices
+- reverse tables: the sorted global indices, offsets per global index, and
+  per global index the sorted fids with the corresponding file indices
+
+The file starts with a magic string and the lengths of the sixteen arrays,
+which follow in that order: the vid forward and reverse tables, then the
+ckey forward and reverse tables. The file is memory-mapped on load and all
+lookups are binary searches, so no per-file structures are built.
+"""
+
+import mmap
+import os
+import struct
+import sys
+
+from array import array
+from bisect import bisect_left
+from typing import BinaryIO, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from chc.util.loggingutil import chklogger
+
+
+xreftables_magic = b"CHCXREF1"
+
+xreftables_count = 16
+
+_header = struct.Struct("<8s" + str(xreftables_count) + "i")
+
+
+def _lookup(keys: Sequence[int], key: int, lo: int = 0, hi: int = -1) -> int:
+    """Returns the position of key in the sorted keys[lo:hi], or -1."""
+
+    if hi < 0:
+        hi = len(keys)
+    i = bisect_left(keys, key, lo, hi)
+    if i < hi and keys[i] == key:
+        return i
+    return -1
+
+
+def _csr_arrays(
+        rows: Dict[int, Dict[int, int]]) -> Tuple[
+            array, array, array, array]:
+    """Returns row keys, row offsets, column keys, and values of rows."""
+
+    rowkeys = array("i")
+    offsets = array("i", [0])
+    colkeys = array("i")
+    values = array("i")
+    for r in sorted(rows):
+        row = rows[r]
+        rowkeys.append(r)
+        for c in sorted(row):
+            colkeys.append(c)
+            values.append(row[c])
+        offsets.append(len(colkeys))
+    return (rowkeys, offsets, colkeys, values)
+
+
+def _reverse(rows: Dict[int, Dict[int, int]]) -> Dict[int, Dict[int, int]]:
+    """Returns the map global index -> fid -> file index of fid -> map."""
+
+    result: Dict[int, Dict[int, int]] = {}
+    for (fid, row) in rows.items():
+        for (index, gindex) in row.items():
+            result.setdefault(gindex, {})[fid] = index
+    return result
+
+
+def write_xref_tables(
+        filename: str,
+        vid2gvid: Dict[int, Dict[int, int]],
+        ckey2gckey: Dict[int, Dict[int, int]]) -> None:
+    """Saves the forward maps (fid -> index -> global index) to filename.
+
+    The reverse tables are derived from the forward maps, as they are when
+    the per-file xref files are read. The file is written under a temporary
+    name and then renamed, so a reader never sees a partial file.
+    """
+
+    tmpfilename = filename + ".tmp"
+    with open(tmpfilename, "wb") as fp:
+        write_xref_tables_to(fp, vid2gvid, ckey2gckey)
+    os.replace(tmpfilename, filename)
+
+
+def write_xref_tables_to(
+        fp: BinaryIO,
+        vid2gvid: Dict[int, Dict[int, int]],
+        ckey2gckey: Dict[int, Dict[int, int]]) -> int:
+    """Writes the tables of the forward maps to fp; returns the size written."""
+
+    arrays: List[array] = []
+    for rows in [vid2gvid, ckey2gckey]:
+        arrays.extend(_csr_arrays(rows))
+        arrays.extend(_csr_arrays(_reverse(rows)))
+    if sys.byteorder != "little":
+        for a in arrays:
+            a.byteswap()
+    fp.write(_header.pack(xreftables_magic, *[len(a) for a in arrays]))
+    for a in arrays:
+        a.tofile(fp)
+    return _header.size + 4 * sum(len(a) for a in arrays)
+
+
+class _CSRTable:
+    """Read-only view of one table in CSR layout."""
+
+    def __init__(
+            self,
+            rowkeys: memoryview,
+            offsets: memoryview,
+            colkeys: memoryview,
+            values: memoryview) -> None:
+        self._rowkeys = rowkeys
+        self._offsets = offsets
+        self._colkeys = colkeys
+        self._values = values
+
+    def __len__(self) -> int:
+        return len(self._colkeys)
+
+    def has_row(self, rowkey: int) -> bool:
+        return _lookup(self._rowkeys, rowkey) >= 0
+
+    def get(self, rowkey: int, colkey: int) -> Optional[int]:
+        r = _lookup(self._rowkeys, rowkey)
+        if r < 0:
+            return None
+        i = _lookup(
+            self._colkeys, colkey, self._offsets[r], self._offsets[r + 1])
+        if i < 0:
+            return None
+        return self._values[i]
+
+    def row(self, rowkey: int) -> Dict[int, int]:
+        r = _lookup(self._rowkeys, rowkey)
+        if r < 0:
+            return {}
+        lo = self._offsets[r]
+        hi = self._offsets[r + 1]
+        return dict(zip(self._colkeys[lo:hi], self._values[lo:hi]))
+
+    def rowkeys(self) -> Iterator[int]:
+        return iter(self._rowkeys)
+
+
+class XrefTables:
+    """Memory-mapped global xref tables of a project.
+
+    Args:
+        filename: name of a file written by write_xref_tables (if the file
+            cannot be used, is_valid is false)
+        offset: position of the tables in the file (e.g., in a snapshot)
+        size: size of the tables in bytes (default: up to the end of the file)
+    """
+
+    def __init__(self, filename: str, offset: int = 0, size: int = -1) -> None:
+        self._filename = filename
+        self._offset = offset
+        self._size = size
+        self._mmap: Optional[mmap.mmap] = None
+        self._tables: List[_CSRTable] = []
+        self._open()
+
+    @property
+    def filename(self) -> str:
+        return self._filename
+
+    @property
+    def is_valid(self) -> bool:
+        return len(self._tables) == 4
+
+    @property
+    def vid2gvid(self) -> _CSRTable:
+        """fid -> vid -> gvid"""
+        return self._tables[0]
+
+    @property
+    def gvid2vid(self) -> _CSRTable:
+        """gvid -> fid -> vid"""
+        return self._tables[1]
+
+    @property
+    def ckey2gckey(self) -> _CSRTable:
+        """fid -> ckey -> gckey"""
+        return self._tables[2]
+
+    @property
+    def gckey2ckey(self) -> _CSRTable:
+        """gckey -> fid -> ckey"""
+        return self._tables[3]
+
+    def has_file(self, fid: int) -> bool:
+        return self.vid2gvid.has_row(fid) or self.ckey2gckey.has_row(fid)
+
+    def _open(self) -> None:
+        if sys.byteorder != "little" or array("i").itemsize != 4:
+            # tables are saved as little-endian 32-bit integers
+            return
+        filesize = os.path.getsize(self.filename)
+        size = filesize - self._offset if self._size < 0 else self._size
+        if size < _header.size or self._offset + size > filesize:
+            chklogger.logger.warning(
+                "Xref tables file %s is truncated", self.filename)
+            return
+        with open(self.filename, "rb") as fp:
+            data = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, *lengths) = _header.unpack_from(data, self._offset)
+        if (
+                magic != xreftables_magic
+                or _header.size + 4 * sum(lengths) != size):
+            chklogger.logger.warning(
+                "Xref tables file %s is not valid", self.filename)
+            data.close()
+            return
+        self._mmap = data
+        view = memoryview(data)
+        arrays: List[memoryview] = []
+        pos = self._offset + _header.size
+        for n in lengths:
+            arrays.append(view[pos:pos + 4 * n].cast("i"))
+            pos += 4 * n
+        for i in range(0, xreftables_count, 4):
+            self._tables.append(_CSRTable(*arrays[i:i + 4]))
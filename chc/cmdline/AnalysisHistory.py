@@ -0,0 +1,173 @@
+# ------------------------------------------------------------------------------
+# CodeHawk C Analyzer
+# Author: Henny Sipma
+# ------------------------------------------------------------------------------
+# The MIT License (MIT)
+#
+# Copyright (c) 2026  Aarno Labs LLC
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ------------------------------------------------------------------------------
+"""Per-file analyzer times of earlier runs, used to schedule files.
+
+The wall-clock time of the analyzer on each file is recorded per round
+kind (e.g., primary, generate-and-check) and saved in
+<projectname>_analysishistory.json in the target directory. Parallel rounds
+start the files that are expected to take longest first, so that a large
+file does not start last and keep the other processes idle at the end of the
+round.
+
+The expected time of a file is its most recently recorded time for the round
+kind. Files without a recorded time (e.g., in the first run) are estimated
+from their number of source lines, scaled by the seconds per line of the
+files that do have a recorded time (or ranked by line count alone if none
+do).
+"""
+
+import json
+import os
+
+from typing import Any, Dict, List, Optional, TYPE_CHECKING
+
+import chc.util.fileutil as UF
+from chc.util.loggingutil import chklogger
+
+if TYPE_CHECKING:
+    from chc.app.CFile import CFile
+
+
+class AnalysisHistory:
+
+    def __init__(self, path: str, projectname: str) -> None:
+        self._filename = UF.get_analysis_history_filename(path, projectname)
+        self._rounds: Optional[Dict[str, Dict[str, float]]] = None
+
+    @property
+    def filename(self) -> str:
+        return self._filename
+
+    @property
+    def rounds(self) -> Dict[str, Dict[str, float]]:
+        """Returns a map from round kind to file name to seconds."""
+
+        if self._rounds is None:
+            self._rounds = {}
+            if os.path.isfile(self.filename):
+                try:
+                    with open(self.filename, "r") as fp:
+                        history: Dict[str, Any] = json.load(fp)
+                    self._rounds = history.get("rounds", {})
+                except (OSError, ValueError) as e:
+                    chklogger.logger.warning(
+                        "Unable to read analysis history %s: %s",
+                        self.filename, str(e))
+        return self._rounds
+
+    def expected_times(
+            self, roundkind: str, cfiles: List["CFile"]) -> Dict[str, float]:
+        """Returns the expected time (or relative size) of each file."""
+
+        times = self.rounds.get(roundkind, {})
+        linecounts: Dict[str, int] = {}
+        for cfile in cfiles:
+            if cfile.name not in times:
+                linecounts[cfile.name] = cfile.sourcefile.get_line_count()
+        if len(linecounts) == 0:
+            return {cfile.name: times[cfile.name] for cfile in cfiles}
+
+        # seconds per source line of the files that have been timed
+        timedseconds = 0.0
+        timedlines = 0
+        for cfile in cfiles:
+            if cfile.name in times:
+                timedseconds += times[cfile.name]
+                timedlines += cfile.sourcefile.get_line_count()
+        rate = (timedseconds / timedlines) if timedlines > 0 else 1.0
+
+        result: Dict[str, float] = {}
+        for cfile in cfiles:
+            if cfile.name in times:
+                result[cfile.name] = times[cfile.name]
+            else:
+                result[cfile.name] = rate * linecounts[cfile.name]
+        return result
+
+    def schedule(self, roundkind: str, cfiles: List["CFile"]) -> List["CFile"]:
+        """Returns the files ordered by decreasing expected time.
+
+        Files with equal expected times retain their original order.
+        """
+
+        expected = self.expected_times(roundkind, cfiles)
+        return sorted(cfiles, key=lambda cfile: -expected[cfile.name])
+
+    def record(self, roundkind: str, timings: Dict[str, float]) -> None:
+        self.rounds.setdefault(roundkind, {}).update(timings)
+
+    def save(self) -> None:
+        history: Dict[str, Any] = {}
+        history["rounds"] = self.rounds
+        try:
+            with open(self.filename, "w") as fp:
+                json.dump(history, fp, indent=2, sort_keys=True)
+        except OSError as e:
+            chklogger.logger.warning(
+                "Unable to save analysis history %s: %s",
+                self.filename, str(e))
+
+
+def balanced_batches(
+        cfiles: List["CFile"],
+        expected: Dict[str, float],
+        batchsize: int,
+        processes: int = 1) -> List[List["CFile"]]:
+    """Returns batches of at most batchsize files with balanced expected times.
+
+    The number of batches is the smallest that respects the batchsize, but
+    at least the number of processes (if there are enough files), so that no
+    process is left idle; files are assigned longest-first to the batch with
+    the least expected time that is not yet full, so large files end up in
+    (nearly) singleton batches and small files are grouped. Batches are
+    returned longest-expected-first.
+    """
+
+    if batchsize <= 1:
+        return [[cfile] for cfile in cfiles]
+    nbatches = max(
+        (len(cfiles) + batchsize - 1) // batchsize,
+        min(processes, len(cfiles)))
+    batches: List[List["CFile"]] = [[] for _ in range(nbatches)]
+    totals = [0.0] * nbatches
+    for cfile in sorted(cfiles, key=lambda cfile: -expected[cfile.name]):
+        i = min(
+            (i for i in range(nbatches) if len(batches[i]) < batchsize),
+            key=lambda i: totals[i])
+        batches[i].append(cfile)
+        totals[i] += expected[cfile.name]
+    order = sorted(range(nbatches), key=lambda i: -totals[i])
+    return [batches[i] for i in order if len(batches[i]) > 0]
+
+
+def parallel_efficiency(
+        timings: Dict[str, float], wallclock: float, processes: int) -> float:
+    """Returns busy process-seconds / (wall-clock seconds x processes)."""
+
+    if wallclock <= 0.0 or processes <= 0:
+        return 0.0
+    return sum(timings.values()) / (wallclock * processes)
@@ -33,12 +33,19 @@ import subprocess
 import os
 import shutil
 import sys
+import time
 
-from typing import List, Optional, Tuple, TYPE_CHECKING
+from typing import Callable, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+from chc.cmdline.AnalysisHistory import (
+    AnalysisHistory, balanced_batches, parallel_efficiency)
+from chc.cmdline.AnalyzerLimits import (
+    AnalyzerLimits, AnalyzerReport, AnalyzerRun, run_analyzer)
 
 from chc.util.Config import Config
 import chc.util.fileutil as UF
 from chc.util.loggingutil import chklogger
+from chc.util.profileutil import chcprofiler
 
 
 if TYPE_CHECKING:
@@ -62,7 +69,10 @@ class AnalysisManager:
             keep_system_includes: bool = False,
             verbose: bool = False,
             disable_timing: bool = False,
-            collectdiagnostics: bool = False
+            collectdiagnostics: bool = False,
+            schedule: bool = True,
+            limits: Optional[AnalyzerLimits] = None,
+            batchsize: int = 1
     ) -> None:
         """Initialize the analyzer location and target file location.
 
@@ -76,6 +86,15 @@ class AnalysisManager:
             thirdpartysummaries (string list): names of function summary jars
             verbose (bool): display analyzer output (default True)
             nofilter (bool): don't remove functions with absolute filename (default True)
+            schedule (bool): start files in parallel rounds longest-expected
+                             first, based on the recorded analysis history
+                             (default True)
+            limits (AnalyzerLimits): timeout and memory limit per analyzer
+                             invocation; if given, all invocations are recorded
+                             for the analyzer report (default None)
+            batchsize (int): maximum number of files analyzed in sequence by
+                             a single worker process in parallel rounds
+                             (default 1)
         """
 
         self._capp = capp
@@ -87,6 +106,14 @@ class AnalysisManager:
         self.verbose = verbose
         self.disable_timing = disable_timing
         self._collectdiagnostics = collectdiagnostics
+        self._schedule = schedule
+        self._history: Optional[AnalysisHistory] = None
+        self._limits = limits
+        self._batchsize = batchsize
+        self._report: Optional[AnalyzerReport] = None
+        if limits is not None:
+            self._report = AnalyzerReport(
+                capp.targetpath, capp.projectname, limits)
 
     @property
     def capp(self) -> "CApplication":
@@ -108,6 +135,16 @@ class AnalysisManager:
     def config(self) -> Config:
         return self._config
 
+    @property
+    def history(self) -> AnalysisHistory:
+        if self._history is None:
+            self._history = AnalysisHistory(self.targetpath, self.projectname)
+        return self._history
+
+    @property
+    def report(self) -> Optional[AnalyzerReport]:
+        return self._report
+
     @property
     def chsummaries(self) -> str:
         return self.config.summaries
@@ -155,6 +192,10 @@ class AnalysisManager:
 
         remove(UF.get_global_definitions_filename(
             self.capp.targetpath, self.capp.projectname))
+        remove(UF.get_xref_tables_filename(
+            self.capp.targetpath, self.capp.projectname))
+        remove(UF.get_snapshot_filename(
+            self.capp.targetpath, self.capp.projectname))
 
     def reset_logfiles(self) -> None:
         """Remove all log files from semantics directory."""
@@ -191,6 +232,44 @@ class AnalysisManager:
             print(args)
             exit(1)
 
+    def _run_file_cmd(
+            self,
+            cmd: List[str],
+            filename: str,
+            roundkind: str,
+            cwd: Optional[str] = None,
+            domains: Optional[str] = None,
+            rebuild: Optional[Callable[[str], List[str]]] = None,
+            capture: bool = True) -> AnalyzerRun:
+        """Runs an analyzer command on a file within the limits.
+
+        If the invocation is killed by a limit and rebuild is given, the
+        command is rebuilt with reduced domains and run once more. Both
+        invocations are recorded in the report.
+        """
+
+        if self._limits is None or self._report is None:
+            raise UF.CHCError("No analyzer limits have been set")
+        run = run_analyzer(
+            cmd, filename, roundkind, self._limits,
+            cwd=cwd, domains=domains, capture=capture)
+        self._report.record(run)
+        if run.is_killed and rebuild is not None and domains is not None:
+            reduced = self._limits.reduced_domains(domains)
+            if reduced is not None:
+                print_status(
+                    "Analyzer "
+                    + run.status
+                    + " on "
+                    + filename
+                    + "; retry with domains "
+                    + reduced)
+                run = run_analyzer(
+                    rebuild(reduced), filename, roundkind, self._limits,
+                    cwd=cwd, domains=reduced, capture=capture, retry=True)
+                self._report.record(run)
+        return run
+
     def _create_file_primary_proofobligations_cmd_partial(
             self, po_cmd="undefined-behavior-primary"
     ) -> List[str]:
@@ -242,7 +321,23 @@ class AnalysisManager:
             cmd.extend(["-loglevel", chloglevel])
             chklogger.logger.info(
                 "Ocaml analyzer is called with %s", str(cmd))
-            if self.verbose:
+            if self._limits is not None:
+                if self.verbose:
+                    print_status(str(cmd))
+                run = self._run_file_cmd(
+                    cmd,
+                    cfilename if cfilepath is None
+                    else os.path.join(cfilepath, cfilename),
+                    "primary",
+                    cwd=self.targetpath,
+                    capture=not self.verbose)
+                if run.is_killed:
+                    print_status(
+                        "Creating primary proof obligations " + run.status
+                        + " for " + cfilename)
+                    return 1
+                result = 0 if run.is_ok else 1
+            elif self.verbose:
                 print_status(str(cmd))
                 result = subprocess.call(
                     cmd, cwd=self.targetpath, stderr=subprocess.STDOUT)
@@ -275,12 +370,30 @@ class AnalysisManager:
 
         return 0
 
+    def _stamp_analysis(self) -> None:
+        """Records the start of an analyzer round on the application.
+
+        The round rewrites the proof obligations (and call sites) of the
+        files, so a snapshot saved before the stamp is no longer current.
+        """
+
+        filename = UF.get_analysis_stamp_filename(
+            self.targetpath, self.projectname)
+        try:
+            with open(filename, "w") as fp:
+                fp.write(time.strftime("%Y-%m-%d %H:%M:%S") + "\n")
+        except OSError as e:
+            chklogger.logger.warning(
+                "Unable to save analysis stamp %s: %s", filename, str(e))
+
     def create_app_primary_proofobligations(
             self,
             po_cmd: str = "undefined-behavior-primary",
             processes: int = 1) -> None:
         """Call analyzer to create ppo's for all application files."""
 
+        self._stamp_analysis()
+
         if processes > 1:
 
             def f(cfile: "CFile") -> None:
@@ -289,7 +402,16 @@ class AnalysisManager:
                 cmd.append(cfile.cfilename)
                 if cfile.cfilepath is not None:
                     cmd.extend(["-cfilepath", cfile.cfilepath])
-                self._execute_cmd(cmd)
+                if self._limits is not None:
+                    print_status(", ".join(cmd))
+                    run = self._run_file_cmd(cmd, cfile.name, "primary")
+                    print(run.output)
+                    if run.is_killed:
+                        return
+                    if not run.is_ok:
+                        exit(1)
+                else:
+                    self._execute_cmd(cmd)
                 pcfilename = (
                     cfile.cfilename if cfile.cfilepath is None
                     else os.path.join(cfile.cfilepath, cfile.cfilename))
@@ -298,12 +420,13 @@ class AnalysisManager:
                 cfile.reload_ppos()
                 cfile.reload_spos()
 
-            self.capp.iter_files_parallel(f, processes)
+            self._iter_files_parallel_profiled(f, processes, "primary")
         else:
 
             def f(cfile: "CFile") -> None:
-                self.create_file_primary_proofobligations(
-                    cfile.cfilename, cfile.cfilepath, po_cmd=po_cmd)
+                with chcprofiler.span(cfile.name):
+                    self.create_file_primary_proofobligations(
+                        cfile.cfilename, cfile.cfilepath, po_cmd=po_cmd)
 
             self.capp.iter_files(f)
 
@@ -367,7 +490,30 @@ class AnalysisManager:
             chklogger.logger.info(
                 "Calling AI to generate invariants: %s",
                 " ".join(cmd))
-            if self.verbose:
+
+            def rebuild(reduceddomains: str) -> List[str]:
+                rcmd = self._generate_and_check_file_cmd_partial(
+                    cfilepath, reduceddomains, iteration)
+                rcmd.append(cfilename)
+                rcmd.extend(["-loglevel", chloglevel])
+                return rcmd
+
+            if self._limits is not None:
+                run = self._run_file_cmd(
+                    cmd,
+                    cfilename if cfilepath is None
+                    else os.path.join(cfilepath, cfilename),
+                    "generate-and-check",
+                    cwd=self.targetpath,
+                    domains=domains,
+                    rebuild=rebuild,
+                    capture=not self.verbose)
+                print_status(
+                    "\nGenerate-and-check: result: " + run.status)
+                if run.is_killed:
+                    return 1
+                result = 0 if run.is_ok else 1
+            elif self.verbose:
                 result = subprocess.call(
                     cmd, cwd=self.targetpath, stderr=subprocess.STDOUT)
                 print_status("\nResult: " + str(result))
@@ -397,24 +543,148 @@ class AnalysisManager:
     def generate_and_check_app(self, domains: str, iteration: int, processes: int = 1) -> None:
         """Generate invariants and check proof obligations for application."""
 
+        self._stamp_analysis()
+
         if processes > 1:
 
-            def f(cfile: "CFile") -> None:
+            def rebuild(cfile: "CFile", reduceddomains: str) -> List[str]:
                 cmd = self._generate_and_check_file_cmd_partial(
-                    cfile.cfilepath, domains, iteration)
+                    cfile.cfilepath, reduceddomains, iteration)
                 cmd.append(cfile.cfilename)
-                self._execute_cmd(cmd)
+                return cmd
 
-            self.capp.iter_files_parallel(f, processes)
+            def f(cfile: "CFile") -> None:
+                cmd = rebuild(cfile, domains)
+                if self._limits is not None:
+                    print_status(", ".join(cmd))
+                    run = self._run_file_cmd(
+                        cmd,
+                        cfile.name,
+                        "generate-and-check",
+                        domains=domains,
+                        rebuild=lambda d: rebuild(cfile, d))
+                    print(run.output)
+                    if not (run.is_ok or run.is_killed):
+                        exit(1)
+                else:
+                    self._execute_cmd(cmd)
+
+            self._iter_files_parallel_profiled(
+                f, processes, "generate-and-check")
         else:
 
             def f(cfile: "CFile") -> None:
-                self.generate_and_check_file(
-                    cfile.cfilename, cfile.cfilepath, domains, iteration)
+                with chcprofiler.span(cfile.name):
+                    self.generate_and_check_file(
+                        cfile.cfilename, cfile.cfilepath, domains, iteration)
 
             self.capp.iter_files(f)
         self.capp.iter_files(self.reset_tables)
 
+    def _iter_files_parallel_profiled(
+            self,
+            f: Callable[["CFile"], None],
+            processes: int,
+            roundkind: str) -> None:
+        """Runs f on all files in parallel, recording per-file times.
+
+        Files are started longest-expected-first (if scheduling is enabled);
+        the times are recorded in the history and as profile spans, and the
+        parallel efficiency of the round is reported.
+        """
+
+        cfiles = list(self.capp.cfiles)
+        timings: Dict[str, float] = {}
+        t0 = time.perf_counter()
+        if self._batchsize > 1:
+            busytimings = self._iter_batches_parallel(
+                f, processes, roundkind, cfiles, timings)
+        else:
+            if self._schedule:
+                cfiles = self.history.schedule(roundkind, cfiles)
+            self.capp.iter_files_parallel(
+                f, processes, timings=timings, cfiles=cfiles)
+            busytimings = timings
+        wallclock = time.perf_counter() - t0
+
+        self.history.record(roundkind, timings)
+        self.history.save()
+        efficiency = parallel_efficiency(busytimings, wallclock, processes)
+        print_status(
+            roundkind
+            + ": "
+            + str(len(cfiles))
+            + " files in "
+            + "{:.1f}".format(wallclock)
+            + " secs with "
+            + str(processes)
+            + " processes; parallel efficiency: "
+            + "{:.0f}%".format(100.0 * efficiency))
+        chklogger.logger.info(
+            "%s: busy %.2f secs, wall-clock %.2f secs, processes %d, "
+            + "efficiency %.2f",
+            roundkind, sum(busytimings.values()), wallclock, processes,
+            efficiency)
+        if chcprofiler.enabled:
+            for (name, seconds) in timings.items():
+                chcprofiler.record(name, seconds)
+
+    def _iter_batches_parallel(
+            self,
+            f: Callable[["CFile"], None],
+            processes: int,
+            roundkind: str,
+            cfiles: List["CFile"],
+            timings: Dict[str, float]) -> Dict[str, float]:
+        """Runs f on batches of files, one worker process per batch.
+
+        The files of a batch are processed in sequence; a file that fails does
+        not stop the rest of the batch, and the failed files are reported by
+        name. Returns the time of each batch (by the name of its first file).
+
+        Only measured times are added to timings: the time of a singleton
+        batch, and otherwise the time of the analyzer invocations of each
+        file as recorded in the analyzer report (if limits are set). Files in
+        larger batches without a report are not timed.
+        """
+
+        expected = self.history.expected_times(roundkind, cfiles)
+        batches = balanced_batches(
+            cfiles, expected, self._batchsize, processes=processes)
+        chklogger.logger.info(
+            "%s: %d files in %d batches", roundkind, len(cfiles), len(batches))
+        batchfiles = {batch[0].name: batch for batch in batches}
+
+        def g(cfile: "CFile") -> None:
+            failed: List[str] = []
+            for bfile in batchfiles[cfile.name]:
+                try:
+                    f(bfile)
+                except SystemExit as e:
+                    if e.code not in [None, 0]:
+                        failed.append(bfile.name)
+            if len(failed) > 0:
+                print_status(roundkind + " failed for: " + ", ".join(failed))
+                exit(1)
+
+        reportedruns = 0 if self.report is None else len(self.report.runs())
+        batchtimings: Dict[str, float] = {}
+        self.capp.iter_files_parallel(
+            g, processes, timings=batchtimings,
+            cfiles=[batch[0] for batch in batches])
+        for (name, seconds) in batchtimings.items():
+            if len(batchfiles[name]) == 1:
+                timings[name] = seconds
+        if self.report is not None:
+            batched = set(
+                bfile.name for batch in batches if len(batch) > 1
+                for bfile in batch)
+            for run in self.report.runs()[reportedruns:]:
+                if run["round"] == roundkind and run["file"] in batched:
+                    timings[run["file"]] = (
+                        timings.get(run["file"], 0.0) + run["seconds"])
+        return batchtimings
+
 
 if __name__ == "__main__":
 
@@ -0,0 +1,348 @@
+# ------------------------------------------------------------------------------
+# CodeHawk C Analyzer
+# Author: Henny Sipma
+# ------------------------------------------------------------------------------
+# The MIT License (MIT)
+#
+# Copyright (c) 2026  Aarno Labs LLC
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ------------------------------------------------------------------------------
+"""Resource limits on analyzer invocations and a report of their outcomes.
+
+Each invocation of the (ocaml) analyzer on a file can be given a wall-clock
+timeout and a memory limit. The memory limit is applied to the analyzer
+process with setrlimit (RLIMIT_AS, the address space, as RLIMIT_RSS is not
+enforced by Linux). A generate-and-check invocation that is killed by either
+limit is retried once with reduced analysis domains (by default the domains
+without the relational domains l and r).
+
+Every invocation is recorded as one json line in
+<projectname>_analyzerruns.ndjson in the target directory, so that runs in
+parallel worker processes are recorded as well; the report summarizes these
+into the files that were killed (timeout or memory) or failed, and the files
+that took longer than the slow-time threshold, and is saved as
+<projectname>_analyzerreport.json.
+"""
+
+import json
+import os
+import resource
+import signal
+import subprocess
+import sys
+import time
+
+from typing import Any, Callable, Dict, List, Optional
+
+import chc.util.fileutil as UF
+from chc.util.loggingutil import chklogger
+
+# domains dropped when retrying an invocation that exceeded a limit
+relationaldomains = "lr"
+
+# exit code of an ocaml program terminated by an uncaught exception
+ocamlexceptionexit = 2
+
+# messages printed (on stderr) by the ocaml runtime when an allocation fails:
+# the uncaught Out_of_memory exception, and the fatal error of the runtime
+# itself (which aborts)
+ocamlmemorymessages = ["exception out_of_memory", "fatal error: out of memory"]
+
+
+class AnalyzerLimits:
+    """Limits on a single analyzer invocation.
+
+    Args:
+        timeout: wall-clock limit in seconds (None: no limit)
+        maxmemory: memory limit in MB (None: no limit)
+        slowtime: invocations that take longer (in seconds) are reported
+            as slow
+        retrydomains: domains to use when retrying an invocation that
+            exceeded a limit (None: the original domains without l and r)
+    """
+
+    def __init__(
+            self,
+            timeout: Optional[float] = None,
+            maxmemory: Optional[int] = None,
+            slowtime: float = 300.0,
+            retrydomains: Optional[str] = None) -> None:
+        self._timeout = timeout
+        self._maxmemory = maxmemory
+        self._slowtime = slowtime
+        self._retrydomains = retrydomains
+
+    @property
+    def timeout(self) -> Optional[float]:
+        return self._timeout
+
+    @property
+    def maxmemory(self) -> Optional[int]:
+        return self._maxmemory
+
+    @property
+    def slowtime(self) -> float:
+        return self._slowtime
+
+    @property
+    def preexec_fn(self) -> Optional[Callable[[], None]]:
+        """Returns the function that sets the memory limit in the child."""
+
+        if self.maxmemory is None:
+            return None
+        nbytes = self.maxmemory * 1024 * 1024
+
+        def setlimits() -> None:
+            resource.setrlimit(resource.RLIMIT_AS, (nbytes, nbytes))
+
+        return setlimits
+
+    def reduced_domains(self, domains: str) -> Optional[str]:
+        """Returns the domains for a retry, or None if there is no reduction."""
+
+        if self._retrydomains is not None:
+            reduced = self._retrydomains
+        else:
+            reduced = "".join(d for d in domains if d not in relationaldomains)
+        if reduced == domains or len(reduced) == 0:
+            return None
+        return reduced
+
+    def is_memory_failure(self, returncode: int, errors: str) -> bool:
+        """Returns true if the analyzer ran out of memory.
+
+        An allocation that fails against the memory limit makes the ocaml
+        runtime exit with an uncaught Out_of_memory exception (exit code 2),
+        or abort (SIGABRT) with a fatal error; either way the message is
+        printed on stderr (errors). An analyzer that is killed with SIGKILL
+        while a memory limit is set has been killed by the kernel (out of
+        memory killer), as timeouts are handled separately.
+        """
+
+        lowered = errors.lower()
+        if (
+                returncode in [ocamlexceptionexit, -signal.SIGABRT]
+                and any(m in lowered for m in ocamlmemorymessages)):
+            return True
+        return self.maxmemory is not None and returncode == -signal.SIGKILL
+
+
+class AnalyzerRun:
+    """Outcome of a single analyzer invocation on a file."""
+
+    def __init__(
+            self,
+            filename: str,
+            roundkind: str,
+            status: str,
+            seconds: float,
+            returncode: Optional[int] = None,
+            domains: Optional[str] = None,
+            retry: bool = False,
+            output: str = "") -> None:
+        self.filename = filename
+        self.roundkind = roundkind
+        self.status = status
+        self.seconds = seconds
+        self.returncode = returncode
+        self.domains = domains
+        self.retry = retry
+        self.output = output
+
+    @property
+    def is_ok(self) -> bool:
+        return self.status == "ok"
+
+    @property
+    def is_killed(self) -> bool:
+        return self.status in ["timeout", "memory"]
+
+    def to_dict(self) -> Dict[str, Any]:
+        result: Dict[str, Any] = {}
+        result["file"] = self.filename
+        result["round"] = self.roundkind
+        result["status"] = self.status
+        result["seconds"] = round(self.seconds, 3)
+        if self.returncode is not None:
+            result["returncode"] = self.returncode
+        if self.domains is not None:
+            result["domains"] = self.domains
+        if self.retry:
+            result["retry"] = True
+        return result
+
+
+def run_analyzer(
+        cmd: List[str],
+        filename: str,
+        roundkind: str,
+        limits: AnalyzerLimits,
+        cwd: Optional[str] = None,
+        domains: Optional[str] = None,
+        capture: bool = True,
+        retry: bool = False) -> AnalyzerRun:
+    """Runs an analyzer command within the limits.
+
+    If capture is true, the (combined) output of the analyzer is returned in
+    the output of the run; otherwise stdout goes to the terminal. In both
+    cases stderr is collected to detect memory failures; if not capturing it
+    is passed on to the terminal when the analyzer terminates.
+    """
+
+    t0 = time.perf_counter()
+    output = ""
+    errors = ""
+    returncode: Optional[int] = None
+
+    def decode(b: Any) -> str:
+        if isinstance(b, bytes):
+            return b.decode("utf-8", errors="replace")
+        return ""
+
+    try:
+        proc = subprocess.run(
+            cmd,
+            cwd=cwd,
+            stdout=subprocess.PIPE if capture else None,
+            stderr=subprocess.STDOUT if capture else subprocess.PIPE,
+            timeout=limits.timeout,
+            preexec_fn=limits.preexec_fn)
+        returncode = proc.returncode
+        if capture:
+            output = decode(proc.stdout)
+            errors = output
+        else:
+            errors = decode(proc.stderr)
+            sys.stderr.write(errors)
+        if returncode == 0:
+            status = "ok"
+        elif limits.is_memory_failure(returncode, errors):
+            status = "memory"
+        else:
+            status = "failed"
+    except subprocess.TimeoutExpired as e:
+        status = "timeout"
+        if capture:
+            output = decode(e.output)
+        else:
+            sys.stderr.write(decode(e.stderr))
+    seconds = time.perf_counter() - t0
+    if status != "ok":
+        chklogger.logger.warning(
+            "Analyzer %s on %s (%s) after %.1f secs",
+            status, filename, roundkind, seconds)
+    return AnalyzerRun(
+        filename, roundkind, status, seconds,
+        returncode=returncode, domains=domains, retry=retry, output=output)
+
+
+class AnalyzerReport:
+    """Records of the analyzer invocations of a project analysis."""
+
+    def __init__(
+            self, path: str, projectname: str, limits: AnalyzerLimits) -> None:
+        self._path = path
+        self._projectname = projectname
+        self._limits = limits
+
+    @property
+    def limits(self) -> AnalyzerLimits:
+        return self._limits
+
+    @property
+    def runsfilename(self) -> str:
+        return UF.get_analyzer_runs_filename(self._path, self._projectname)
+
+    @property
+    def reportfilename(self) -> str:
+        return UF.get_analyzer_report_filename(self._path, self._projectname)
+
+    def reset(self) -> None:
+        if os.path.isfile(self.runsfilename):
+            os.remove(self.runsfilename)
+
+    def record(self, run: AnalyzerRun) -> None:
+        """Appends the run (safe to call from parallel worker processes)."""
+
+        line = (json.dumps(run.to_dict()) + "\n").encode("utf-8")
+        fd = os.open(
+            self.runsfilename, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line)
+        finally:
+            os.close(fd)
+
+    def runs(self) -> List[Dict[str, Any]]:
+        result: List[Dict[str, Any]] = []
+        if os.path.isfile(self.runsfilename):
+            with open(self.runsfilename, "r") as fp:
+                for line in fp:
+                    if line.strip():
+                        result.append(json.loads(line))
+        return result
+
+    def summary(self) -> Dict[str, Any]:
+        runs = self.runs()
+        result: Dict[str, Any] = {}
+        result["invocations"] = len(runs)
+        result["limits"] = {
+            "timeout": self.limits.timeout,
+            "maxmemory": self.limits.maxmemory,
+            "slowtime": self.limits.slowtime}
+        result["killed"] = [r for r in runs if r["status"] in ["timeout", "memory"]]
+        result["failed"] = [r for r in runs if r["status"] == "failed"]
+        result["retried"] = [r for r in runs if r.get("retry", False)]
+        result["slow"] = sorted(
+            [r for r in runs
+             if r["status"] == "ok" and r["seconds"] >= self.limits.slowtime],
+            key=lambda r: -r["seconds"])
+        return result
+
+    def save(self) -> Dict[str, Any]:
+        summary = self.summary()
+        with open(self.reportfilename, "w") as fp:
+            json.dump(summary, fp, indent=2)
+        return summary
+
+
+def analyzer_report_to_string(summary: Dict[str, Any]) -> str:
+    lines: List[str] = []
+
+    def runline(r: Dict[str, Any]) -> str:
+        return (
+            "  "
+            + r["file"].ljust(40)
+            + r["round"].ljust(20)
+            + r["status"].ljust(10)
+            + "{:10.1f}".format(r["seconds"])
+            + ("  (" + r["domains"] + ")" if "domains" in r else ""))
+
+    lines.append(
+        "Analyzer invocations: " + str(summary["invocations"]))
+    for (title, key) in [
+            ("Killed (timeout or memory limit)", "killed"),
+            ("Failed", "failed"),
+            ("Retried with reduced domains", "retried"),
+            ("Slow (>= " + str(summary["limits"]["slowtime"]) + " secs)",
+             "slow")]:
+        if len(summary[key]) > 0:
+            lines.append(title + ": " + str(len(summary[key])))
+            lines.extend(runline(r) for r in summary[key])
+    return "\n".join(lines)
@@ -37,6 +37,8 @@ import xml.etree.ElementTree as ET
 
 from typing import Any, Dict, List, Optional, Tuple
 
+from chc.source.CSrcFile import get_line_index
+
 from chc.util.Config import Config
 
 import chc.util.fileutil as UF
@@ -292,8 +294,7 @@ class ParseManager(object):
 
     def get_file_length(self, fname: str) -> int:
         """Return the number of lines in named file."""
-        with open(fname, 'rb') as f:
-            return sum(1 for _ in f)
+        return get_line_index(fname).line_count
 
     def normalize_filename(self, filename: str) -> str:
         """Make filename relative to project directory (if in project
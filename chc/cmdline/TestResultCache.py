@@ -0,0 +1,184 @@
+# ------------------------------------------------------------------------------
+# CodeHawk C Analyzer
+# Author: Henny Sipma
+# ------------------------------------------------------------------------------
+# The MIT License (MIT)
+#
+# Copyright (c) 2026  Aarno Labs LLC
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ------------------------------------------------------------------------------
+"""Cache of test results, keyed on the test sources and the analyzer used.
+
+A test result is reused only if neither the sources of the test (c files,
+reference specification, contracts) nor the parser, analyzer, summaries, or
+the sources of the chc package (which set up and check the tests) have
+changed since the result was recorded.
+"""
+
+import hashlib
+import json
+import os
+
+from typing import Any, Dict, List, Optional
+
+from chc.app.CHVersion import chcversion
+
+from chc.util.Config import Config
+from chc.util.loggingutil import chklogger
+
+
+def files_hash(filenames: List[str]) -> str:
+    """Returns a hash over the names and contents of the given files."""
+
+    h = hashlib.sha256()
+    for filename in sorted(filenames):
+        h.update(os.path.basename(filename).encode("utf-8"))
+        if os.path.isfile(filename):
+            with open(filename, "rb") as fp:
+                for chunk in iter(lambda: fp.read(1 << 20), b""):
+                    h.update(chunk)
+    return h.hexdigest()
+
+
+def package_hash() -> str:
+    """Returns a hash over the python sources of the chc package."""
+
+    chcdir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    h = hashlib.sha256()
+    for (d, dirnames, fnames) in os.walk(chcdir):
+        dirnames.sort()
+        for fname in sorted(fnames):
+            # the local configuration only holds paths
+            if fname == "ConfigLocal.py":
+                continue
+            if not (fname.endswith(".py") or fname == "chkc"):
+                continue
+            filename = os.path.join(d, fname)
+            h.update(os.path.relpath(filename, chcdir).encode("utf-8"))
+            with open(filename, "rb") as fp:
+                h.update(fp.read())
+    return h.hexdigest()
+
+
+def directory_files(
+        path: str,
+        extensions: List[str],
+        subdirs: List[str] = []) -> List[str]:
+    """Returns the files in path with the given extensions.
+
+    Files in the listed subdirectories are included irrespective of their
+    extension; other subdirectories (e.g., the analysis results) are skipped.
+    """
+
+    result: List[str] = []
+    if not os.path.isdir(path):
+        return result
+    for name in os.listdir(path):
+        filename = os.path.join(path, name)
+        if os.path.isfile(filename):
+            if any(name.endswith(ext) for ext in extensions):
+                result.append(filename)
+        elif name in subdirs:
+            for (d, _, fnames) in os.walk(filename):
+                result.extend(os.path.join(d, f) for f in fnames)
+    return result
+
+
+class TestResultCache:
+    """Persistent map from test names to their most recent passing result.
+
+    Args:
+        filename: name of the json file that holds the cache
+        enabled: if false, lookups always miss (results are still recorded)
+    """
+
+    def __init__(self, filename: str, enabled: bool = True) -> None:
+        self._filename = filename
+        self._enabled = enabled
+        self._config = Config()
+        self._analyzerhash: Optional[str] = None
+        self._entries: Optional[Dict[str, Dict[str, str]]] = None
+
+    @property
+    def filename(self) -> str:
+        return self._filename
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    @property
+    def analyzerhash(self) -> str:
+        """Returns a hash over the executables, summaries, and chc sources."""
+
+        if self._analyzerhash is None:
+            h = hashlib.sha256()
+            h.update(chcversion.encode("utf-8"))
+            h.update(package_hash().encode("utf-8"))
+            h.update(files_hash([
+                self._config.cparser,
+                self._config.canalyzer,
+                self._config.summaries]).encode("utf-8"))
+            self._analyzerhash = h.hexdigest()
+        return self._analyzerhash
+
+    @property
+    def entries(self) -> Dict[str, Dict[str, str]]:
+        if self._entries is None:
+            self._entries = {}
+            if os.path.isfile(self.filename):
+                try:
+                    with open(self.filename, "r") as fp:
+                        cache: Dict[str, Any] = json.load(fp)
+                    self._entries = cache.get("tests", {})
+                except (OSError, ValueError) as e:
+                    chklogger.logger.warning(
+                        "Unable to read test result cache %s: %s",
+                        self.filename, str(e))
+        return self._entries
+
+    def get_result(self, testname: str, sourcehash: str) -> Optional[str]:
+        """Returns the cached result if sources and analyzer are unchanged."""
+
+        if not self.enabled:
+            return None
+        entry = self.entries.get(testname)
+        if entry is None:
+            return None
+        if (
+                entry.get("source") == sourcehash
+                and entry.get("analyzer") == self.analyzerhash):
+            return entry.get("result")
+        return None
+
+    def set_result(self, testname: str, sourcehash: str, result: str) -> None:
+        self.entries[testname] = {
+            "source": sourcehash,
+            "analyzer": self.analyzerhash,
+            "result": result}
+
+    def remove_result(self, testname: str) -> None:
+        self.entries.pop(testname, None)
+
+    def save(self) -> None:
+        cache: Dict[str, Any] = {}
+        cache["tests"] = self.entries
+        with open(self.filename, "w") as fp:
+            json.dump(cache, fp, indent=2, sort_keys=True)
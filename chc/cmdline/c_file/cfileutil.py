@@ -456,16 +456,15 @@ def cfile_cil_source(args: argparse.Namespace) -> NoReturn:
     capp.initialize_single_file(cfilename)
     cfile = capp.get_cfile()
 
-    fcilsource = cfile.cil_source()
-
     if xoutput is not None:
         outputfilename = xoutput + ".cil.c"
         with open(outputfilename, "w") as fp:
-            fp.write(fcilsource)
+            cfile.write_cil_source(fp)
         print("Cil source code written to " + outputfilename)
 
     else:
-        print(fcilsource)
+        cfile.write_cil_source(sys.stdout)
+        print()
 
     exit(0)
 
@@ -500,6 +499,7 @@ def cfile_analyze_file(args: argparse.Namespace) -> NoReturn:
     loglevel: str = args.loglevel
     logfilename: Optional[str] = args.logfilename
     logfilemode: str = args.logfilemode
+    warninglimit: Optional[int] = args.warning_limit
 
     projectpath = os.path.dirname(os.path.abspath(xcfilename))
     targetpath = projectpath if opttgtpath is None else opttgtpath
@@ -516,6 +516,7 @@ def cfile_analyze_file(args: argparse.Namespace) -> NoReturn:
         logfilename=logfilename,
         mode=logfilemode,
         msg="Command cfile analyze was invoked")
+    chklogger.set_warning_limit(warninglimit)
 
     chklogger.logger.info(
         "Project path: %s; target path: %s", projectpath, targetpath)
@@ -578,6 +579,7 @@ def cfile_analyze_file(args: argparse.Namespace) -> NoReturn:
         am.generate_and_check_file(cfilename, None, analysisdomains, k + 1)
         am.reset_tables(cfile)
 
+    chklogger.flush_aggregated_warnings()
     chklogger.logger.info("cfile analyze completed")
 
     exit(0)
@@ -695,6 +697,7 @@ def cfile_run_file(args: argparse.Namespace) -> NoReturn:
     loglevel: str = args.loglevel
     logfilename: Optional[str] = args.logfilename
     logfilemode: str = args.logfilemode
+    warninglimit: Optional[int] = args.warning_limit
 
     try:
         UF.check_parser()
@@ -729,6 +732,7 @@ def cfile_run_file(args: argparse.Namespace) -> NoReturn:
         logfilename=logfilename,
         mode=logfilemode,
         msg="Command cfile run was invoked")
+    chklogger.set_warning_limit(warninglimit)
 
     chklogger.logger.info("Target path: %s", targetpath)
 
@@ -812,6 +816,7 @@ def cfile_run_file(args: argparse.Namespace) -> NoReturn:
         am.generate_and_check_file(cfilename, None, analysisdomains, k + 1)
         am.reset_tables(cfile)
 
+    chklogger.flush_aggregated_warnings()
     chklogger.logger.info("cfile analyze completed")
 
     capp = CApplication(
@@ -1015,6 +1020,7 @@ def cfile_testlibc_summary(args: argparse.Namespace) -> NoReturn:
     loglevel: str = args.loglevel
     logfilename: Optional[str] = args.logfilename
     logfilemode: str = args.logfilemode
+    warninglimit: Optional[int] = args.warning_limit
 
     try:
         (projectpath, cfilename_c) = UF.get_libc_summary_test(cheader, cfnname)
@@ -1036,6 +1042,7 @@ def cfile_testlibc_summary(args: argparse.Namespace) -> NoReturn:
         logfilename=logfilename,
         mode=logfilemode,
         msg="cfile test-libc-summary invoked")
+    chklogger.set_warning_limit(warninglimit)
 
     parsemanager = ParseManager(projectpath, projectname, targetpath)
     parsemanager.remove_semantics()
@@ -1082,6 +1089,7 @@ def cfile_testlibc_summary(args: argparse.Namespace) -> NoReturn:
         am.generate_and_check_file(cfilename, None, "llrvisp", k + 1)
         am.reset_tables(cfile)
 
+    chklogger.flush_aggregated_warnings()
     chklogger.logger.info("cfile analyze completed")
 
     capp = CApplication(
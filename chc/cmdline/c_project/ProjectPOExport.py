@@ -0,0 +1,228 @@
+# ------------------------------------------------------------------------------
+# CodeHawk C Analyzer
+# Author: Henny Sipma
+# ------------------------------------------------------------------------------
+# The MIT License (MIT)
+#
+# Copyright (c) 2026  Aarno Labs LLC
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ------------------------------------------------------------------------------
+"""Streaming export of proof obligations as newline-delimited json.
+
+The results of each c file are written to a separate part file in the output
+directory, one json object per line, as the file is walked; no json tree of
+the file or the project is built. Parts are written by parallel worker
+processes, and a manifest that lists the parts is written when all parts
+are complete.
+
+Records in a part (the "record" field identifies the kind):
+
+- file: {"fid", "file", "filename"}, always the first record
+- source: {"file", "first", "last", "lines": [[linenumber, line], ...]},
+  a range of at most sourcechunk source lines
+- ppo / spo: {"file", "function"} + the fields of ppo_to_json_result
+- api: {"file", "function"} + the fields of fn_api_to_json_result
+- end: {"file", "records": {<kind>: <count>}}, always the last record;
+  a part without it is incomplete
+
+The manifest (<projectname>_manifest.json) lists, per file, the part
+filename, its size in bytes, its record counts, and its status (complete,
+incomplete, or missing), together with the totals.
+"""
+
+import json
+import os
+
+from typing import Any, Dict, Iterator, List, Optional, TYPE_CHECKING
+
+import chc.cmdline.jsonresultutil as JU
+
+from chc.util.loggingutil import chklogger
+
+if TYPE_CHECKING:
+    from chc.app.CApplication import CApplication
+    from chc.app.CFile import CFile
+
+
+def part_filename(cfile: "CFile") -> str:
+    """Returns the name of the part file of a c file (unique by file index)."""
+
+    return "{:05d}_{}.ndjson".format(cfile.index, cfile.cfilename)
+
+
+def iter_file_records(
+        cfile: "CFile", sourcechunk: int = 200) -> Iterator[Dict[str, Any]]:
+    """Yields the records of a c file, except for the final end record.
+
+    The proof obligations of a function are released once its records have
+    been yielded.
+    """
+
+    filedata: Dict[str, Any] = {"record": "file", "fid": cfile.index}
+    filedata["file"] = cfile.name
+    filedata.update(JU.jsonfiledata(cfile))
+    yield filedata
+
+    lines: List[List[Any]] = []
+    for (n, line) in cfile.sourcefile.iter_lines():
+        lines.append([n, line])
+        if len(lines) >= sourcechunk:
+            yield source_record(cfile, lines)
+            lines = []
+    if len(lines) > 0:
+        yield source_record(cfile, lines)
+
+    for fn in cfile.get_functions():
+        for (kind, pos) in [("ppo", fn.get_ppos()), ("spo", fn.get_spos())]:
+            for po in sorted(pos, key=lambda po: po.line):
+                record: Dict[str, Any] = {
+                    "record": kind, "file": cfile.name, "function": fn.name}
+                record.update(JU.ppo_to_json_result(po).content)
+                yield record
+        apirecord: Dict[str, Any] = {
+            "record": "api", "file": cfile.name, "function": fn.name}
+        apirecord.update(JU.fn_api_to_json_result(fn.api).content)
+        yield apirecord
+        # the records of this function have been written
+        fn.release_state()
+
+
+def source_record(cfile: "CFile", lines: List[List[Any]]) -> Dict[str, Any]:
+    record: Dict[str, Any] = {"record": "source", "file": cfile.name}
+    record["first"] = lines[0][0]
+    record["last"] = lines[-1][0]
+    record["lines"] = lines
+    return record
+
+
+def export_file(cfile: "CFile", outputdir: str, sourcechunk: int = 200) -> None:
+    """Writes the part of a c file, ending with its end record.
+
+    The part is written to a temporary file that is renamed when complete,
+    so a part that exists under its final name is never partially written.
+    """
+
+    filename = os.path.join(outputdir, part_filename(cfile))
+    tmpfilename = filename + ".tmp"
+    counts: Dict[str, int] = {}
+    try:
+        with open(tmpfilename, "w") as fp:
+            for record in iter_file_records(cfile, sourcechunk):
+                kind = record["record"]
+                counts[kind] = counts.get(kind, 0) + 1
+                fp.write(json.dumps(record))
+                fp.write("\n")
+            fp.write(json.dumps(
+                {"record": "end", "file": cfile.name, "records": counts}))
+            fp.write("\n")
+        os.replace(tmpfilename, filename)
+    finally:
+        if os.path.isfile(tmpfilename):
+            os.remove(tmpfilename)
+    chklogger.logger.info("Exported %s to %s", cfile.name, filename)
+
+
+def read_end_record(filename: str) -> Optional[Dict[str, Any]]:
+    """Returns the end record of a part, or None if the part is incomplete."""
+
+    with open(filename, "rb") as fp:
+        fp.seek(0, os.SEEK_END)
+        size = fp.tell()
+        fp.seek(max(0, size - (1 << 16)))
+        tail = fp.read().rstrip(b"\n")
+    lastline = tail.rsplit(b"\n", 1)[-1]
+    try:
+        record = json.loads(lastline.decode("utf-8"))
+    except ValueError:
+        return None
+    if isinstance(record, dict) and record.get("record") == "end":
+        return record
+    return None
+
+
+def file_manifest_entry(cfile: "CFile", outputdir: str) -> Dict[str, Any]:
+    entry: Dict[str, Any] = {"fid": cfile.index, "file": cfile.name}
+    entry["part"] = part_filename(cfile)
+    filename = os.path.join(outputdir, entry["part"])
+    if not os.path.isfile(filename):
+        entry["status"] = "missing"
+        return entry
+    entry["bytes"] = os.path.getsize(filename)
+    endrecord = read_end_record(filename)
+    if endrecord is None:
+        entry["status"] = "incomplete"
+    else:
+        entry["status"] = "complete"
+        entry["records"] = endrecord["records"]
+    return entry
+
+
+def export_project(
+        capp: "CApplication",
+        outputdir: str,
+        processes: int = 1,
+        sourcechunk: int = 200,
+        files: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Exports the parts of all (or the given) files and writes the manifest.
+
+    Returns the content of the manifest.
+    """
+
+    os.makedirs(outputdir, exist_ok=True)
+    cfiles = [
+        cfile for cfile in capp.cfiles if files is None or cfile.name in files]
+
+    # remove parts of an earlier export, so a failed worker shows as missing,
+    # including temporary parts left behind by a worker that was killed
+    for cfile in cfiles:
+        filename = os.path.join(outputdir, part_filename(cfile))
+        for name in [filename, filename + ".tmp"]:
+            if os.path.isfile(name):
+                os.remove(name)
+
+    def f(cfile: "CFile") -> None:
+        if files is None or cfile.name in files:
+            export_file(cfile, outputdir, sourcechunk)
+
+    if processes > 1:
+        capp.iter_files_parallel(f, processes)
+    else:
+        capp.iter_files(f)
+
+    content: Dict[str, Any] = {}
+    content["project"] = capp.projectname
+    content["sourcechunk"] = sourcechunk
+    entries = [file_manifest_entry(cfile, outputdir) for cfile in cfiles]
+    content["files"] = entries
+    totals: Dict[str, int] = {}
+    for entry in entries:
+        for (kind, count) in entry.get("records", {}).items():
+            totals[kind] = totals.get(kind, 0) + count
+    content["totals"] = totals
+    content["bytes"] = sum(entry.get("bytes", 0) for entry in entries)
+    content["incomplete"] = [
+        entry["file"] for entry in entries if entry["status"] != "complete"]
+
+    manifest = JU.jsonok("ndjson-export-manifest", content)
+    manifestname = os.path.join(
+        outputdir, capp.projectname + "_manifest.json")
+    with open(manifestname, "w") as fp:
+        json.dump(manifest, fp, indent=2)
+    return content
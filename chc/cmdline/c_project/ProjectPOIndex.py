@@ -0,0 +1,401 @@
+# ------------------------------------------------------------------------------
+# CodeHawk C Analyzer
+# Author: Henny Sipma
+# ------------------------------------------------------------------------------
+# The MIT License (MIT)
+#
+# Copyright (c) 2026  Aarno Labs LLC
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ------------------------------------------------------------------------------
+"""Persisted per-file indices of proof obligations for project-wide queries.
+
+For each c file an index is saved next to the analysis results of the file
+(<cfilename>_poindex.json) that records, for every function, its resolved
+callees, the names of its external callees (callees that are not defined in
+the project, e.g., library functions), and the invariants at the locations
+of its proof obligations, and for every proof obligation its id, line,
+predicate, status, discharge method, and location. An index is rebuilt
+only when analysis results of the file are newer than the index, or when it
+was saved in an older format.
+
+Queries are answered from the indices alone; proof obligations are decoded
+from the analysis results only for the matches, and only if details are
+requested.
+
+Format of the index:
+
+  {"version": <format version>,
+   "fid": <file index>,
+   "file": <filename relative to the project, without extension>,
+   "functions": {
+      <functionname>: {
+         "vid": <vid>,
+         "callees": [[<fid>, <vid>], ...],
+         "external-callees": [<functionname>, ...],
+         "pos": [[<kind>, <id>, <line>, <predicate-tag>, <status>, <method>,
+                  <cfg-context>], ...],
+         "invariants": {<cfg-context>: [<invariant>, ...], ...}
+      }
+   }
+  }
+
+with kind "p" for primary and "s" for supporting proof obligations. The
+location of a proof obligation is the index of its cfg context in the
+context dictionary of the file; the invariants at a location are rendered
+as in the code reports.
+"""
+
+import json
+import os
+
+from typing import (
+    Any, Dict, Iterator, List, Optional, Set, Tuple, TYPE_CHECKING)
+
+from chc.app.IndexManager import FileVarReference
+
+import chc.cmdline.jsonresultutil as JU
+
+from chc.proof.CPOPredicate import get_predicate_name, get_predicate_tag
+
+import chc.reporting.ProofObligations as RP
+
+import chc.util.fileutil as UF
+from chc.util.loggingutil import chklogger
+
+if TYPE_CHECKING:
+    from chc.app.CApplication import CApplication
+    from chc.app.CFile import CFile
+    from chc.app.CFunction import CFunction
+    from chc.proof.CFunctionPO import CFunctionPO
+
+
+poindex_version = 3
+
+
+def _latest_results_mtime(cfile: "CFile") -> float:
+    fnspath = UF.get_cfile_fnspath(
+        cfile.targetpath, cfile.projectname, cfile.cfilepath, cfile.cfilename)
+    result = 0.0
+    for (d, _, fnames) in os.walk(fnspath):
+        for fname in fnames:
+            result = max(result, os.path.getmtime(os.path.join(d, fname)))
+    return result
+
+
+def _location_invariants(
+        cfun: "CFunction", cfgcontexts: Set[int]) -> Dict[str, List[str]]:
+    """Returns the rendered invariants at the given cfg contexts."""
+
+    try:
+        cfgindex = cfun.invarianttable.cfg_context_index
+    except UF.CHCError as e:
+        chklogger.logger.warning(
+            "No invariants for %s: %s", cfun.name, str(e))
+        return {}
+    result: Dict[str, List[str]] = {}
+    for cfgcontext in sorted(cfgcontexts):
+        cinvs = cfgindex.get(cfgcontext)
+        if cinvs is not None and len(cinvs.sorted) > 0:
+            result[str(cfgcontext)] = [
+                str(inv).strip() for inv in cinvs.sorted]
+    return result
+
+
+def build_file_index(cfile: "CFile") -> Dict[str, Any]:
+    """Returns the proof obligation index of a c file."""
+
+    capp = cfile.capp
+    functions: Dict[str, Any] = {}
+
+    def po_entry(kind: str, po: "CFunctionPO") -> List[Any]:
+        return [
+            kind,
+            po.po_index,
+            po.line,
+            po.predicate.tags[0],
+            po.status,
+            RP.get_dsmethod(po),
+            po.context.args[0]]
+
+    for cfun in cfile.get_functions():
+        callees: List[List[int]] = []
+        externalcallees: List[str] = []
+        pos: List[List[Any]] = []
+        for cs in cfun.proofs.spos.callsite_spos.values():
+            if cs.has_callee():
+                fundef = capp.indexmanager.resolve_vid(
+                    FileVarReference(cfile.index, cs.callee.vid))
+                if fundef is None:
+                    if cs.callee.vname not in externalcallees:
+                        externalcallees.append(cs.callee.vname)
+                elif list(fundef.tuple) not in callees:
+                    callees.append(list(fundef.tuple))
+        cfun.proofs.iter_ppos(lambda po: pos.append(po_entry("p", po)))
+        cfun.proofs.iter_spos(lambda po: pos.append(po_entry("s", po)))
+        functions[cfun.name] = {
+            "vid": cfun.svar.vid,
+            "callees": callees,
+            "external-callees": externalcallees,
+            "pos": pos,
+            "invariants": _location_invariants(
+                cfun, set(entry[6] for entry in pos))}
+
+    result: Dict[str, Any] = {}
+    result["version"] = poindex_version
+    result["fid"] = cfile.index
+    result["file"] = cfile.name
+    result["functions"] = functions
+    return result
+
+
+def load_file_index(cfile: "CFile", refresh: bool = True) -> Dict[str, Any]:
+    """Returns the saved index of a c file, (re)building it if out of date."""
+
+    filename = UF.get_cfile_poindex_filename(
+        cfile.targetpath, cfile.projectname, cfile.cfilepath, cfile.cfilename)
+    if os.path.isfile(filename):
+        if (
+                not refresh
+                or os.path.getmtime(filename) >= _latest_results_mtime(cfile)):
+            try:
+                with open(filename, "r") as fp:
+                    index: Dict[str, Any] = json.load(fp)
+                if index.get("version") == poindex_version:
+                    return index
+                chklogger.logger.info(
+                    "Po index %s has an older format; rebuilding", filename)
+            except ValueError as e:
+                chklogger.logger.warning(
+                    "Unable to read po index %s: %s; rebuilding", filename, str(e))
+    chklogger.logger.info("Build po index for %s", cfile.name)
+    index = build_file_index(cfile)
+    with open(filename, "w") as fp:
+        json.dump(index, fp)
+    return index
+
+
+class POQueryFilter:
+    """Conjunction of the criteria a proof obligation must satisfy.
+
+    Every criterion that is None (or empty) is not checked. Predicates may be
+    given by name (e.g., index-upper-bound) or by tag.
+
+    Args:
+        kinds: "p" (primary), "s" (supporting), or both
+        predicates: predicate names or tags
+        statuses: statuses, e.g., open, safe, violation
+        methods: discharge methods, e.g., stmt, local, api, contract, open
+        files: filenames relative to the project (with or without .c)
+        functions: names of the functions that contain the proof obligation
+        linerange: (first, last) line, inclusive
+        callees: proof obligation must be in a function that directly calls
+            one of these functions (defined in the project or external)
+        reachablefrom: proof obligation must be in a function that is
+            (transitively) called from one of these functions
+        invariants: one of the invariants at the location of the proof
+            obligation must contain one of these strings
+    """
+
+    def __init__(
+            self,
+            kinds: List[str] = ["p", "s"],
+            predicates: Optional[List[str]] = None,
+            statuses: Optional[List[str]] = None,
+            methods: Optional[List[str]] = None,
+            files: Optional[List[str]] = None,
+            functions: Optional[List[str]] = None,
+            linerange: Optional[Tuple[int, int]] = None,
+            callees: Optional[List[str]] = None,
+            reachablefrom: Optional[List[str]] = None,
+            invariants: Optional[List[str]] = None) -> None:
+        self.kinds = set(kinds)
+        self.predicates: Optional[Set[str]] = (
+            None if not predicates
+            else set(get_predicate_tag(p) for p in predicates))
+        self.statuses: Optional[Set[str]] = (
+            None if not statuses else set(statuses))
+        self.methods: Optional[Set[str]] = (
+            None if not methods else set(methods))
+        self.files: Optional[Set[str]] = (
+            None if not files
+            else set(f[:-2] if f.endswith(".c") else f for f in files))
+        self.functions: Optional[Set[str]] = (
+            None if not functions else set(functions))
+        self.linerange = linerange
+        self.callees: Optional[Set[str]] = (
+            None if not callees else set(callees))
+        self.reachablefrom: Optional[Set[str]] = (
+            None if not reachablefrom else set(reachablefrom))
+        self.invariants: Optional[List[str]] = (
+            None if not invariants else invariants)
+
+    @property
+    def uses_callgraph(self) -> bool:
+        return self.callees is not None or self.reachablefrom is not None
+
+    def matches_file(self, filename: str) -> bool:
+        return self.files is None or filename in self.files
+
+    def matches_function(self, fname: str) -> bool:
+        return self.functions is None or fname in self.functions
+
+    def matches_entry(
+            self,
+            entry: List[Any],
+            invariants: Dict[str, List[str]] = {}) -> bool:
+        """Returns true if the entry satisfies all criteria.
+
+        The invariants are those of the function of the entry, by location.
+        """
+
+        (kind, _, line, tag, status, method, cfgcontext) = entry
+        return (
+            kind in self.kinds
+            and (self.predicates is None or tag in self.predicates)
+            and (self.statuses is None or status in self.statuses)
+            and (self.methods is None or method in self.methods)
+            and (
+                self.linerange is None
+                or self.linerange[0] <= line <= self.linerange[1])
+            and (
+                self.invariants is None
+                or any(
+                    s in inv
+                    for inv in invariants.get(str(cfgcontext), [])
+                    for s in self.invariants)))
+
+
+class ProjectPOIndex:
+    """Query access to the proof obligation indices of all files of a project."""
+
+    def __init__(self, capp: "CApplication", refresh: bool = True) -> None:
+        self._capp = capp
+        self._refresh = refresh
+        self._indices: Dict[int, Dict[str, Any]] = {}
+
+    @property
+    def capp(self) -> "CApplication":
+        return self._capp
+
+    def file_index(self, cfile: "CFile") -> Dict[str, Any]:
+        if cfile.index not in self._indices:
+            self._indices[cfile.index] = load_file_index(
+                cfile, refresh=self._refresh)
+        return self._indices[cfile.index]
+
+    def _function_table(self) -> Dict[
+            Tuple[int, int], Tuple[str, List[Tuple[int, int]], List[str]]]:
+        """Returns a map (fid, vid) -> (name, callees, external callees)."""
+
+        result: Dict[
+            Tuple[int, int], Tuple[str, List[Tuple[int, int]], List[str]]] = {}
+        for cfile in self.capp.cfiles:
+            index = self.file_index(cfile)
+            for (fname, fdata) in index["functions"].items():
+                result[(cfile.index, fdata["vid"])] = (
+                    fname,
+                    [(c[0], c[1]) for c in fdata["callees"]],
+                    fdata["external-callees"])
+        return result
+
+    def _callgraph_selection(
+            self, pofilter: POQueryFilter) -> Optional[Set[Tuple[int, int]]]:
+        """Returns the functions that satisfy the call-graph criteria."""
+
+        if not pofilter.uses_callgraph:
+            return None
+        table = self._function_table()
+        selection: Optional[Set[Tuple[int, int]]] = None
+        if pofilter.callees is not None:
+            calleenames = pofilter.callees
+            selection = set(
+                f for (f, (_, callees, externalcallees)) in table.items()
+                if any(
+                        c in table and table[c][0] in calleenames
+                        for c in callees)
+                or any(name in calleenames for name in externalcallees))
+        if pofilter.reachablefrom is not None:
+            reached: Set[Tuple[int, int]] = set()
+            worklist = [
+                c for (f, (name, callees, _)) in table.items()
+                if name in pofilter.reachablefrom for c in callees]
+            while len(worklist) > 0:
+                f = worklist.pop()
+                if f in reached or f not in table:
+                    continue
+                reached.add(f)
+                worklist.extend(table[f][1])
+            selection = reached if selection is None else selection & reached
+        return selection
+
+    def query(
+            self,
+            pofilter: POQueryFilter,
+            details: bool = False,
+            showinvs: bool = False) -> Iterator[Dict[str, Any]]:
+        """Yields a json record for every proof obligation that matches.
+
+        If showinvs is true the records include the invariants at the
+        location of the proof obligation.
+        """
+
+        selection = self._callgraph_selection(pofilter)
+        for cfile in self.capp.cfiles:
+            if not pofilter.matches_file(cfile.name):
+                continue
+            index = self.file_index(cfile)
+            for (fname, fdata) in index["functions"].items():
+                if not pofilter.matches_function(fname):
+                    continue
+                if (
+                        selection is not None
+                        and (cfile.index, fdata["vid"]) not in selection):
+                    continue
+                invariants = fdata["invariants"]
+                for entry in fdata["pos"]:
+                    if pofilter.matches_entry(entry, invariants):
+                        record = self._record(cfile, fname, entry, details)
+                        if showinvs:
+                            record["invariants"] = invariants.get(
+                                str(entry[6]), [])
+                        yield record
+
+    def _record(
+            self,
+            cfile: "CFile",
+            fname: str,
+            entry: List[Any],
+            details: bool) -> Dict[str, Any]:
+        (kind, id, line, tag, status, method, _) = entry
+        record: Dict[str, Any] = {}
+        if details:
+            cfun = cfile.get_function_by_name(fname)
+            po = cfun.get_ppo(id) if kind == "p" else cfun.get_spo(id)
+            record.update(JU.ppo_to_json_result(po).content)
+        else:
+            record["index"] = id
+            record["line"] = line
+            record["status"] = status
+            record["predicate"] = get_predicate_name(tag)
+        record["file"] = cfile.name
+        record["function"] = fname
+        record["kind"] = "ppo" if kind == "p" else "spo"
+        record["method"] = method
+        return record
@@ -41,19 +41,23 @@ from typing import (
     Any, cast, Dict, Generator, List, Optional, NoReturn, Tuple, TYPE_CHECKING)
 
 from chc.app.CApplication import CApplication
-from chc.app.CPrettyPrinter import CPrettyPrinter
+from chc.app.CAppSnapshot import open_project_snapshot
+from chc.app.CFileResidency import residency_stats_to_string
+from chc.app.CPrettyPrinter import CPrettyCache, CPrettyPrinter
 
 from chc.cmdline.AnalysisManager import AnalysisManager
+from chc.cmdline.AnalyzerLimits import AnalyzerLimits, analyzer_report_to_string
 from chc.cmdline.ParseManager import ParseManager
+from chc.cmdline.c_project.ProjectPOExport import export_project
+from chc.cmdline.c_project.ProjectPOIndex import POQueryFilter, ProjectPOIndex
 import chc.cmdline.jsonresultutil as JU
 
-from chc.linker.CLinker import CLinker
-
 import chc.reporting.ProofObligations as RP
 
 from chc.util.Config import Config
 import chc.util.fileutil as UF
 from chc.util.loggingutil import chklogger, LogLevel
+from chc.util.profileutil import chcprofiler, profile_to_string
 
 if TYPE_CHECKING:
     from chc.app.CAttributes import CAttributes
@@ -63,7 +67,7 @@ if TYPE_CHECKING:
     from chc.app.CStmt import CInstrsStmt, CStmt
     from chc.invariants.CInvariantFact import CInvariantNRVFact
     from chc.app.CTyp import (
-        CTypComp, CTypFloat, CTypFun, CTypInt, CTypPtr)
+        CTyp, CTypComp, CTypFloat, CTypFun, CTypInt, CTypPtr)
     from chc.proof.CFunctionPO import CFunctionPO
 
 
@@ -109,6 +113,34 @@ def timing(activity: str) -> Generator:
     )
 
 
+def open_project_application(
+        projectpath: str,
+        projectname: str,
+        targetpath: str,
+        contractpath: str,
+        processes: int = 1,
+        residentbudget: Optional[float] = None) -> CApplication:
+    """Returns the application of an analyzed project for a report command.
+
+    If the project has a current snapshot (see CAppSnapshot) the application
+    is attached to it, and (forked) workers share the memory-mapped snapshot
+    and load only the files they access; otherwise, with multiple processes,
+    the file dictionaries are parsed once, before the workers are forked.
+    """
+
+    snapshot = open_project_snapshot(targetpath, projectname)
+    if snapshot is not None:
+        chklogger.logger.info("Use snapshot %s", snapshot.filename)
+        return CApplication(
+            projectpath, projectname, targetpath, contractpath,
+            residentbudget=residentbudget,
+            snapshot=snapshot)
+    return CApplication(
+        projectpath, projectname, targetpath, contractpath,
+        loadprocesses=processes,
+        residentbudget=residentbudget)
+
+
 def cproject_parse_project(args: argparse.Namespace) -> NoReturn:
 
     # arguments
@@ -119,6 +151,7 @@ def cproject_parse_project(args: argparse.Namespace) -> NoReturn:
     loglevel: str = args.loglevel
     logfilename: Optional[str] = args.logfilename
     logfilemode: str = args.logfilemode
+    profile: bool = args.profile
 
     try:
         UF.check_parser()
@@ -162,6 +195,9 @@ def cproject_parse_project(args: argparse.Namespace) -> NoReturn:
         print_error("The compile_commands.json file was found empty")
         exit(1)
 
+    if profile:
+        chcprofiler.enable()
+
     parsemanager = ParseManager(
         projectpath,
         projectname,
@@ -169,20 +205,159 @@ def cproject_parse_project(args: argparse.Namespace) -> NoReturn:
         keep_system_includes=keep_system_includes)
     parsemanager.remove_semantics()
     parsemanager.initialize_paths()
-    exitcode = parsemanager.parse_with_ccommands(compilecommands, copyfiles=True)
+    with chcprofiler.span("parse"):
+        exitcode = parsemanager.parse_with_ccommands(
+            compilecommands, copyfiles=True)
     if exitcode == 0:
-        parsemanager.save_semantics()
+        with chcprofiler.span("save-semantics"):
+            parsemanager.save_semantics()
+
+    if profile:
+        UF.save_project_profile(
+            targetpath, projectname, "parse", chcprofiler.to_dict())
 
     print_status_update("exitcode: " + str(exitcode))
     exit(exitcode)
 
 
+def has_const_attribute(attrs: "CAttributes") -> bool:
+    for attr in attrs.attributes:
+        if "const" in attr.name:
+            return True
+    return False
+
+
+def scan_op_file(cfile: "CFile") -> Dict[str, Any]:
+    """Returns the output parameter candidates and counts of a c file."""
+
+    opcandidates: List[Dict[str, Any]] = []
+    disqualifiersum: Dict[str, int] = {}
+    structsum: Dict[str, int] = {}
+    totalptrargcount = 0
+    ppcache = CPrettyCache()
+    expanded: Dict[int, "CTyp"] = {}
+
+    def expand(typ: "CTyp") -> "CTyp":
+        if typ.index not in expanded:
+            expanded[typ.index] = typ.expand()
+        return expanded[typ.index]
+
+    if cfile.cfilepath is not None:
+        cfilename = os.path.join(cfile.cfilepath, cfile.cfilename)
+    else:
+        cfilename = cfile.cfilename
+
+    candidates: List[Dict[str, Any]] = []
+    for cfun in cfile.gfunctions.values():
+        if cfun.varinfo.vname == "main":
+            continue
+        pp = CPrettyPrinter(cache=ppcache)
+        fndecl = pp.function_declaration_str(cfun.varinfo).strip()
+        cfuntyp = cfun.varinfo.vtype
+        if not cfuntyp.is_function:
+            continue
+        cfuntyp = cast("CTypFun", cfuntyp)
+        cfunargs = cfuntyp.funargs
+        if cfunargs is None:
+            continue
+        cfunarguments = cfunargs.arguments
+        if not any(cfunarg.typ.is_pointer for cfunarg in cfunarguments):
+            continue
+        candidate: Dict[str, Any] = {}
+        candidate["name"] = cfun.vname
+        candidate["signature"] = fndecl
+        ptrargs = candidate["ptrargs"] = []
+        for (index, cfunarg) in enumerate(cfunarguments):
+            argtyp = expand(cfunarg.typ)
+            if argtyp.is_pointer:
+                totalptrargcount += 1
+                disqualifiers: List[str] = []
+                t = expand(cast("CTypPtr", argtyp).pointedto_type)
+                ptrarg: Dict[str, Any] = {}
+                ptrarg["index"] = index
+                ptrarg["name"] = cfunarg.name
+                ptrarg["target-type"] = str(t)
+                if cfunarg.typ.attributes.length > 0:
+                    ptrarg["attributes"] = (
+                        [str(attr) for attr in cfunarg.typ.attributes.attributes])
+                    if has_const_attribute(cfunarg.typ.attributes):
+                        disqualifiers.append("const")
+                if t.attributes.length > 0:
+                    ptrarg["attributes"] = (
+                        [str(attr) for attr in t.attributes.attributes])
+                    if has_const_attribute(t.attributes):
+                        disqualifiers.append("const")
+                    disqualifiersum.setdefault("const", 0)
+                    disqualifiersum["const"] += 1
+                if t.is_int:
+                    ptrarg["kind"] = ["int", cast("CTypInt", t).ikind]
+                    if "ichar" in ptrarg["kind"]:
+                        disqualifiers.append("ichar")
+                        disqualifiersum.setdefault("char", 0)
+                        disqualifiersum["char"] == 1
+                    elif "iuchar" in ptrarg["kind"]:
+                        disqualifiers.append("iuchar")
+                        disqualifiersum.setdefault("char", 0)
+                        disqualifiersum["char"] += 1
+                elif t.is_float:
+                    ptrarg["kind"] = ["float", cast("CTypFloat", t).fkind]
+                elif t.is_void:
+                    ptrarg["kind"] = ["void"]
+                    disqualifiers.append("void")
+                    disqualifiersum.setdefault("void", 0)
+                    disqualifiersum["void"] += 1
+                elif t.is_pointer:
+                    ptrarg["kind"] = ["pointer"]
+                    disqualifiers.append("pointer")
+                    disqualifiersum.setdefault("pointer", 0)
+                    disqualifiersum["pointer"] += 1
+                elif t.is_struct:
+                    structname = cast("CTypComp", t).name
+                    ptrarg["kind"] = ["struct", structname]
+                    structsum.setdefault(structname, 0)
+                    structsum[structname] += 1
+                elif t.is_union:
+                    ptrarg["kind"] = ["union", cast("CTypComp", t).name]
+                    disqualifiers.append("union")
+                    disqualifiersum.setdefault("union", 0)
+                    disqualifiersum["union"] += 1
+                else:
+                    ptrarg["kind"] = ["other"]
+                if len(disqualifiers) > 0:
+                    ptrarg["disqualifiers"] = disqualifiers
+                else:
+                    opcandidate: Dict[str, Any] = {}
+                    opcandidate["file"] = cfilename
+                    opcandidate["function"] = cfun.varinfo.vname
+                    opcandidate["arg-index"] = index
+                    opcandidate["arg-name"] = cfunarg.name
+                    opcandidate["arg-target-type"] = str(t)
+                    if t.is_struct:
+                        opcandidate["struct-name"] = cast("CTypComp", t).name
+                    opcandidates.append(opcandidate)
+                ptrargs.append(ptrarg)
+        candidates.append(candidate)
+    cfilecandidate: Dict[str, Any] = {}
+    cfilecandidate["filename"] = cfilename
+    cfilecandidate["candidates"] = candidates
+    cfilecandidate["function-count"] = len(cfile.gfunctions.keys())
+
+    result: Dict[str, Any] = {}
+    result["file"] = cfilecandidate
+    result["op-candidates"] = opcandidates
+    result["disqualifier-summary"] = disqualifiersum
+    result["struct-summary"] = structsum
+    result["argptr-count"] = totalptrargcount
+    return result
+
+
 def cproject_scan_op(args: argparse.Namespace) -> NoReturn:
 
     # arguments
     tgtpath: str = args.tgtpath
     projectname: str = args.projectname
     jsonoutput: bool = args.json
+    maxprocesses: int = args.maxprocesses
     outputfilename: Optional[str] = args.output
     loglevel: str = args.loglevel
     logfilename: Optional[str] = args.logfilename
@@ -203,128 +378,31 @@ def cproject_scan_op(args: argparse.Namespace) -> NoReturn:
         mode=logfilemode,
         msg="c-project scan-output-parameters invoked")
 
-    capp = CApplication(
-        projectpath, projectname, targetpath, contractpath)
-
-    def has_const_attribute(attrs: "CAttributes") -> bool:
-        for attr in attrs.attributes:
-            if "const" in attr.name:
-                return True
-        return False
+    capp = open_project_application(
+        projectpath, projectname, targetpath, contractpath,
+        processes=maxprocesses)
 
     cfilecandidates: List[Dict[str, Any]] = []
     opcandidates: List[Dict[str, Any]] = []
     disqualifiersum: Dict[str, int] = {}
-    qualifiersum: Dict[str, int] = {}
     structsum: Dict[str, int] = {}
 
     totalfunctioncount = 0
     totalptrargcount = 0
     totalcandidatefns = 0
 
-    for cfile in capp.cfiles:
-        if cfile.cfilepath is not None:
-            cfilename = os.path.join(cfile.cfilepath, cfile.cfilename)
-        else:
-            cfilename = cfile.cfilename
-
-        candidates: List[Dict[str, Any]] = []
-        for cfun in cfile.gfunctions.values():
-            if cfun.varinfo.vname == "main":
-                continue
-            pp = CPrettyPrinter()
-            fndecl = pp.function_declaration_str(cfun.varinfo).strip()
-            cfuntyp = cfun.varinfo.vtype
-            if not cfuntyp.is_function:
-                continue
-            cfuntyp = cast("CTypFun", cfuntyp)
-            cfunargs = cfuntyp.funargs
-            if cfunargs is None:
-                continue
-            cfunarguments = cfunargs.arguments
-            if not any(cfunarg.typ.is_pointer for cfunarg in cfunarguments):
-                continue
-            candidate: Dict[str, Any] = {}
-            candidate["name"] = cfun.vname
-            candidate["signature"] = fndecl
-            ptrargs = candidate["ptrargs"] = []
-            for (index, cfunarg) in enumerate(cfunarguments):
-                argtyp = cfunarg.typ.expand()
-                if argtyp.is_pointer:
-                    totalptrargcount += 1
-                    disqualifiers: List[str] = []
-                    t = cast("CTypPtr", argtyp).pointedto_type.expand()
-                    ptrarg: Dict[str, Any] = {}
-                    ptrarg["index"] = index
-                    ptrarg["name"] = cfunarg.name
-                    ptrarg["target-type"] = str(t)
-                    if cfunarg.typ.attributes.length > 0:
-                        ptrarg["attributes"] = (
-                            [str(attr) for attr in cfunarg.typ.attributes.attributes])
-                        if has_const_attribute(cfunarg.typ.attributes):
-                            disqualifiers.append("const")
-                    if t.attributes.length > 0:
-                        ptrarg["attributes"] = (
-                            [str(attr) for attr in t.attributes.attributes])
-                        if has_const_attribute(t.attributes):
-                            disqualifiers.append("const")
-                        disqualifiersum.setdefault("const", 0)
-                        disqualifiersum["const"] += 1
-                    if t.is_int:
-                        ptrarg["kind"] = ["int", cast("CTypInt", t).ikind]
-                        if "ichar" in ptrarg["kind"]:
-                            disqualifiers.append("ichar")
-                            disqualifiersum.setdefault("char", 0)
-                            disqualifiersum["char"] == 1
-                        elif "iuchar" in ptrarg["kind"]:
-                            disqualifiers.append("iuchar")
-                            disqualifiersum.setdefault("char", 0)
-                            disqualifiersum["char"] += 1
-                    elif t.is_float:
-                        ptrarg["kind"] = ["float", cast("CTypFloat", t).fkind]
-                    elif t.is_void:
-                        ptrarg["kind"] = ["void"]
-                        disqualifiers.append("void")
-                        disqualifiersum.setdefault("void", 0)
-                        disqualifiersum["void"] += 1
-                    elif t.is_pointer:
-                        ptrarg["kind"] = ["pointer"]
-                        disqualifiers.append("pointer")
-                        disqualifiersum.setdefault("pointer", 0)
-                        disqualifiersum["pointer"] += 1
-                    elif t.is_struct:
-                        structname = cast("CTypComp", t).name
-                        ptrarg["kind"] = ["struct", structname]
-                        structsum.setdefault(structname, 0)
-                        structsum[structname] += 1
-                    elif t.is_union:
-                        ptrarg["kind"] = ["union", cast("CTypComp", t).name]
-                        disqualifiers.append("union")
-                        disqualifiersum.setdefault("union", 0)
-                        disqualifiersum["union"] += 1
-                    else:
-                        ptrarg["kind"] = ["other"]
-                    if len(disqualifiers) > 0:
-                        ptrarg["disqualifiers"] = disqualifiers
-                    else:
-                        opcandidate: Dict[str, Any] = {}
-                        opcandidate["file"] = cfilename
-                        opcandidate["function"] = cfun.varinfo.vname
-                        opcandidate["arg-index"] = index
-                        opcandidate["arg-name"] = cfunarg.name
-                        opcandidate["arg-target-type"] = str(t)
-                        if t.is_struct:
-                            opcandidate["struct-name"] = cast("CTypComp", t).name
-                        opcandidates.append(opcandidate)
-                    ptrargs.append(ptrarg)
-            candidates.append(candidate)
-            totalcandidatefns += 1
-        cfilecandidate: Dict[str, Any] = {}
-        cfilecandidate["filename"] = cfilename
-        cfilecandidate["candidates"] = candidates
-        cfilecandidate["function-count"] = len(cfile.gfunctions.keys())
-        totalfunctioncount += len(cfile.gfunctions.keys())
-        cfilecandidates.append(cfilecandidate)
+    fileresults = capp.map_files_parallel(scan_op_file, maxprocesses)
+    for fid in capp.files:
+        fileresult = fileresults[fid]
+        cfilecandidates.append(fileresult["file"])
+        opcandidates.extend(fileresult["op-candidates"])
+        for (k, n) in fileresult["disqualifier-summary"].items():
+            disqualifiersum[k] = disqualifiersum.get(k, 0) + n
+        for (k, n) in fileresult["struct-summary"].items():
+            structsum[k] = structsum.get(k, 0) + n
+        totalfunctioncount += fileresult["file"]["function-count"]
+        totalptrargcount += fileresult["argptr-count"]
+        totalcandidatefns += len(fileresult["file"]["candidates"])
 
     results: Dict[str, Any] = {}
     results["files"] = cfilecandidates
@@ -470,11 +548,9 @@ def cproject_cil_source(args: argparse.Namespace) -> NoReturn:
         print_error(f"File {filename} not found")
         exit(1)
 
-    fcilsource = cfile.cil_source()
-
     outputfilename = cfile.cfilename + ".cil.c"
     with open(outputfilename, "w") as fp:
-        fp.write(fcilsource)
+        cfile.write_cil_source(fp)
     print("Cil source code written to " + outputfilename)
 
     exit(0)
@@ -495,6 +571,14 @@ def cproject_analyze_project(args: argparse.Namespace) -> NoReturn:
     logfilename: Optional[str] = args.logfilename
     logfilemode: str = args.logfilemode
     excludefiles: List[str] = args.exclude
+    profile: bool = args.profile
+    timeout: Optional[float] = args.timeout
+    maxmemory: Optional[int] = args.maxmemory
+    slowtime: float = args.slowtime
+    retrydomains: Optional[str] = args.retry_domains
+    batchsize: int = args.batchsize
+    savesnapshot: bool = args.save_snapshot
+    warninglimit: Optional[int] = args.warning_limit
 
     if excludefiles is None:
         excludefiles = []
@@ -515,6 +599,7 @@ def cproject_analyze_project(args: argparse.Namespace) -> NoReturn:
         logfilename=logfilename,
         mode=logfilemode,
         msg="c-project analyze invoked")
+    chklogger.set_warning_limit(warninglimit)
 
     try:
         UF.check_cch_semantics(projectpath, projectname, deletesemantics=True)
@@ -522,37 +607,40 @@ def cproject_analyze_project(args: argparse.Namespace) -> NoReturn:
         print(str(e.wrap()))
         exit(1)
 
-    capp = CApplication(
-        projectpath,
-        projectname,
-        targetpath,
-        contractpath,
-        keep_system_includes=keep_system_includes,
-        excludefiles=excludefiles)
-
-    def save_xrefs(f: "CFile") -> None:
-        capp.indexmanager.save_xrefs(
-            capp.projectpath, projectname, f.cfilepath, f.cfilename, f.index)
+    if profile:
+        chcprofiler.enable()
 
-    linker = CLinker(capp)
-    linker.link_compinfos()
-    linker.link_varinfos()
-    capp.iter_files(save_xrefs)
-    linker.save_global_compinfos()
-
-    capp = CApplication(
-        projectpath,
-        projectname,
-        targetpath,
-        contractpath,
-        keep_system_includes=keep_system_includes,
-        excludefiles=excludefiles)
+    with chcprofiler.span("load"):
+        capp = CApplication(
+            projectpath,
+            projectname,
+            targetpath,
+            contractpath,
+            keep_system_includes=keep_system_includes,
+            excludefiles=excludefiles,
+            loadprocesses=maxprocesses)
+
+    with chcprofiler.span("link"):
+        capp.relink(processes=maxprocesses)
+
+    limits: Optional[AnalyzerLimits] = None
+    if timeout is not None or maxmemory is not None:
+        limits = AnalyzerLimits(
+            timeout=timeout,
+            maxmemory=maxmemory,
+            slowtime=slowtime,
+            retrydomains=retrydomains)
 
     am = AnalysisManager(
         capp,
         verbose=verbose,
         collectdiagnostics=collectdiagnostics,
-        keep_system_includes=keep_system_includes)
+        keep_system_includes=keep_system_includes,
+        limits=limits,
+        batchsize=batchsize)
+
+    if am.report is not None:
+        am.report.reset()
 
     exitcode = 0
 
@@ -565,10 +653,13 @@ def cproject_analyze_project(args: argparse.Namespace) -> NoReturn:
     with timing("analysis"):
 
         try:
-            am.create_app_primary_proofobligations(
-                po_cmd=po_cmd, processes=maxprocesses)
-            capp.reinitialize_tables()
-            capp.collect_post_assumes()
+            with chcprofiler.span("create-ppos"):
+                am.create_app_primary_proofobligations(
+                    po_cmd=po_cmd, processes=maxprocesses)
+            with chcprofiler.span("reload"):
+                capp.reinitialize_tables()
+            with chcprofiler.span("collect-post-assumes"):
+                capp.collect_post_assumes()
         except UF.CHError as e:
             print(str(e.wrap()))
             exit(1)
@@ -577,38 +668,48 @@ def cproject_analyze_project(args: argparse.Namespace) -> NoReturn:
 
         if exitcode == 0:
             for i in range(1):
-                am.generate_and_check_app(analysisdomains, 0, processes=maxprocesses)
-                capp.reinitialize_tables()
-                capp.update_spos()
+                with chcprofiler.span("round 0"):
+                    with chcprofiler.span("generate-and-check"):
+                        am.generate_and_check_app(
+                            analysisdomains, 0, processes=maxprocesses)
+                    with chcprofiler.span("reload"):
+                        capp.reinitialize_tables()
+                    with chcprofiler.span("update-spos"):
+                        capp.update_spos()
 
             exitcode = check_continuation()
 
         if exitcode == 0:
             for i in range(5):
-                capp.update_spos()
-                am.generate_and_check_app(analysisdomains, i + 1, processes=maxprocesses)
-                capp.reinitialize_tables()
+                with chcprofiler.span("round " + str(i + 1)):
+                    with chcprofiler.span("update-spos"):
+                        capp.update_spos()
+                    with chcprofiler.span("generate-and-check"):
+                        am.generate_and_check_app(
+                            analysisdomains, i + 1, processes=maxprocesses)
+                    with chcprofiler.span("reload"):
+                        capp.reinitialize_tables()
 
                 exitcode = check_continuation()
                 if exitcode > 0:
                     break
 
+    chklogger.flush_aggregated_warnings()
+
     if analysis == "outputparameters":
-        presult = capp.outputparameters()
-        vresult = capp.viable_outputparameters()
-        mresult = capp.maybe_outputparameters()
-        viable = sum(len(f) for f in vresult.values())
-        maybe = sum(len(f) for f in mresult.values())
-        opp = sum(len(f) for f in presult.values())
-        print("Functions analyzed     : " + str(len(vresult)))
+        opsummary = capp.outputparameter_summary(processes=maxprocesses)
+        viable = sum(len(s["viable"]) for s in opsummary.values())
+        maybe = sum(s["maybe"] for s in opsummary.values())
+        opp = sum(s["outputparameters"] for s in opsummary.values())
+        print("Functions analyzed     : " + str(len(opsummary)))
         print("Outputparameters       : " + str(opp))
         print("Maybe outputparameters : " + str(maybe))
         print("Viable outputparameters: " + str(viable))
-        for (fname, pl) in vresult.items():
-            if len(pl) > 0:
+        for (fname, s) in opsummary.items():
+            if len(s["viable"]) > 0:
                 print("  function: " + fname)
-                for p in pl:
-                    print("    " + str(p.parameter))
+                for p in s["viable"]:
+                    print("    " + p)
         if viable > 0:
             exitcode = 0
         elif maybe > 0:
@@ -616,16 +717,65 @@ def cproject_analyze_project(args: argparse.Namespace) -> NoReturn:
 
     timestamp = os.stat(UF.get_cchpath(targetpath, projectname)).st_ctime
 
-    result = RP.project_proofobligation_stats_to_dict(capp)
-    result["timestamp"] = timestamp
-    result["project"] = projectpath
-    UF.save_project_summary_results(targetpath, projectname, result)
-    UF.save_project_summary_results_as_xml(targetpath, projectname, result)
+    with chcprofiler.span("report"):
+        result = RP.project_proofobligation_stats_to_dict(capp)
+        result["timestamp"] = timestamp
+        result["project"] = projectpath
+        UF.save_project_summary_results(targetpath, projectname, result)
+        UF.save_project_summary_results_as_xml(targetpath, projectname, result)
+
+    if savesnapshot:
+        snapshotfilename = capp.save_snapshot()
+        print_status_update("Snapshot saved in " + snapshotfilename)
+
+    if am.report is not None:
+        analyzerreport = am.report.save()
+        print_status_update(analyzer_report_to_string(analyzerreport))
+
+    if profile:
+        UF.save_project_profile(
+            targetpath, projectname, "analyze", chcprofiler.to_dict())
 
     print_status_update("exitcode: " + str(exitcode))
     exit(exitcode)
 
 
+def cproject_profile(args: argparse.Namespace) -> NoReturn:
+    """CLI command to show the profile saved by parse/analyze --profile."""
+
+    # arguments
+    tgtpath: str = args.tgtpath
+    projectname: str = args.projectname
+    commands: List[str] = args.commands
+    jsonoutput: bool = args.json
+
+    targetpath = os.path.abspath(tgtpath)
+    profiles = UF.load_project_profile(targetpath, projectname)
+    if len(profiles) == 0:
+        print_error(
+            "No profile found for "
+            + projectname
+            + " in "
+            + targetpath
+            + "; run parse or analyze with --profile first")
+        exit(1)
+
+    if commands is not None:
+        profiles = {c: p for (c, p) in profiles.items() if c in commands}
+
+    if jsonoutput:
+        print(json.dumps(profiles, indent=2))
+        exit(0)
+
+    for (command, profile) in profiles.items():
+        print("\n" + command + " (started " + time.strftime(
+            "%Y-%m-%d %H:%M:%S", time.localtime(profile["starttime"])) + ")")
+        print("=" * 88)
+        print(profile_to_string(profile))
+
+    exit(0)
+
+
 def cproject_report(args: argparse.Namespace) -> NoReturn:
     """CLI command to output statistics on proof obligations for the project."""
 
@@ -634,6 +784,7 @@ def cproject_report(args: argparse.Namespace) -> NoReturn:
     projectname: str = args.projectname
     canalysis: str = args.analysis
     verbose: bool = args.verbose
+    residentbudget: Optional[float] = args.resident_budget
     loglevel: str = args.loglevel
     logfilename: Optional[str] = args.logfilename
     logfilemode: str = args.logfilemode
@@ -660,8 +811,9 @@ def cproject_report(args: argparse.Namespace) -> NoReturn:
             exit(1)
 
         contractpath = os.path.join(targetpath, "chc_contracts")
-        capp = CApplication(
-            projectpath, projectname, targetpath, contractpath)
+        capp = open_project_application(
+            projectpath, projectname, targetpath, contractpath,
+            residentbudget=residentbudget)
 
         timestamp = os.stat(UF.get_cchpath(targetpath, projectname)).st_ctime
         fresult = RP.project_proofobligation_stats_to_dict(capp)
@@ -669,10 +821,12 @@ def cproject_report(args: argparse.Namespace) -> NoReturn:
         fresult["project"] = projectpath
         UF.save_project_summary_results(targetpath, projectname, fresult)
         UF.save_project_summary_results_as_xml(targetpath, projectname, fresult)
+        if capp.residency is not None:
+            print(residency_stats_to_string(capp.residency.stats()))
         exit(0)
 
     contractpath = os.path.join(targetpath, "chc_contracts")
-    capp = CApplication(
+    capp = open_project_application(
         projectpath, projectname, targetpath, contractpath)
 
     statsresult = UF.read_project_summary_results(targetpath, projectname)
@@ -855,8 +1009,8 @@ def cproject_query_invariants(args: argparse.Namespace) -> NoReturn:
         exit(1)
 
     cfun = cfile.get_function_by_name(xfunction)
-    ppos = cfun.get_ppos()
-    contexts = {ppo.context for ppo in ppos if ppo.line == xline}
+    ppos = cfun.get_line_ppos(xline)
+    contexts = {ppo.context for ppo in ppos}
 
     print("Invariants for function " + xfunction + ", line " + str(xline))
     if len(contexts) == 0:
@@ -878,6 +1032,130 @@ def cproject_query_invariants(args: argparse.Namespace) -> NoReturn:
     exit(0)
 
 
+def cproject_query_pos(args: argparse.Namespace) -> NoReturn:
+    """CLI command to output the proof obligations that satisfy a filter.
+
+    Matches are written as json lines (one json object per proof obligation)
+    as they are found.
+    """
+
+    # arguments
+    tgtpath: str = args.tgtpath
+    projectname: str = args.projectname
+    kinds: List[str] = args.kinds
+    predicates: Optional[List[str]] = args.predicates
+    statuses: Optional[List[str]] = args.statuses
+    methods: Optional[List[str]] = args.methods
+    files: Optional[List[str]] = args.files
+    functions: Optional[List[str]] = args.functions
+    lines: Optional[str] = args.lines
+    callees: Optional[List[str]] = args.callees
+    reachablefrom: Optional[List[str]] = args.reachablefrom
+    invariants: Optional[List[str]] = args.invariants
+    showinvs: bool = args.showinvs
+    details: bool = args.details
+    norefresh: bool = args.norefresh
+
+    targetpath = os.path.abspath(tgtpath)
+    projectpath = targetpath
+    contractpath = os.path.join(targetpath, "chc_contracts")
+
+    if not UF.has_analysisresults_path(targetpath, projectname):
+        print_error(
+            f"No analysis results found for {projectname} in {targetpath}")
+        exit(1)
+
+    linerange: Optional[Tuple[int, int]] = None
+    if lines is not None:
+        try:
+            if "-" in lines:
+                (first, last) = lines.split("-", 1)
+                linerange = (int(first), int(last))
+            else:
+                linerange = (int(lines), int(lines))
+        except ValueError:
+            print_error(
+                "Line range should be of the form <line> or <first>-<last>: "
+                + lines)
+            exit(1)
+
+    capp = open_project_application(
+        projectpath, projectname, targetpath, contractpath)
+
+    pofilter = POQueryFilter(
+        kinds=[k[0] for k in kinds],
+        predicates=predicates,
+        statuses=statuses,
+        methods=methods,
+        files=files,
+        functions=functions,
+        linerange=linerange,
+        callees=callees,
+        reachablefrom=reachablefrom,
+        invariants=invariants)
+
+    poindex = ProjectPOIndex(capp, refresh=not norefresh)
+    for record in poindex.query(pofilter, details=details, showinvs=showinvs):
+        print(json.dumps(record), flush=True)
+
+    exit(0)
+
+
+def cproject_export_ndjson(args: argparse.Namespace) -> NoReturn:
+    """CLI command to export all proof obligations as newline-delimited json.
+
+    Each c file is exported to its own part file by one of maxprocesses
+    worker processes; the manifest is written last.
+    """
+
+    # arguments
+    tgtpath: str = args.tgtpath
+    projectname: str = args.projectname
+    outputdir: str = args.outputdir
+    maxprocesses: int = args.maxprocesses
+    sourcechunk: int = args.sourcechunk
+    files: Optional[List[str]] = args.files
+
+    targetpath = os.path.abspath(tgtpath)
+    projectpath = targetpath
+    contractpath = os.path.join(targetpath, "chc_contracts")
+
+    if not UF.has_analysisresults_path(targetpath, projectname):
+        print_error(
+            f"No analysis results found for {projectname} in {targetpath}")
+        exit(1)
+
+    if sourcechunk < 1:
+        print_error("Number of source lines per record should be positive")
+        exit(1)
+
+    capp = open_project_application(
+        projectpath, projectname, targetpath, contractpath,
+        processes=maxprocesses)
+
+    manifest = export_project(
+        capp,
+        os.path.abspath(outputdir),
+        processes=maxprocesses,
+        sourcechunk=sourcechunk,
+        files=files)
+
+    print(
+        "Exported "
+        + str(len(manifest["files"]))
+        + " files ("
+        + str(manifest["bytes"])
+        + " bytes): "
+        + ", ".join(
+            k + ": " + str(v) for (k, v) in sorted(manifest["totals"].items())))
+    if len(manifest["incomplete"]) > 0:
+        print_error(
+            "Export incomplete for: " + ", ".join(manifest["incomplete"]))
+        exit(1)
+
+    exit(0)
+
+
 def cproject_count_stmts(args: argparse.Namespace) -> NoReturn:
     """CLI command to output size statistics for a c project."""
 
@@ -0,0 +1,124 @@
+# ------------------------------------------------------------------------------
+# CodeHawk C Analyzer
+# Author: Henny Sipma
+# ------------------------------------------------------------------------------
+# The MIT License (MIT)
+#
+# Copyright (c) 2026  Aarno Labs LLC
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ------------------------------------------------------------------------------
+"""Measurement of the startup (import) time of the command-line interface.
+
+Every module is imported in a fresh interpreter with -X importtime, so the
+measurements are not affected by modules already loaded in this process.
+The results are reported in json, to be tracked as a regression metric.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+
+from typing import Any, Dict, List, Tuple
+
+import chc
+from chc.app.CHVersion import chcversion
+
+
+# modules loaded by chkc to dispatch a command, in order of use
+startup_modules: List[str] = [
+    "chc.cmdline.chkc",
+    "chc.cmdline.c_file.cfileutil",
+    "chc.cmdline.c_file.cfiletableutil",
+    "chc.cmdline.c_project.cprojectutil",
+    "chc.cmdline.juliet.julietutil",
+    "chc.cmdline.kendra.kendrautil",
+    "chc.cmdline.regression.regressionutil"]
+
+
+def parse_importtime(output: str, module: str) -> Tuple[int, int, int]:
+    """Returns (cumulative import time (us), #modules, #chc modules).
+
+    output is the stderr produced by python -X importtime; the cumulative
+    time is that of the line for the module itself.
+    """
+
+    cumulative = 0
+    modules = 0
+    chcmodules = 0
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            # header line
+            continue
+        name = fields[2].strip()
+        modules += 1
+        if name == "chc" or name.startswith("chc."):
+            chcmodules += 1
+        if name == module:
+            cumulative = int(fields[1].strip())
+    return (cumulative, modules, chcmodules)
+
+
+def profile_module_import(module: str, repeat: int) -> Dict[str, Any]:
+    """Imports module in repeat fresh interpreters; keeps the fastest run."""
+
+    chcroot = os.path.dirname(os.path.dirname(os.path.abspath(chc.__file__)))
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        [chcroot] + [p for p in [env.get("PYTHONPATH")] if p])
+    cmd = [sys.executable, "-X", "importtime", "-c", "import " + module]
+
+    result: Dict[str, Any] = {}
+    for _ in range(max(repeat, 1)):
+        t0 = time.perf_counter()
+        proc = subprocess.run(
+            cmd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+            text=True)
+        wall = time.perf_counter() - t0
+        if proc.returncode != 0:
+            return {"error": proc.stderr.strip().splitlines()[-1:]}
+        (cumulative, modules, chcmodules) = parse_importtime(
+            proc.stderr, module)
+        if "import_us" not in result or cumulative < result["import_us"]:
+            result["import_us"] = cumulative
+            result["modules"] = modules
+            result["chc_modules"] = chcmodules
+        if "wall_s" not in result or wall < result["wall_s"]:
+            result["wall_s"] = round(wall, 4)
+    return result
+
+
+def profile_imports(repeat: int = 3) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+    results["chcversion"] = chcversion
+    results["python"] = sys.version.split()[0]
+    results["repeat"] = repeat
+    results["modules"] = {}
+    for module in startup_modules:
+        results["modules"][module] = profile_module_import(module, repeat)
+    return results
+
+
+def print_import_profile(repeat: int = 3) -> None:
+    print(json.dumps(profile_imports(repeat), indent=2))
@@ -253,26 +253,41 @@ def get_julietppos(testset: "JulietTestSetRef") -> Dict[str, List["JulietPpo"]]:
     return ppos
 
 
+def index_julietppos(
+        julietfileppos: List["JulietPpo"]
+) -> Dict[Tuple[int, str], List["JulietPpo"]]:
+    """Returns the reference ppos of a file indexed by (line, predicate)."""
+
+    result: Dict[Tuple[int, str], List["JulietPpo"]] = {}
+    for jppo in julietfileppos:
+        result.setdefault((jppo.line, jppo.predicate), []).append(jppo)
+    return result
+
+
 def get_ppo_pairs(
         julietppos: Dict[str, List["JulietPpo"]],
         capp: "CApplication"
 ) -> Dict[str, Dict[str, List[Tuple["JulietPpo", "CFunctionPO"]]]]:
-    """Returns a pairing of reference ppos with actual ppos by function."""
+    """Returns a pairing of reference ppos with actual ppos by function.
+
+    Reference ppos are indexed by (line, predicate) once per file, so the
+    full match (keymatches) is only evaluated for candidates that agree on
+    both.
+    """
 
     pairs: Dict[str, Dict[str, List[Tuple["JulietPpo", "CFunctionPO"]]]] = {}
     for filename in julietppos:
         chklogger.logger.info("Get ppo pairs for %s", filename)
         pairs.setdefault(filename, {})
-        julietfileppos = julietppos[filename]
+        julietindex = index_julietppos(julietppos[filename])
         cfile = capp.get_file(filename)
 
         fileppos = cfile.get_ppos()
         for ppo in fileppos:
             fnname = ppo.cfun.name
-            chklogger.logger.info(
-                "Get ppo pairs for function %s in file %s", fnname, filename)
             pairs[filename].setdefault(fnname, [])
-            for jppo in julietfileppos:
+            candidates = julietindex.get((ppo.line, ppo.predicate_name), [])
+            for jppo in candidates:
                 if keymatches(jppo, ppo):
                     pairs[filename][fnname].append((jppo, ppo))
     return pairs
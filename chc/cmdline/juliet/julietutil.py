@@ -50,14 +50,13 @@ from typing import (
     TYPE_CHECKING)
 
 from chc.app.CApplication import CApplication
+from chc.app.CAppSnapshot import open_project_snapshot
 
 from chc.cmdline.AnalysisManager import AnalysisManager
 
 import chc.cmdline.juliet.JulietTestScoring as JTS
 from chc.cmdline.juliet.JulietTestSetRef import JulietTestSetRef
 
-from chc.linker.CLinker import CLinker
-
 import chc.reporting.ProofObligations as RP
 import chc.reporting.reportutil as UR
 
@@ -312,6 +311,8 @@ def juliet_analyze(args: argparse.Namespace) -> NoReturn:
     loglevel: str = args.loglevel
     logfilename: Optional[str] = args.logfilename
     logfilemode: str = args.logfilemode
+    warninglimit: Optional[int] = args.warning_limit
+    savesnapshot: bool = args.save_snapshot
 
     projectname = jcwe + "_" + jtest
 
@@ -334,6 +335,7 @@ def juliet_analyze(args: argparse.Namespace) -> NoReturn:
         logfilename=logfilename,
         mode=logfilemode,
         msg="juliet analyze invoked")
+    chklogger.set_warning_limit(warninglimit)
 
     try:
         UF.check_cch_semantics(projectpath, projectname, deletesemantics=True)
@@ -348,22 +350,7 @@ def juliet_analyze(args: argparse.Namespace) -> NoReturn:
         contractpath,
         excludefiles=excludefiles)
 
-    def save_xrefs(f: "CFile") -> None:
-        capp.indexmanager.save_xrefs(
-            capp.projectpath, projectname, None, f.name, f.index)
-
-    linker = CLinker(capp)
-    linker.link_compinfos()
-    linker.link_varinfos()
-    capp.iter_files(save_xrefs)
-    linker.save_global_compinfos()
-
-    capp = CApplication(
-        projectpath,
-        projectname,
-        projectpath,
-        contractpath,
-        excludefiles=excludefiles)
+    capp.relink()
 
     am = AnalysisManager(
         capp,
@@ -390,6 +377,8 @@ def juliet_analyze(args: argparse.Namespace) -> NoReturn:
         am.generate_and_check_app("llrvisp", i + 1, processes=jmaxproc)
         capp.reinitialize_tables()
 
+    chklogger.flush_aggregated_warnings()
+
     def filefilter(filename: str) -> bool:
         return not (filename in ["io", "main_linux", "std_thread"])
 
@@ -408,6 +397,9 @@ def juliet_analyze(args: argparse.Namespace) -> NoReturn:
         print(str(e))
         exit(1)
 
+    if savesnapshot:
+        capp.save_snapshot()
+
     exit(0)
 
 
@@ -497,7 +489,8 @@ def juliet_report(args: argparse.Namespace) -> NoReturn:
         projectname,
         targetpath,
         contractpath,
-        excludefiles=excludefiles)
+        excludefiles=excludefiles,
+        snapshot=open_project_snapshot(targetpath, projectname))
 
     def filefilter(f: str) -> bool:
         return f not in excludefiles
@@ -600,7 +593,8 @@ def juliet_score(args: argparse.Namespace) -> NoReturn:
         projectname,
         targetpath,
         contractpath,
-        excludefiles=excludefiles)
+        excludefiles=excludefiles,
+        snapshot=open_project_snapshot(targetpath, projectname))
 
     testset = JulietTestSetRef(d)
 
@@ -640,6 +634,7 @@ def juliet_score_sets(args: argparse.Namespace) -> NoReturn:
     # arguments
     jmaxproc: int = args.maxprocesses
     jcwes: List[str] = args.cwes
+    jforce: bool = args.force
 
     maxptxt = "" if jmaxproc == 1 else f" (with {jmaxproc} processors)"
 
@@ -652,8 +647,17 @@ def juliet_score_sets(args: argparse.Namespace) -> NoReturn:
         else:
             return cwe not in jcwes
 
+    def is_current(cwe: str, t: str) -> bool:
+        if jforce:
+            return False
+        try:
+            return UF.is_juliet_score_current(cwe, t)
+        except UF.CHError:
+            return False
+
     with timing("score-sets" + maxptxt):
         count: int = 0
+        skipped: int = 0
         juliettests = UF.get_juliet_testcases()
         for cwe in sorted(juliettests):
             if excluded(cwe):
@@ -661,8 +665,15 @@ def juliet_score_sets(args: argparse.Namespace) -> NoReturn:
             print(f"Scoring testcases for cwe {cwe}")
             for subdir in sorted(juliettests[cwe]):
                 for t in juliettests[cwe][subdir]:
+                    if is_current(cwe, t):
+                        skipped += 1
+                        continue
                     testcases.append((cwe, t, count))
 
+        if skipped > 0:
+            print(
+                f"Skipped {skipped} testcases with scores newer than their "
+                + "analysis results")
         results = pool.map(score_test, testcases)
 
     print("\n" + ("=" * 80))
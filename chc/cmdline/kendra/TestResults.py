@@ -201,6 +201,51 @@ class TestResults(object):
             (spo, status, False)
         )
 
+    def _cfile_status(
+            self, cfile: "TestCFileRef") -> Tuple[bool, bool, bool, bool, bool]:
+        """Returns whether parsing, ppo/spo generation, and results are ok."""
+
+        cfilename = cfile.name
+        parsingok: bool = True
+        ppogenok: bool = True
+        spogenok: bool = True
+        pporesultok: bool = True
+        sporesultok: bool = True
+        for cfun in cfile.functions.values():
+            fname = cfun.name
+            if self.includes_parsing:
+                if self.xfileresults[cfilename]["xffiles"][fname] != "ok":
+                    parsingok = False
+            if self.includes_ppos:
+                funresults = self.pporesults[cfilename][fname]
+                count: str = funresults["count"]
+                missing: List[str] = funresults["missingpredicates"]
+                if count != "ok" or len(missing) > 0:
+                    ppogenok = False
+            if self.includes_spos:
+                funresults = self.sporesults[cfilename][fname]
+                count = funresults["count"]
+                missing = funresults["missing"]
+                if count != "ok" or len(missing) > 0:
+                    spogenok = False
+            if self.includes_pevs:
+                pevs = self.pevresults[cfilename][fname]["discrepancies"]
+                if len(pevs) > 0:
+                    pporesultok = False
+            if self.includes_sevs:
+                sevs = self.sevresults[cfilename][fname]["discrepancies"]
+                if len(sevs) > 0:
+                    sporesultok = False
+        return (parsingok, ppogenok, spogenok, pporesultok, sporesultok)
+
+    @property
+    def passed(self) -> bool:
+        """Returns true if all results are as expected (no X in the line summary)."""
+
+        return all(
+            all(self._cfile_status(cfile))
+            for cfile in self.cfiles if len(cfile.functions) > 0)
+
     def get_line_summary(self) -> str:
         name = os.path.basename(self.testsetref.specfilename)[:-5]
         parsing: str = ""
@@ -208,44 +253,14 @@ class TestResults(object):
         spogen: str = ""
         pporesult: str = ""
         sporesult: str = ""
-        for cfile in self.cfiles:
-            cfilename = cfile.name
-            cfunctions = cfile.functions.values()
-            parsingok: bool = True
-            ppogenok: bool = True
-            spogenok: bool = True
-            pporesultok: bool = True
-            sporesultok: bool = True
-            if len(cfunctions) > 0:
-                for cfun in cfunctions:
-                    fname = cfun.name
-                    if self.includes_parsing:
-                        if self.xfileresults[cfilename]["xffiles"][fname] != "ok":
-                            parsingok = False
-                    if self.includes_ppos:
-                        funresults = self.pporesults[cfilename][fname]
-                        count: str = funresults["count"]
-                        missing: List[str] = funresults["missingpredicates"]
-                        if count != "ok" or len(missing) > 0:
-                            ppogenok = False
-                    if self.includes_spos:
-                        funresults = self.sporesults[cfilename][fname]
-                        count = funresults["count"]
-                        missing = funresults["missing"]
-                        if count != "ok" or len(missing) > 0:
-                            spogenok = False
-                    if self.includes_pevs:
-                        pevs = self.pevresults[cfilename][fname]["discrepancies"]
-                        if len(pevs) > 0:
-                            pporesultok = False
-                    if self.includes_sevs:
-                        sevs = self.sevresults[cfilename][fname]["discrepancies"]
-                        if len(sevs) > 0:
-                            sporesultok = False
 
-                def pr(result: bool) -> str:
-                    return "=" if result else "X"
+        def pr(result: bool) -> str:
+            return "=" if result else "X"
 
+        for cfile in self.cfiles:
+            if len(cfile.functions) > 0:
+                (parsingok, ppogenok, spogenok, pporesultok, sporesultok) = (
+                    self._cfile_status(cfile))
                 parsing += pr(parsingok)
                 ppogen += pr(ppogenok)
                 spogen += pr(spogenok)
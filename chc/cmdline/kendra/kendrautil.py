@@ -34,12 +34,17 @@ import sys
 
 from typing import Any, Dict, List, NoReturn, Optional, Set, Tuple
 
+from multiprocessing import Pool
+
 from chc.app.CApplication import CApplication
 from chc.cmdline.kendra.TestManager import TestManager
 from chc.cmdline.kendra.TestManager import FileParseError
 from chc.cmdline.kendra.TestManager import AnalyzerMissingError
+from chc.cmdline.kendra.TestResults import TestResults
 from chc.cmdline.kendra.TestSetRef import TestSetRef
 from chc.cmdline.ParseManager import ParseManager
+from chc.cmdline.TestResultCache import (
+    directory_files, files_hash, TestResultCache)
 
 import chc.reporting.ProofObligations as RP
 
@@ -130,7 +135,10 @@ def kendra_clean_set(args: argparse.Namespace) -> NoReturn:
     exit(0)
 
 
-def run_test(testname: str, verbose: bool, line_summary: bool = False) -> None:
+def run_test_results(
+        testname: str, verbose: bool) -> Optional[TestResults]:
+    """Runs a kendra test and returns the test results."""
+
     try:
         projectpath = UF.get_kendra_testpath(testname)
     except UF.CHError as e:
@@ -162,12 +170,7 @@ def run_test(testname: str, verbose: bool, line_summary: bool = False) -> None:
             testmanager.test_spo_proofs(delaytest=True)
             testmanager.test_spo_proofs(delaytest=True)
             testmanager.test_spo_proofs()
-            if testmanager.verbose:
-                testmanager.print_test_results()
-            elif line_summary:
-                testmanager.print_test_results_line_summary()
-            else:
-                testmanager.print_test_results_summary()
+            return testmanager.testresults
     except FileParseError as e:
         print_error(": Unable to parse " + str(e))
         exit(1)
@@ -183,6 +186,61 @@ def run_test(testname: str, verbose: bool, line_summary: bool = False) -> None:
             "Error in test " + testname + ": " + str(e))
         raise
 
+    return None
+
+
+def run_test(
+        testname: str,
+        verbose: bool,
+        line_summary: bool = False) -> Optional[str]:
+    """Runs a kendra test and returns the test results as a string."""
+
+    testresults = run_test_results(testname, verbose)
+    if testresults is None:
+        return None
+    if verbose:
+        return str(testresults)
+    elif line_summary:
+        return testresults.get_line_summary()
+    else:
+        return testresults.get_summary()
+
+
+def kendra_test_source_hash(testname: str) -> str:
+    """Returns a hash over the source files and specification of a test set."""
+
+    projectpath = UF.get_kendra_testpath(testname)
+    return files_hash(
+        directory_files(
+            projectpath, [".c", ".h", ".json"], subdirs=["chccontracts"]))
+
+
+def run_test_line_summary(
+        testdata: Tuple[str, bool]) -> Tuple[str, bool, str, str]:
+    """Runs a kendra test; returns (testname, passed, line summary, output).
+
+    The output is the full test results if verbose is set, and the line
+    summary otherwise; passed is determined from the test results.
+
+    Each test set is parsed and analyzed in its own test directory, so test
+    sets can be run in separate processes without interference.
+
+    Note: this function needs to be global for multiprocessing to work.
+    """
+
+    (testname, verbose) = testdata
+    try:
+        testresults = run_test_results(testname, verbose)
+    except (Exception, SystemExit) as e:
+        summary = testname.ljust(10) + "[  error: " + str(e) + "  ]"
+        return (testname, False, summary, summary)
+    if testresults is None:
+        summary = testname.ljust(10) + "[  error  ]"
+        return (testname, False, summary, summary)
+    summary = testresults.get_line_summary()
+    output = str(testresults) if verbose else summary
+    return (testname, testresults.passed, summary, output)
+
 
 def kendra_test_set(args: argparse.Namespace) -> NoReturn:
     """Parses and analyzes a testset and compares the result with a reference"""
@@ -214,7 +272,9 @@ def kendra_test_set(args: argparse.Namespace) -> NoReturn:
         mode=logfilemode,
         msg="cfile parse invoked")
 
-    run_test(testname, verbose)
+    result = run_test(testname, verbose)
+    if result is not None:
+        print(result)
     exit(0)
 
 
@@ -225,6 +285,21 @@ def kendra_test_sets(args: argparse.Namespace) -> NoReturn:
 
     # arguments
     verbose: bool = args.verbose
+    maxprocesses: int = args.maxprocesses
+    nocache: bool = args.nocache
+
+    try:
+        UF.check_parser()
+        UF.check_analyzer()
+    except UF.CHError as e:
+        print_error(str(e.wrap()))
+        exit(1)
+
+    cache = TestResultCache(
+        UF.get_kendra_results_cache_filename(), enabled=not nocache)
+
+    testnames: List[str] = []
+    sourcehashes: Dict[str, str] = {}
 
     for id in range(115, 403, 4):
 
@@ -232,8 +307,33 @@ def kendra_test_sets(args: argparse.Namespace) -> NoReturn:
             continue
 
         testname = "id" + str(id) + "Q"
+        sourcehash = kendra_test_source_hash(testname)
+        cachedresult = cache.get_result(testname, sourcehash)
+        if cachedresult is not None:
+            print(cachedresult + "  (cached)", flush=True)
+            continue
+
+        testnames.append(testname)
+        sourcehashes[testname] = sourcehash
+
+    def record(result: Tuple[str, bool, str, str]) -> None:
+        (testname, passed, summary, output) = result
+        print(output, flush=True)
+        if passed:
+            cache.set_result(testname, sourcehashes[testname], summary)
+        else:
+            cache.remove_result(testname)
+
+    testdata = [(testname, verbose) for testname in testnames]
+    if maxprocesses > 1:
+        with Pool(maxprocesses) as pool:
+            for result in pool.imap_unordered(run_test_line_summary, testdata):
+                record(result)
+    else:
+        for t in testdata:
+            record(run_test_line_summary(t))
 
-        run_test(testname, verbose, line_summary=True)
+    cache.save()
 
     exit(0)
 
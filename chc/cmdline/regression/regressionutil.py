@@ -32,12 +32,16 @@ import os
 import subprocess
 import shutil
 import sys
+import tempfile
 
-from typing import Any, Dict, List, NoReturn
+from multiprocessing import Pool
+
+from typing import Any, Dict, List, NoReturn, Optional, Tuple
 
 from chc.app.CApplication import CApplication
 from chc.cmdline.AnalysisManager import AnalysisManager
 from chc.cmdline.ParseManager import ParseManager
+from chc.cmdline.TestResultCache import files_hash, TestResultCache
 
 import chc.util.fileutil as UF
 
@@ -85,7 +89,14 @@ def regression_list(args: argparse.Namespace) -> NoReturn:
 
 def run_regression_test_file(
         testspec: Dict[str, Any],
-        loglevel="WARNING") -> str:
+        loglevel="WARNING",
+        workdir: Optional[str] = None) -> str:
+    """Parses and analyzes a regression test file and checks the results.
+
+    If workdir is given, the test file is copied to that directory and all
+    analysis artifacts are created there, leaving the shared regression test
+    directory untouched.
+    """
 
     try:
         UF.check_parser()
@@ -99,6 +110,8 @@ def run_regression_test_file(
         return cfilename.ljust(32) + "[" + s.ljust(50) + "]"
 
     pcfile_c = UF.get_regression_testfile_path(cfilename)
+    if workdir is not None:
+        pcfile_c = shutil.copy(pcfile_c, workdir)
     projectpath = os.path.dirname(os.path.abspath(pcfile_c))
     targetpath = projectpath
     cfilename_c = os.path.basename(pcfile_c)
@@ -133,7 +146,6 @@ def run_regression_test_file(
         shutil.rmtree(cchpath)
 
     if os.path.isfile(parsearchive):
-        os.chdir(targetpath)
         tarname = os.path.basename(parsearchive)
         cmd = ["tar", "xfz", os.path.basename(tarname)]
         result = subprocess.call(cmd, cwd=targetpath)
@@ -229,17 +241,84 @@ def regression_test_file(args: argparse.Namespace) -> NoReturn:
     exit(0)
 
 
+def regression_test_source_hash(testspec: Dict[str, Any]) -> str:
+    """Returns a hash over the test file and its test specification."""
+
+    cfilename = testspec.get("filename", "?")
+    h = files_hash([UF.get_regression_testfile_path(cfilename)])
+    return h + ":" + json.dumps(testspec, sort_keys=True)
+
+
+def run_regression_test_isolated(
+        testdata: Tuple[Dict[str, Any], str]) -> Tuple[str, bool, str]:
+    """Runs a regression test in a temporary working directory.
+
+    Returns (testname, passed, result line).
+
+    Note: this function needs to be global for multiprocessing to work.
+    """
+
+    (testspec, loglevel) = testdata
+    cfilename = testspec.get("filename", "?")
+    workdir = tempfile.mkdtemp(prefix="chc_regression_")
+    # the parser changes into the project directory (the workdir); restore
+    # the working directory of the pool worker before the workdir is removed
+    cwd = os.getcwd()
+    try:
+        line = run_regression_test_file(
+            testspec, loglevel=loglevel, workdir=workdir)
+    except (Exception, SystemExit) as e:
+        line = cfilename.ljust(32) + "[" + ("Failed: " + str(e)).ljust(50) + "]"
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+    return (cfilename, "Passed" in line, line)
+
+
 def regression_run_tests(args: argparse.Namespace) -> NoReturn:
 
     # arguments
     loglevel: str = args.loglevel
+    maxprocesses: int = args.maxprocesses
+    nocache: bool = args.nocache
+
+    cache = TestResultCache(
+        UF.get_regression_results_cache_filename(), enabled=not nocache)
+
+    tests: List[Dict[str, Any]] = []
+    sourcehashes: Dict[str, str] = {}
 
-    lines: List[str] = []
     for test in get_tests():
         if test.get("status", "pass") == "fail":
             continue
-        lines.append(run_regression_test_file(test, loglevel=loglevel))
+        cfilename = test.get("filename", "?")
+        sourcehash = regression_test_source_hash(test)
+        cachedresult = cache.get_result(cfilename, sourcehash)
+        if cachedresult is not None:
+            print(cachedresult + "  (cached)", flush=True)
+            continue
+        tests.append(test)
+        sourcehashes[cfilename] = sourcehash
+
+    def record(result: Tuple[str, bool, str]) -> None:
+        (cfilename, passed, line) = result
+        print(line, flush=True)
+        if passed:
+            cache.set_result(cfilename, sourcehashes[cfilename], line)
+        else:
+            cache.remove_result(cfilename)
+
+    if maxprocesses > 1:
+        testdata = [(test, loglevel) for test in tests]
+        with Pool(maxprocesses) as pool:
+            for result in pool.imap_unordered(
+                    run_regression_test_isolated, testdata):
+                record(result)
+    else:
+        for test in tests:
+            line = run_regression_test_file(test, loglevel=loglevel)
+            record((test.get("filename", "?"), "Passed" in line, line))
 
-    print("\n".join(lines))
+    cache.save()
 
     exit(0)
@@ -31,6 +31,7 @@ from typing import (
 
 import chc.util.fileutil as UF
 from chc.util.IndexedTable import IndexedTableValue
+from chc.util.profileutil import chcprofiler
 
 if TYPE_CHECKING:
     from chc.app.CFileDeclarations import CFileDeclarations
@@ -138,6 +139,8 @@ class CFunVarDictionaryRegistry:
                 + " with type "
                 + str(superclass))
         instance = self.register[(superclass, tag)](vd, ixval)
+        if chcprofiler.enabled:
+            chcprofiler.count("objects", type(vd).__name__)
         return cast(VdR, instance)
 
 
@@ -174,6 +177,8 @@ class CFunXprDictionaryRegistry:
                 + " with type "
                 + str(superclass))
         instance = self.register[(superclass, tag)](xd, ixval)
+        if chcprofiler.enabled:
+            chcprofiler.count("objects", type(xd).__name__)
         return cast(XdR, instance)
 
 
@@ -210,6 +215,8 @@ class CFunInvDictionaryRegistry:
                 + " with type "
                 + str(superclass))
         instance = self.register[(superclass, tag)](invd, ixval)
+        if chcprofiler.enabled:
+            chcprofiler.count("objects", type(invd).__name__)
         return cast(IdR, instance)
 
 
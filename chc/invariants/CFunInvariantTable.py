@@ -28,9 +28,11 @@
 # ------------------------------------------------------------------------------
 """Table of invariant facts for an individual function."""
 
+import heapq
 import xml.etree.ElementTree as ET
 
-from typing import cast, Dict, List, Tuple, TYPE_CHECKING
+from typing import (
+    cast, Dict, Iterable, List, Optional, Set, Tuple, TYPE_CHECKING)
 
 from chc.invariants.CInvariantFact import CInvariantFact, CInvariantNRVFact
 from chc.invariants.CNonRelationalValue import (
@@ -50,14 +52,69 @@ if TYPE_CHECKING:
     from chc.invariants.CXVariable import CXVariable
 
 
+class CContextInvariants:
+    """Invariant facts at a cfg context, split by kind and sorted for display.
+
+    - facts: all facts in the order listed in the invariant table
+    - unreachable: unreachable facts
+    - sorted: facts that are not nrv facts, followed by the nrv facts sorted
+      by variable name
+    - nrvfacts: nrv facts whose value is not a region set, sorted by
+      variable name
+    - regionsets: nrv facts whose value is a region set
+    """
+
+    def __init__(self, facts: List[CInvariantFact]) -> None:
+        self.facts = facts
+        self.unreachable: List[CInvariantFact] = []
+        self.nrvfacts: List[CInvariantNRVFact] = []
+        self.regionsets: List[CInvariantNRVFact] = []
+        otherfacts: List[CInvariantFact] = []
+        allnrvfacts: List[CInvariantNRVFact] = []
+        for fact in facts:
+            if fact.is_unreachable_fact:
+                self.unreachable.append(fact)
+            if fact.is_nrv_fact:
+                nrvfact = cast(CInvariantNRVFact, fact)
+                allnrvfacts.append(nrvfact)
+                if nrvfact.non_relational_value.is_region_set:
+                    self.regionsets.append(nrvfact)
+                else:
+                    self.nrvfacts.append(nrvfact)
+            else:
+                otherfacts.append(fact)
+        self._keys: Dict[int, str] = {
+            id(f): str(f.variable) for f in allnrvfacts}
+        self.nrvfacts.sort(key=self.sortkey)
+        self.sorted: List[CInvariantFact] = otherfacts + sorted(
+            allnrvfacts, key=self.sortkey)
+
+    def sortkey(self, fact: CInvariantFact) -> str:
+        """Returns the (precomputed) variable name of an nrv fact."""
+
+        return self._keys[id(fact)]
+
+
 class CFunInvariantTable:
-    """Function-level invariants."""
+    """Function-level invariants.
+
+    On first access the invariant facts are indexed by the cfg context of
+    the location they hold at, so that lookups for a program context do not
+    need to index the cfg projection of that context in the context
+    dictionary.
+    """
 
     def __init__(self, cfun: "CFunction", xnode: ET.Element):
         self._cfun = cfun
         self.xnode = xnode
         self._invariants: Dict[int, List[CInvariantFact]] = {}
 
+        # cfg-context index -> invariant facts at that cfg context
+        self._cfgindex: Optional[Dict[int, CContextInvariants]] = None
+
+        # variable seqnr -> po ids, for check variables only
+        self._checkvariables: Optional[Dict[int, Set[int]]] = None
+
         # self.invariants = {}  # context -> CInvariantFact list
 
     @property
@@ -96,56 +153,103 @@ class CFunInvariantTable:
                                 self.invd.get_invariant_fact(findex))
         return self._invariants
 
+    @property
+    def cfg_context_index(self) -> Dict[int, CContextInvariants]:
+        """Returns a map from cfg-context index to the invariants there.
+
+        Invariants are recorded at cfg projections of program contexts,
+        that is, program contexts with an empty expression context.
+        """
+
+        if self._cfgindex is None:
+            self._cfgindex = {}
+            for (ictxt, facts) in self.invariants.items():
+                ctxt = self.ctxtd.get_program_context(ictxt)
+                if len(ctxt.exp_context.args) == 0:
+                    self._cfgindex[ctxt.args[0]] = CContextInvariants(facts)
+        return self._cfgindex
+
+    @property
+    def check_variables(self) -> Dict[int, Set[int]]:
+        """Returns a map from check variable seqnr to the po ids it serves."""
+
+        if self._checkvariables is None:
+            self._checkvariables = {}
+            seqnrs: Set[int] = set()
+            for cinvs in self.cfg_context_index.values():
+                for fact in cinvs.nrvfacts + cinvs.regionsets:
+                    seqnrs.add(fact.variable.seqnr)
+            for seqnr in seqnrs:
+                cvar = self.vard.get_c_variable_denotation(seqnr)
+                if cvar.is_check_variable:
+                    cvar = cast(CVCheckVariable, cvar)
+                    self._checkvariables[seqnr] = set(cvar.po_ids)
+        return self._checkvariables
+
+    def _context_invariants(
+            self, context: "ProgramContext") -> Optional[CContextInvariants]:
+        return self.cfg_context_index.get(context.args[0])
+
     def context_invariants(
             self, context: "ProgramContext") -> List[CInvariantFact]:
-        ictxt = self.ctxtd.index_cfg_projection(context)
-        if ictxt in self.invariants:
-            return self.invariants[ictxt]
+        cinvs = self._context_invariants(context)
+        if cinvs is not None:
+            return cinvs.facts
         else:
             return []
 
     def get_sorted_invariants(
             self, context: "ProgramContext") -> List[CInvariantFact]:
-        invs = self.context_invariants(context)
-        nrvinvs = [inv for inv in invs if inv.is_nrv_fact]
-        otherinvs = [inv for inv in invs if not inv.is_nrv_fact]
-        nrvinvs = sorted(
-            nrvinvs, key=lambda i: str(cast(CInvariantNRVFact, i).variable))
-        return otherinvs + nrvinvs
+        cinvs = self._context_invariants(context)
+        if cinvs is not None:
+            return list(cinvs.sorted)
+        else:
+            return []
+
+    def get_contexts_sorted_invariants(
+            self, contexts: Iterable["ProgramContext"]
+    ) -> Dict["ProgramContext", List[CInvariantFact]]:
+        """Returns the sorted invariants for each of the given contexts.
+
+        Contexts that share a cfg context (e.g., all contexts on a source
+        line) share the list of invariants, which is sorted only once.
+        """
+
+        result: Dict["ProgramContext", List[CInvariantFact]] = {}
+        bycfgcontext: Dict[int, List[CInvariantFact]] = {}
+        for context in contexts:
+            cfgindex = context.args[0]
+            invs = bycfgcontext.get(cfgindex)
+            if invs is None:
+                cinvs = self.cfg_context_index.get(cfgindex)
+                invs = [] if cinvs is None else list(cinvs.sorted)
+                bycfgcontext[cfgindex] = invs
+            result[context] = invs
+        return result
 
     def get_po_invariants(
             self, context: "ProgramContext", poId: int) -> List[CInvariantFact]:
-        invs = self.context_invariants(context)
+        """Returns the invariants relevant to the proof obligation with poId.
 
-        def filter(inv: CInvariantFact) -> bool:
-            if inv.is_nrv_fact:
-                inv = cast(CInvariantNRVFact, inv)
-                var = inv.variable
-                cvar = self.vard.get_c_variable_denotation(var.seqnr)
-                if cvar.is_check_variable:
-                    cvar = cast(CVCheckVariable, cvar)
-                    return poId in cvar.po_ids
-                else:
-                    return True
-            else:
-                return True
-
-        invs = [inv for inv in invs if filter(inv)]
-        unrinvs = [inv for inv in invs if inv.is_unreachable_fact]
-        nonrsinvs = [
-            inv
-            for inv in invs
-            if inv.is_nrv_fact
-            and (not cast(CInvariantNRVFact, inv).non_relational_value.is_region_set)
-        ]
-        rsinvs: List[CInvariantNRVFact] = [
-            cast(CInvariantNRVFact, inv)
-            for inv in invs
-            if (inv.is_nrv_fact
-                and cast(CInvariantNRVFact, inv).non_relational_value.is_region_set)
-        ]
+        Facts about check variables introduced for other proof obligations
+        are omitted, and of the region-set facts only the smallest one is
+        included for each variable.
+        """
+
+        cinvs = self._context_invariants(context)
+        if cinvs is None:
+            return []
+        checkvariables = self.check_variables
+
+        def applies(inv: CInvariantNRVFact) -> bool:
+            seqnr = inv.variable.seqnr
+            return seqnr not in checkvariables or poId in checkvariables[seqnr]
+
+        nonrsinvs = [inv for inv in cinvs.nrvfacts if applies(inv)]
         varsets: Dict[int, CInvariantNRVFact] = {}
-        for r in rsinvs:
+        for r in cinvs.regionsets:
+            if not applies(r):
+                continue
             cvar = r.variable
             if cvar.seqnr not in varsets:
                 varsets[cvar.seqnr] = r
@@ -156,11 +260,9 @@ class CFunInvariantTable:
                            varsets[cvar.seqnr].non_relational_value).size
                 ):
                     varsets[cvar.seqnr] = r
-        invs = unrinvs + sorted(
-            nonrsinvs
-            + list(varsets.values()),
-            key=lambda i: str(cast(CInvariantNRVFact, i).variable)
-        )
+        rsinvs = sorted(varsets.values(), key=cinvs.sortkey)
+        invs: List[CInvariantFact] = list(cinvs.unreachable)
+        invs.extend(heapq.merge(nonrsinvs, rsinvs, key=cinvs.sortkey))
         return invs
 
     def __str__(self) -> str:
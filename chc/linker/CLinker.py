@@ -28,10 +28,11 @@
 # ------------------------------------------------------------------------------
 
 import itertools
+import os
 
 import xml.etree.ElementTree as ET
 
-from typing import Dict, List, Tuple, TYPE_CHECKING
+from typing import Any, Dict, List, Tuple, TYPE_CHECKING
 
 from chc.app.CCompInfo import CCompInfo
 from chc.app.IndexManager import FileKeyReference, FileVarReference
@@ -190,10 +191,69 @@ class CLinker:
 
     """
 
-    def link_varinfos(self) -> None:
+    def shared_varinfos(
+            self, processes: int) -> Dict[Tuple[int, int], Tuple[int, int]]:
+        """Returns a map from file varinfos to an equivalent earlier one.
+
+        The signatures of the global varinfos (see
+        CGlobalDeclarations.varinfo_signature) are computed per file by
+        forked worker processes, after the compinfos have been linked; a
+        signature identifies a global varinfo only within the worker that
+        computed it, so it is qualified with the process id. The reducer
+        merges the file varinfos with equal signatures with a union-find and
+        maps every member of a class to the first member in file order, which
+        is the one that is indexed when linking.
+
+        Global keys and vids are still assigned by merging the files in
+        order, so the result is the same for any number of processes; with a
+        single process there are no signatures and all varinfos are indexed.
+        """
+
+        if processes <= 1:
+            return {}
+
+        def f(cfile: "CFile") -> List[Tuple[int, Any]]:
+            pid = os.getpid()
+            result: List[Tuple[int, Any]] = []
+            for v in cfile.declarations.get_global_varinfos():
+                signature = self.declarations.varinfo_signature(cfile.index, v)
+                if signature is not None:
+                    result.append((v.vid, (pid, signature)))
+            return result
+
+        signatures = self.capp.map_files_parallel(f, processes)
+        classes: UnionFind[Tuple[int, int]] = UnionFind()
+        members: Dict[Any, Tuple[int, int]] = {}
+        for cfile in self.capp.cfiles:
+            for (vid, signature) in signatures[cfile.index]:
+                filevar = (cfile.index, vid)
+                if signature in members:
+                    classes.union(members[signature], filevar)
+                else:
+                    members[signature] = filevar
+                    classes[filevar]
+        first: Dict[Tuple[int, int], Tuple[int, int]] = {}
+        result: Dict[Tuple[int, int], Tuple[int, int]] = {}
+        for cfile in self.capp.cfiles:
+            for (vid, _) in signatures[cfile.index]:
+                filevar = (cfile.index, vid)
+                root = classes[filevar]
+                if root in first:
+                    result[filevar] = first[root]
+                else:
+                    first[root] = filevar
+        chklogger.logger.info(
+            "Link varinfos: %d of %d global varinfos shared",
+            len(result), len(list(classes)))
+        return result
+
+    def link_varinfos(self, processes: int = 1) -> None:
+        shared = self.shared_varinfos(processes)
+
         def f(cfile: "CFile") -> None:
             varinfos = cfile.declarations.get_global_varinfos()
-            self.declarations.index_file_varinfos(cfile.index, varinfos)
+            self.declarations.index_file_varinfos(
+                cfile.index, varinfos, shared=shared)
 
         self.capp.iter_files(f)
         self.declarations.resolve_default_function_prototypes()
@@ -33,8 +33,11 @@ import xml.etree.ElementTree as ET
 from typing import (
     Any, Callable, cast, Dict, List, Mapping, Optional, TYPE_CHECKING)
 
+from chc.app.CDictionary import subst_key
+
 import chc.util.fileutil as UF
-from chc.util.IndexedTable import IndexedTable, IndexedTableValue
+from chc.util.IndexedTable import (
+    IndexedTable, IndexedTableValue, IndexTranslationMemo)
 
 from chc.proof.CFilePredicateRecord import pdregistry
 import chc.proof.CPOPredicate as PO
@@ -55,6 +58,7 @@ class CFilePredicateDictionary(object):
         self._objmaps: Dict[
             str, Callable[[], Mapping[int, IndexedTableValue]]] = {
                 "predicate": self.get_predicate_map}
+        self._translations = IndexTranslationMemo()
         self.initialize(xnode)
 
     @property
@@ -113,10 +117,34 @@ class CFilePredicateDictionary(object):
         exit(1)
     '''
 
+    @property
+    def translations(self) -> IndexTranslationMemo:
+        return self._translations
+
+    def reset_translations(self) -> None:
+        self._translations.reset()
+
     def index_predicate(
             self,
             p: PO.CPOPredicate,
             subst: Dict[int, "CExp"] = {}) -> int:
+        """Returns the index of p (possibly from another file) in this file.
+
+        Translations are memoized per source predicate and substitution; the
+        expressions and types of the predicate are translated through the
+        (memoized) file dictionary.
+        """
+        return self.translations.translate(
+            p.pd,
+            "predicate",
+            p.index,
+            lambda: self._index_predicate(p, subst),
+            context=subst_key(subst))
+
+    def _index_predicate(
+            self,
+            p: PO.CPOPredicate,
+            subst: Dict[int, "CExp"] = {}) -> int:
 
         def f(index: int, tags: List[str], args: List[int]) -> PO.CPOPredicate:
             itv = IndexedTableValue(index, tags, args)
@@ -355,6 +383,7 @@ class CFilePredicateDictionary(object):
             return
         if xnode is None:
             return
+        self.reset_translations()
         for t in self.tables:
             t.reset()
             xtable = xnode.find(t.name)
@@ -33,6 +33,7 @@ from typing import (
 
 import chc.util.fileutil as UF
 import chc.util.IndexedTable as IT
+from chc.util.profileutil import chcprofiler
 
 if TYPE_CHECKING:
     from chc.app.CDictionary import CDictionary
@@ -95,6 +96,8 @@ class CFilePredicateRegistry:
         if (anchor, tag) not in self.register:
             raise UF.CHCError("Unknown cdictionary type: " + tag)
         instance = self.register[(anchor, tag)](cd, ixval)
+        if chcprofiler.enabled:
+            chcprofiler.count("objects", type(cd).__name__)
         return cast(PDR, instance)
 
 
@@ -30,6 +30,7 @@ from typing import Callable, cast, Dict, List, Tuple, Type, TypeVar, TYPE_CHECKI
 
 import chc.util.fileutil as UF
 from chc.util.IndexedTable import IndexedTableValue
+from chc.util.profileutil import chcprofiler
 
 if TYPE_CHECKING:
     from chc.api.InterfaceDictionary import InterfaceDictionary
@@ -148,6 +149,8 @@ class CFunPODictionaryRegistry:
                 + " with type "
                 + str(anchor))
         instance = self.register[(anchor, tag)](pod, ixval)
+        if chcprofiler.enabled:
+            chcprofiler.count("objects", type(pod).__name__)
         return cast(PodR, instance)
 
 
@@ -27,7 +27,7 @@
 
 import xml.etree.ElementTree as ET
 
-from typing import cast, List, Optional, TYPE_CHECKING
+from typing import cast, List, Optional, Tuple, TYPE_CHECKING
 
 from chc.proof.CandidateOutputParameter import CandidateOutputParameter
 from chc.proof.OutputParameterCalleeCallsite import OutputParameterCalleeCallsite
@@ -113,20 +113,20 @@ class CFunctionOutputParameterAnalysisDigest(CFunctionAnalysisDigest):
     def caller_callsites(self) -> List[OutputParameterCalleeCallsite]:
         if self._caller_callsites is None:
             self._caller_callsites = []
-            callinstrs = self.capp.get_callinstrs()
+            callinstrs = self.capp.get_callinstrs_by_callee().get(
+                self.cfun.name, [])
             for callinstr in callinstrs:
-                if str(callinstr.callee) == self.cfun.name:
-                    caller = callinstr.cfun
-                    cfunadgs = caller.analysis_digests
-                    if len(cfunadgs.digests) == 1:
-                        cfunadg = cfunadgs.digests[0]
-                        cfunadg = cast(
-                            "CFunctionOutputParameterAnalysisDigest", cfunadg)
-                        callsites = cfunadg.callee_callsites
-                        callsites = [
-                            callsite for callsite in callsites
-                            if str(callsite.callee) == self.cfun.name]
-                        self._caller_callsites = callsites
+                caller = callinstr.cfun
+                cfunadgs = caller.analysis_digests
+                if len(cfunadgs.digests) == 1:
+                    cfunadg = cfunadgs.digests[0]
+                    cfunadg = cast(
+                        "CFunctionOutputParameterAnalysisDigest", cfunadg)
+                    callsites = cfunadg.callee_callsites
+                    callsites = [
+                        callsite for callsite in callsites
+                        if str(callsite.callee) == self.cfun.name]
+                    self._caller_callsites = callsites
         return self._caller_callsites
 
     @property
@@ -213,6 +213,28 @@ class CFunctionAnalysisDigests:
             result.extend(d.maybe_parameters())
         return result
 
+    def classified_outputparameters(self) -> Tuple[
+            List[CandidateOutputParameter],
+            List[CandidateOutputParameter],
+            List[CandidateOutputParameter]]:
+        """Returns all, the viable, and the maybe output parameters.
+
+        Equivalent to the three separate methods, but evaluates viability
+        only once per parameter.
+        """
+
+        params: List[CandidateOutputParameter] = []
+        viable: List[CandidateOutputParameter] = []
+        maybe: List[CandidateOutputParameter] = []
+        for d in self.digests:
+            for p in d.outputparameters():
+                params.append(p)
+                if p.is_viable():
+                    viable.append(p)
+                elif not p.status.is_rejected:
+                    maybe.append(p)
+        return (params, viable, maybe)
+
     @property
     def is_active(self) -> bool:
         if len(self.digests) == 1:
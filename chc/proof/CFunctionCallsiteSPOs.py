@@ -121,6 +121,7 @@ class CFunctionCallsiteSPOs:
         self._iargs: Optional[List[int]] = None
         self._callargs: Optional[List["CExp"]] = None
         self._spos: Optional[Dict[int, List[CFunctionCallsiteSPO]]] = None
+        self._spoindex: Optional[Dict[int, CFunctionCallsiteSPO]] = None
         self._postassumes: Optional[List[int]] = None
         self._icallees: Optional[List[int]] = None
         self._callees: Optional[List["CVarInfo"]] = None
@@ -247,6 +248,38 @@ class CFunctionCallsiteSPOs:
                                     diagnostic))
         return self._spos
 
+    @property
+    def spoindex(self) -> Dict[int, CFunctionCallsiteSPO]:
+        """Returns a map from spo id to spo for the spos at this call site."""
+
+        if self._spoindex is None:
+            self._spoindex = {}
+            for spos in self.spos.values():
+                for spo in spos:
+                    self._spoindex[spo.po_index] = spo
+        return self._spoindex
+
+    @property
+    def spo_ids(self) -> List[int]:
+        """Returns the ids of the spos at this call site.
+
+        If the spos have not been decoded yet the ids are read directly from
+        the xml, without creating the spos.
+        """
+
+        if self._spos is not None:
+            return list(self.spoindex.keys())
+        result: List[int] = []
+        xanode = self.xnode.find("api-conditions")
+        if xanode is not None:
+            for p in xanode.findall("api-c"):
+                if p.get("iapi") is not None:
+                    for xpo in p.findall("po"):
+                        xispo = xpo.get("ispo")
+                        if xispo is not None:
+                            result.append(int(xispo))
+        return result
+
     @property
     def postassumes(self) -> List[int]:
         if self._postassumes is None:
@@ -313,7 +346,8 @@ class CFunctionCallsiteSPOs:
         """Update the spo's associated with the call site."""
 
         if not self.has_callee():
-            chklogger.logger.warning(
+            chklogger.aggregate_warning(
+                "call sites with missing callee",
                 "missing callee in %s - %s", self.cfile.name, self.cfun.name)
             return
 
@@ -324,7 +358,8 @@ class CFunctionCallsiteSPOs:
         filevar = FileVarReference(self.cfile.index, self.callee.vid)
         calleefun = self.cfile.capp.resolve_vid_function(filevar)
         if calleefun is None:
-            chklogger.logger.warning(
+            chklogger.aggregate_warning(
+                "call sites with missing external function",
                 "missing external function in %s - %s: %s",
                 self.cfile.name, self.cfun.name, self.callee.vname)
             return
@@ -342,12 +377,13 @@ class CFunctionCallsiteSPOs:
                 for (vid, arg) in substitutions:
                     subst[vid] = arg
             else:
-                chklogger.logger.warning(
-                    "number of arguments (%s) is not the same as the number "
-                    + "of parameters (%s) in call to %s in function %s "
+                chklogger.aggregate_warning(
+                    "calls with mismatched number of arguments",
+                    "number of arguments (%d) is not the same as the number "
+                    + "of parameters (%d) in call to %s in function %s "
                     + "in file %s",
-                    str(len(self.call_arguments)),
-                    str(len(pars)),
+                    len(self.call_arguments),
+                    len(pars),
                     calleefun.name,
                     self.cfun.name,
                     self.cfile.name)
@@ -442,38 +478,45 @@ class CFunctionCallsiteSPOs:
                         ["cs"], [iloc, ictxt, pid, apiid]
                     )
                     spotype = self.cfun.podictionary.get_spo_type(ispotype)
-                    self.spos[apiid].append(
-                        CFunctionCallsiteSPO(self.cproofs, spotype))
+                    spo = CFunctionCallsiteSPO(self.cproofs, spotype)
+                    self.spos[apiid].append(spo)
+                    self.spoindex[spo.po_index] = spo
                 except CKeyLookupError as e:
-                    chklogger.logger.warning(
+                    chklogger.aggregate_warning(
+                        "datastructure requests for predicate "
+                        + a.predicate.predicate_name,
                         "%s: %s call to %s (%s) request datastructure condition "
                         + "for %s for key %s to handle assumption",
                         self.cfile.name,
                         self.cfun.name,
                         calleefun.name,
-                        str(calleefun.cfile.name),
-                        str(a.predicate),
-                        str(e.ckey))
+                        calleefun.cfile.name,
+                        a.predicate,
+                        e.ckey)
                 except LookupError as e:
-                    chklogger.logger.warning(
+                    chklogger.aggregate_warning(
+                        "datastructure requests for predicate "
+                        + a.predicate.predicate_name,
                         "%s: %s call to %s (%s) request datastruction condition "
                         + "for %s: %s to handle api assumption",
                         self.cfile.name,
                         self.cfun.name,
                         calleefun.name,
-                        str(calleefun.cfile.name),
-                        str(a.predicate),
-                        str(e))
+                        calleefun.cfile.name,
+                        a.predicate,
+                        e)
                 except Exception as e:
-                    chklogger.logger.warning(
+                    chklogger.aggregate_warning(
+                        "spo creation failures for predicate "
+                        + a.predicate.predicate_name,
                         "%s: %s call to %s (%s): unable to create spo for "
                         + "assumption %s: %s",
                         self.cfile.name,
                         self.cfun.name,
                         calleefun.name,
-                        str(calleefun.cfile.name),
-                        str(a),
-                        str(e))
+                        calleefun.cfile.name,
+                        a,
+                        e)
 
     def distribute_post_guarantees(self) -> None:
         # TBD
@@ -518,18 +561,12 @@ class CFunctionCallsiteSPOs:
                 f(spo)
 
     def get_spo(self, id: int) -> CFunctionCallsiteSPO:
-        for apiid in self.spos:
-            for spo in self.spos[apiid]:
-                if spo.po_index == id:
-                    return spo
+        if id in self.spoindex:
+            return self.spoindex[id]
         raise UF.CHCError("Call site spos does not include id " + str(id))
 
     def has_spo(self, id: int) -> bool:
-        for apiid in self.spos:
-            for spo in self.spos[apiid]:
-                if spo.po_index == id:
-                    return True
-        return False
+        return id in self.spoindex
 
     def write_xml(self, cnode: ET.Element) -> None:
         # write location
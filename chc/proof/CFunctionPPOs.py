@@ -33,6 +33,7 @@ import xml.etree.ElementTree as ET
 from typing import Callable, Dict, List, Optional, TYPE_CHECKING
 
 from chc.proof.CFunctionPPO import CFunctionPPO
+from chc.proof.CPOPredicate import get_predicate_tag
 from chc.proof.CProofDependencies import CProofDependencies
 from chc.proof.CProofDiagnostic import CProofDiagnostic, SituatedMsg
 
@@ -53,12 +54,23 @@ class CFunctionPPOs:
     """Represents the set of primary proof obligations for a function.
 
     xnode received is the content of the <"ppos"> element
+
+    Proof obligations are decoded from their xml element only when they are
+    requested. Indices by ppo id, line number, predicate tag, and status are
+    built in a single pass over the xml elements, so that point queries only
+    decode the proof obligations in the result.
     """
 
     def __init__(self, cproofs: "CFunctionProofs", xnode: ET.Element) -> None:
         self.xnode = xnode
         self._cproofs = cproofs
         self._ppos: Optional[Dict[int, CFunctionPPO]] = None  # ppoid -> CFunctionPPO
+        self._xppos: Optional[Dict[int, ET.Element]] = None  # ppoid -> xml element
+        self._decoded: Dict[int, CFunctionPPO] = {}
+        self._lineindex: Optional[Dict[int, List[int]]] = None
+        self._predicateindex: Dict[str, List[int]] = {}
+        self._statusindex: Dict[str, List[int]] = {}
+        self._order: List[int] = []  # ppoids sorted by (line, ppoid)
         # self._initialize()
 
     @property
@@ -81,41 +93,129 @@ class CFunctionPPOs:
     def podictionary(self) -> "CFunPODictionary":
         return self.cfun.podictionary
 
+    @property
+    def xppos(self) -> Dict[int, ET.Element]:
+        if self._xppos is None:
+            self._xppos = {}
+            for xp in self.xnode.findall("ppo"):
+                self._xppos[self.podictionary.read_xml_ppo_type(xp).index] = xp
+        return self._xppos
+
     @property
     def ppos(self) -> Dict[int, CFunctionPPO]:
         if self._ppos is None:
             self._ppos = {}
-            for xp in self.xnode.findall("ppo"):
-                ppotype = self.podictionary.read_xml_ppo_type(xp)
-                id = ppotype.index
+            for id in self.xppos:
+                self._ppos[id] = self._decode(id)
+        return self._ppos
+
+    @property
+    def ppo_ids(self) -> List[int]:
+        return list(self.xppos.keys())
+
+    @property
+    def lineindex(self) -> Dict[int, List[int]]:
+        """Returns a map from line numbers to the ids of the ppos on that line.
+
+        The predicate and status indices, and the (line, id) order of all
+        ppos are built in the same pass.
+        """
+
+        if self._lineindex is None:
+            self._lineindex = {}
+            self._predicateindex = {}
+            self._statusindex = {}
+            lines: Dict[int, int] = {}
+            for (id, xp) in self.xppos.items():
+                ppotype = self.podictionary.get_ppo_type(id)
+                line = ppotype.location.line
+                lines[id] = line
                 status = po_status[xp.get("s", "o")]
-                deps = CProofDependencies(self.cproofs, xp)
-                diagnostic = CProofDiagnostic(self.cproofs, xp.find("d"))
-
-                # get explanation
-                enode = xp.find("e")
-                if enode is not None:
-                    expl: Optional[SituatedMsg] = SituatedMsg(
-                        self.cfun.cdictionary, enode)
-                else:
-                    expl = None
+                self._lineindex.setdefault(line, []).append(id)
+                self._predicateindex.setdefault(
+                    ppotype.predicate.tags[0], []).append(id)
+                self._statusindex.setdefault(status, []).append(id)
+            self._order = sorted(lines, key=lambda id: (lines[id], id))
+        return self._lineindex
 
-                self._ppos[id] = CFunctionPPO(
-                    self.cproofs, ppotype, status, deps, expl, diagnostic)
-        return self._ppos
+    def _decode(self, id: int) -> CFunctionPPO:
+        if id not in self._decoded:
+            xp = self.xppos[id]
+            ppotype = self.podictionary.get_ppo_type(id)
+            status = po_status[xp.get("s", "o")]
+            deps = CProofDependencies(self.cproofs, xp)
+            diagnostic = CProofDiagnostic(self.cproofs, xp.find("d"))
+
+            # get explanation
+            enode = xp.find("e")
+            if enode is not None:
+                expl: Optional[SituatedMsg] = SituatedMsg(
+                    self.cfun.cdictionary, enode)
+            else:
+                expl = None
+
+            self._decoded[id] = CFunctionPPO(
+                self.cproofs, ppotype, status, deps, expl, diagnostic)
+        return self._decoded[id]
+
+    def has_ppo(self, id: int) -> bool:
+        return id in self.xppos
 
     def get_ppo(self, id: int) -> CFunctionPPO:
-        if id in self.ppos:
-            return self.ppos[id]
+        if id in self.xppos:
+            return self._decode(id)
         else:
             raise UF.CHCError("Ppo with id " + str(id) + " not found")
 
+    def get_line_ppos(self, line: int) -> List[CFunctionPPO]:
+        """Returns the ppos on the given line, ordered by ppo id."""
+
+        return [self._decode(id) for id in sorted(self.lineindex.get(line, []))]
+
+    def get_predicate_ppos(self, predicate: str) -> List[CFunctionPPO]:
+        """Returns the ppos with the given predicate (tag or name)."""
+
+        return self.query(predicate=predicate)
+
+    def get_status_ppos(self, status: str) -> List[CFunctionPPO]:
+        """Returns the ppos with the given status (e.g., open, safe)."""
+
+        return self.query(status=status)
+
+    def query(
+            self,
+            line: Optional[int] = None,
+            predicate: Optional[str] = None,
+            status: Optional[str] = None) -> List[CFunctionPPO]:
+        """Returns the ppos that satisfy all given criteria.
+
+        The candidates are taken from the smallest index selected, so only
+        the ppos in the result are decoded. Results are ordered by line and
+        ppo id.
+        """
+
+        lineindex = self.lineindex
+        selections: List[List[int]] = []
+        if line is not None:
+            selections.append(lineindex.get(line, []))
+        if predicate is not None:
+            selections.append(
+                self._predicateindex.get(get_predicate_tag(predicate), []))
+        if status is not None:
+            selections.append(self._statusindex.get(status, []))
+        if len(selections) == 0:
+            ids = self._order
+        else:
+            selections = sorted(selections, key=len)
+            others = [set(sel) for sel in selections[1:]]
+            candidates = set(
+                id for id in selections[0] if all(id in o for o in others))
+            ids = [id for id in self._order if id in candidates]
+        return [self._decode(id) for id in ids]
+
     def iter(self, f: Callable[[CFunctionPPO], None]) -> None:
-        for ppo in sorted(
-            self.ppos,
-            key=lambda p: (self.ppos[p].location.line, int(self.ppos[p].po_index)),
-        ):
-            f(self.ppos[ppo])
+        for ppo in self.query():
+            f(ppo)
 
     def __str__(self) -> str:
         lines: List[str] = []
@@ -30,7 +30,8 @@
 
 import xml.etree.ElementTree as ET
 
-from typing import Callable, cast, List, Optional, TYPE_CHECKING
+from typing import (
+    Callable, cast, Dict, Iterable, List, Optional, TYPE_CHECKING)
 
 from chc.proof.CFunctionCallsiteSPOs import CFunctionCallsiteSPOs
 from chc.proof.CFunctionPO import CFunctionPO
@@ -50,6 +51,20 @@ if TYPE_CHECKING:
         CPOOutputParameterUnaltered)
 
 
+def group_by_line(
+        pos: Iterable[CFunctionPO]) -> Dict[int, List[CFunctionPO]]:
+    """Returns the proof obligations grouped by line, in ascending line order.
+
+    Within a line the proof obligations keep the order in which they are
+    given.
+    """
+
+    lines: Dict[int, List[CFunctionPO]] = {}
+    for po in pos:
+        lines.setdefault(po.line, []).append(po)
+    return {line: lines[line] for line in sorted(lines)}
+
+
 class CFunctionProofs:
     """
 
@@ -81,6 +96,10 @@ class CFunctionProofs:
         self._ppos: Optional[CFunctionPPOs] = None
         self._spos: Optional[CFunctionSPOs] = None
 
+        # line -> proof obligations on that line, in ascending line order
+        self._pposbyline: Optional[Dict[int, List[CFunctionPO]]] = None
+        self._sposbyline: Optional[Dict[int, List[CFunctionPO]]] = None
+
     @property
     def cfun(self) -> "CFunction":
         return self._cfun
@@ -119,13 +138,21 @@ class CFunctionProofs:
     def ppolist(self) -> List[CFunctionPO]:
         return list(self.ppos.ppos.values())
 
+    @property
+    def ppos_by_line(self) -> Dict[int, List[CFunctionPO]]:
+        """Returns the ppos grouped by line, in ascending line order."""
+
+        if self._pposbyline is None:
+            self._pposbyline = group_by_line(self.ppolist)
+        return self._pposbyline
+
     @property
     def open_ppos(self) -> List[CFunctionPO]:
-        return [ppo for ppo in self.ppos.ppos.values() if ppo.is_open]
+        return list(self.ppos.get_status_ppos("open"))
 
     @property
     def ppos_violated(self) -> List[CFunctionPO]:
-        return [ppo for ppo in self.ppos.ppos.values() if ppo.is_violated]
+        return list(self.ppos.get_status_ppos("violation"))
 
     @property
     def ppos_delegated(self) -> List[CFunctionPO]:
@@ -141,6 +168,14 @@ class CFunctionProofs:
     def spolist(self) -> List[CFunctionPO]:
         return self.spos.spos
 
+    @property
+    def spos_by_line(self) -> Dict[int, List[CFunctionPO]]:
+        """Returns the spos grouped by line, in ascending line order."""
+
+        if self._sposbyline is None:
+            self._sposbyline = group_by_line(self.spolist)
+        return self._sposbyline
+
     @property
     def open_spos(self) -> List[CFunctionPO]:
         return [spo for spo in self.spolist if not spo.is_closed]
@@ -151,9 +186,11 @@ class CFunctionProofs:
 
     def update_spos(self) -> None:
         self.spos.update()
+        self._sposbyline = None
 
     def distribute_post_guarantees(self) -> None:
         self.spos.distribute_post_guarantees()
+        self._sposbyline = None
 
     def collect_post_assumes(self) -> None:
         """For all call sites collect postconditions from callee's contracts and add as assume."""
@@ -168,12 +205,15 @@ class CFunctionProofs:
             )
         '''
         self.spos.collect_post_assumes()
+        self._sposbyline = None
 
     def reset_ppos(self) -> None:
         self._ppos = None
+        self._pposbyline = None
 
     def reset_spos(self) -> None:
         self._spos = None
+        self._sposbyline = None
 
     def save_spos(self) -> None:
         cnode = ET.Element("function")
@@ -187,6 +227,12 @@ class CFunctionProofs:
     def get_spo(self, id: int) -> CFunctionPO:
         return self.spos.get_spo(id)
 
+    def get_line_ppos(self, line: int) -> List[CFunctionPPO]:
+        return self.ppos.get_line_ppos(line)
+
+    def get_line_spos(self, line: int) -> List[CFunctionPO]:
+        return self.spos.get_line_spos(line)
+
     def iter_ppos(self, f: Callable[[CFunctionPPO], None]) -> None:
         self.ppos.iter(f)
 
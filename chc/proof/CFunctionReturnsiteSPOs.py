@@ -69,6 +69,7 @@ class CFunctionReturnsiteSPOs:
 
         # pcid -> CFunctionReturnsiteSPO list
         self._spos: Optional[Dict[int, List[CFunctionReturnsiteSPO]]] = None
+        self._spoindex: Optional[Dict[int, CFunctionReturnsiteSPO]] = None
 
     @property
     def cproofs(self) -> "CFunctionProofs":
@@ -116,6 +117,33 @@ class CFunctionReturnsiteSPOs:
                                 self, spotype, status, deps, expl, diagnostic))
         return self._spos
 
+    @property
+    def spoindex(self) -> Dict[int, CFunctionReturnsiteSPO]:
+        """Returns a map from spo id to spo for the spos at this return site."""
+
+        if self._spoindex is None:
+            self._spoindex = {}
+            for spos in self.spos.values():
+                for spo in spos:
+                    self._spoindex[spo.po_index] = spo
+        return self._spoindex
+
+    @property
+    def spo_ids(self) -> List[int]:
+        """Returns the ids of the spos at this return site."""
+
+        if self._spos is not None:
+            return list(self.spoindex.keys())
+        result: List[int] = []
+        xgnode = self.xnode.find("post-guarantees")
+        if xgnode is not None:
+            for p in xgnode.findall("pc"):
+                for xpo in p.findall("po"):
+                    xispo = xpo.get("ispo")
+                    if xispo is not None:
+                        result.append(int(xispo))
+        return result
+
     @property
     def context(self) -> "ProgramContext":
         return self.contextdictionary.read_xml_context(self.xnode)
@@ -133,19 +161,12 @@ class CFunctionReturnsiteSPOs:
         return self.context.cfg_context
 
     def get_spo(self, id: int) -> CFunctionReturnsiteSPO:
-        if self.has_spo(id):
-            for pcid in self.spos:
-                for spo in self.spos[pcid]:
-                    if spo.po_index == id:
-                        return spo
+        if id in self.spoindex:
+            return self.spoindex[id]
         raise UF.CHCError("Returnsite spo with id " + str(id) + " not found")
 
     def has_spo(self, id: int) -> bool:
-        for pcid in self.spos:
-            for spo in self.spos[pcid]:
-                if spo.po_index == id:
-                    return True
-        return False
+        return id in self.spoindex
 
     def iter(self, f: Callable[[CFunctionReturnsiteSPO], None]) -> None:
         for id in self.spos:
@@ -30,7 +30,7 @@
 
 import xml.etree.ElementTree as ET
 
-from typing import Callable, Dict, List, Optional, TYPE_CHECKING
+from typing import Callable, Dict, List, Optional, TYPE_CHECKING, Union
 
 from chc.proof.CFunctionCallsiteSPO import CFunctionCallsiteSPO
 from chc.proof.CFunctionCallsiteSPOs import CFunctionCallsiteSPOs
@@ -41,6 +41,7 @@ from chc.proof.CFunctionPO import CFunctionPO
 from chc.proof.CFunctionPO import po_status
 from chc.proof.CProofDependencies import CProofDependencies
 from chc.proof.CProofDiagnostic import CProofDiagnostic, SituatedMsg
+from chc.proof.CPOPredicate import get_predicate_tag
 
 from chc.util.loggingutil import chklogger
 
@@ -54,6 +55,10 @@ class CFunctionSPOs:
     """Represents the set of supporting proof obligations for a function.
 
     xnode received is the content of the <"spos"> element.
+
+    The spos at call sites and return sites are decoded per site when first
+    requested; lookups by id and by line go through an index of sites, so
+    only the spos of the sites involved are decoded.
     """
 
     def __init__(self, cproofs: "CFunctionProofs", xnode: ET.Element) -> None:
@@ -68,6 +73,19 @@ class CFunctionSPOs:
         # cfg-contextstring -> CFunctionReturnsiteSPOs
         self._returnsitespos: Optional[Dict[str, CFunctionReturnsiteSPOs]] = None
 
+        # spoid -> call site or return site that holds the spo
+        self._sitesbyid: Optional[
+            Dict[int, Union[CFunctionCallsiteSPOs, CFunctionReturnsiteSPOs]]] = None
+
+        # line -> call sites and return sites at that line
+        self._sitesbyline: Optional[
+            Dict[int, List[Union[CFunctionCallsiteSPOs, CFunctionReturnsiteSPOs]]]
+        ] = None
+
+        # predicate tag / status -> spos
+        self._predicateindex: Optional[Dict[str, List[CFunctionPO]]] = None
+        self._statusindex: Optional[Dict[str, List[CFunctionPO]]] = None
+
     @property
     def cproofs(self) -> "CFunctionProofs":
         return self._cproofs
@@ -145,9 +163,58 @@ class CFunctionSPOs:
                     self._returnsitespos[cfgctxt] = rsspos
         return self._returnsitespos
 
+    @property
+    def sites_by_id(
+            self
+    ) -> Dict[int, Union[CFunctionCallsiteSPOs, CFunctionReturnsiteSPOs]]:
+        if self._sitesbyid is None:
+            self._sitesbyid = {}
+            for cs in self.callsite_spos.values():
+                for id in cs.spo_ids:
+                    self._sitesbyid[id] = cs
+            for rs in self.returnsite_spos.values():
+                for id in rs.spo_ids:
+                    self._sitesbyid[id] = rs
+        return self._sitesbyid
+
+    @property
+    def sites_by_line(
+            self
+    ) -> Dict[int, List[Union[CFunctionCallsiteSPOs, CFunctionReturnsiteSPOs]]]:
+        if self._sitesbyline is None:
+            self._sitesbyline = {}
+            for cs in self.callsite_spos.values():
+                self._sitesbyline.setdefault(cs.line, []).append(cs)
+            for rs in self.returnsite_spos.values():
+                self._sitesbyline.setdefault(rs.line, []).append(rs)
+        return self._sitesbyline
+
+    @property
+    def predicateindex(self) -> Dict[str, List[CFunctionPO]]:
+        if self._predicateindex is None:
+            self._predicateindex = {}
+            for spo in self.spos:
+                self._predicateindex.setdefault(
+                    spo.predicate.tags[0], []).append(spo)
+        return self._predicateindex
+
+    @property
+    def statusindex(self) -> Dict[str, List[CFunctionPO]]:
+        if self._statusindex is None:
+            self._statusindex = {}
+            for spo in self.spos:
+                self._statusindex.setdefault(spo.status, []).append(spo)
+        return self._statusindex
+
+    def _reset_indices(self) -> None:
+        self._sitesbyid = None
+        self._predicateindex = None
+        self._statusindex = None
+
     def update(self) -> None:
         for cs in self.callsite_spos.values():
             cs.update()
+        self._reset_indices()
 
     def collect_post_assumes(self) -> None:
         """for all call sites collect postconditions from callee's contracts
@@ -160,16 +227,15 @@ class CFunctionSPOs:
         for cs in self.callsite_spos.values():
             cs.distribute_post_guarantees()
 
+    def has_spo(self, id: int) -> bool:
+        return id in self.local_spos or id in self.sites_by_id
+
     def get_spo(self, id: int) -> CFunctionPO:
-        for localspo in self.local_spos.values():
-            if localspo.po_index == id:
-                return localspo
-        for cs in self.callsite_spos.values():
-            if cs.has_spo(id):
-                return cs.get_spo(id)
-        for rs in self.returnsite_spos.values():
-            if rs.has_spo(id):
-                return rs.get_spo(id)
+        if id in self.local_spos:
+            return self.local_spos[id]
+        site = self.sites_by_id.get(id)
+        if site is not None and site.has_spo(id):
+            return site.get_spo(id)
         else:
             print(
                 "No spo found with id "
@@ -179,6 +245,25 @@ class CFunctionSPOs:
             )
             exit(1)
 
+    def get_line_spos(self, line: int) -> List[CFunctionPO]:
+        """Returns the spos on the given line, decoding only the sites there."""
+
+        result: List[CFunctionPO] = [
+            spo for spo in self.local_spos.values() if spo.line == line]
+        for site in self.sites_by_line.get(line, []):
+            result.extend(site.spoindex.values())
+        return result
+
+    def get_predicate_spos(self, predicate: str) -> List[CFunctionPO]:
+        """Returns the spos with the given predicate (tag or name)."""
+
+        return self.predicateindex.get(get_predicate_tag(predicate), [])
+
+    def get_status_spos(self, status: str) -> List[CFunctionPO]:
+        """Returns the spos with the given status (e.g., open, safe)."""
+
+        return self.statusindex.get(status, [])
+
     def iter_callsites(self, f: Callable[[CFunctionCallsiteSPOs], None]) -> None:
         for cs in sorted(self.callsite_spos.values(), key=lambda p: (p.line)):
             f(cs)
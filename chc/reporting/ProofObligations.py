@@ -27,10 +27,14 @@
 # SOFTWARE.
 # ------------------------------------------------------------------------------
 
+import itertools
 import time
 
 from typing import (
-    Any, Callable, cast, Dict, List, Sequence, Set, Tuple, TYPE_CHECKING)
+    Any, Callable, cast, Dict, Iterable, List, Sequence, Set, Tuple,
+    TYPE_CHECKING)
+
+from chc.proof.CFunctionProofs import group_by_line
 
 import chc.util.fileutil as UF
 
@@ -96,14 +100,32 @@ def classifypo(po: "CFunctionPO", d: Dict[str, int]) -> None:
         d["open"] += 1
 
 
+def get_dsmethod(po: "CFunctionPO") -> str:
+    """Returns the discharge method of a proof obligation.
+
+    The discharge method is one of the dischargemethods, except that
+    violations are classified by the method used to establish them.
+    """
+    if po.is_closed:
+        deps = po.dependencies
+        if deps.has_external_dependencies():
+            return po.get_assumptions_type()
+        elif deps.is_stmt:
+            return "stmt"
+        else:
+            return "local"
+    else:
+        return "open"
+
+
 def get_method_count(
-        pos: Sequence["CFunctionPO"],
+        pos: Iterable["CFunctionPO"],
         filefilter: Callable[[str], bool] = lambda f: True,
         extradsmethods: List[str] = []) -> Dict[str, int]:
     """Create dicharge method count dictionary from proof obligation list.
 
     Args:
-      pos: flat list of proof obligations (primary or secondary)
+      pos: proof obligations (primary or secondary)
       filefilter: predicate that specifies which c files to include
       extradsmethods: additional discharge methods to include in classification
     Returns:
@@ -118,13 +140,13 @@ def get_method_count(
 
 
 def get_tag_method_count(
-        pos: Sequence["CFunctionPO"],
+        pos: Iterable["CFunctionPO"],
         filefilter: Callable[[str], bool] = lambda f: True,
         extradsmethods: List[str] = []) -> Dict[str, Dict[str, int]]:
     """Create predicate tag, discharge method count dictionary.
 
     Args:
-      pos: flat list of proof obligations (primary or secondary)
+      pos: proof obligations (primary or secondary)
       filefilter: predicate that specifies which c files to include
       extradsmethods: additional discharge methods to include in classification
     Returns:
@@ -145,13 +167,13 @@ def get_tag_method_count(
 
 
 def get_file_method_count(
-        pos: Sequence["CFunctionPO"],
+        pos: Iterable["CFunctionPO"],
         filefilter: Callable[[str], bool] = lambda f: True,
         extradsmethods: List[str] = []) -> Dict[str, Dict[str, int]]:
     """Create file, discharge method count dictionary from proof obligation list.
 
     Args:
-      pos: flat list of proof obligations (primary or secondary)
+      pos: proof obligations (primary or secondary)
       filefilter: predicate that specifies which c files to include
       extradsmethods: additional discharge methods to include in classification
     Returns:
@@ -171,13 +193,62 @@ def get_file_method_count(
     return result
 
 
+def add_file_tag_method_count(
+        po: "CFunctionPO",
+        fileresult: Dict[str, Dict[str, int]],
+        tagresult: Dict[str, Dict[str, int]],
+        dsmethods: List[str]) -> None:
+    """Classify proof obligation in the file and tag dictionaries (updated)."""
+
+    pofile = po.cfile.name
+    tag = po.predicate_name
+    if pofile not in fileresult:
+        fileresult[pofile] = {}
+        for dm in dsmethods:
+            fileresult[pofile][dm] = 0
+    if tag not in tagresult:
+        tagresult[tag] = {}
+        for dm in dsmethods:
+            tagresult[tag][dm] = 0
+    classifypo(po, fileresult[pofile])
+    classifypo(po, tagresult[tag])
+
+
+def get_project_method_counts(
+        capp: "CApplication",
+        filefilter: Callable[[str], bool] = lambda f: True,
+        extradsmethods: List[str] = []) -> Tuple[
+            Dict[str, Dict[str, int]], Dict[str, Dict[str, int]],
+            Dict[str, Dict[str, int]], Dict[str, Dict[str, int]]]:
+    """Create the file and tag discharge method counts of a project.
+
+    The primary and supporting proof obligations are visited in one pass,
+    one function at a time, and released once they have been counted.
+
+    Returns:
+      file and tag counts for primary, and file and tag counts for supporting
+      proof obligations
+    """
+    pporesults: Dict[str, Dict[str, int]] = {}
+    tagpporesults: Dict[str, Dict[str, int]] = {}
+    sporesults: Dict[str, Dict[str, int]] = {}
+    tagsporesults: Dict[str, Dict[str, int]] = {}
+    dsmethods = get_dsmethods(extradsmethods)
+    for po in capp.iter_pos(filefilter=filefilter, release=True):
+        if po.is_ppo:
+            add_file_tag_method_count(po, pporesults, tagpporesults, dsmethods)
+        else:
+            add_file_tag_method_count(po, sporesults, tagsporesults, dsmethods)
+    return (pporesults, tagpporesults, sporesults, tagsporesults)
+
+
 def get_function_method_count(
-        pos: Sequence["CFunctionPO"],
+        pos: Iterable["CFunctionPO"],
         extradsmethods: List[str] = []) -> Dict[str, Dict[str, int]]:
     """Create function, discharge method count dictionary from proof obligation list.
 
     Args:
-      pos: flat list of proof obligations (primary or supporting)
+      pos: proof obligations (primary or supporting)
       filefilter: predicate that specifies which c files to include
       extradsmethods: additional discharge methods to include in classification
     Returns:
@@ -260,6 +331,8 @@ class FunctionDisplay:
         self._cfunction = cfunction
         self._sourcecodeavailable = sourcecodeavailable
         self._currentline = self._cfunction.get_location().line + 1
+        self._factstrings: Dict[int, str] = {}
+        self._contextinvariants: Dict["ProgramContext", str] = {}
 
     @property
     def cfunction(self) -> "CFunction":
@@ -284,9 +357,18 @@ class FunctionDisplay:
     def get_source_line(self, line: int) -> str:
         srcline = self.cfile.get_source_line(line)
         if srcline is not None:
-            return self.cfile.get_source_line(line).strip()
+            return srcline.strip()
         return "?"
 
+    def _invariant_fact_string(self, index: int) -> str:
+        """Returns the rendering of an invariant fact, rendered once."""
+
+        result = self._factstrings.get(index)
+        if result is None:
+            result = str(self.cfinvd.get_invariant_fact(index))
+            self._factstrings[index] = result
+        return result
+
     def pos_no_code_to_string(
             self,
             pos: Sequence["CFunctionPO"],
@@ -305,8 +387,7 @@ class FunctionDisplay:
                 deps = po.dependencies.invs
                 lines.append(
                     ("\n" + " " * indent).join(
-                        str(self.cfunction.invdictionary.get_invariant_fact(i)
-                            for i in deps)))
+                        self._invariant_fact_string(i) for i in deps))
             else:
                 lines.append("\n<?> " + str(po))
                 if po.has_diagnostic():
@@ -343,9 +424,24 @@ class FunctionDisplay:
             pos: Sequence["CFunctionPO"],
             pofilter: Callable[["CFunctionPO"], bool] = lambda po: True,
             showinvs: bool = False) -> str:
+        return self.lines_on_code_tostring(
+            group_by_line(pos), pofilter=pofilter, showinvs=showinvs)
+
+    def lines_on_code_tostring(
+            self,
+            posbyline: Dict[int, List["CFunctionPO"]],
+            pofilter: Callable[["CFunctionPO"], bool] = lambda po: True,
+            showinvs: bool = False) -> str:
+        """Returns the source code interleaved with the proof obligations.
+
+        The proof obligations are given grouped by line, in ascending line
+        order (e.g., as in CFunctionProofs.ppos_by_line), so that each source
+        line and each proof obligation is visited only once.
+        """
+
         lines: List[str] = []
         contexts: Set["ProgramContext"] = set([])
-        for po in sorted(pos, key=lambda po: po.line):
+        for po in itertools.chain.from_iterable(posbyline.values()):
             if not pofilter(po):
                 if po.line >= self._currentline:
                     if self.sourcecodeavailable:
@@ -361,10 +457,12 @@ class FunctionDisplay:
                         "\n"
                         + (" " * indent)
                         + "-------- context invariants --------")
+                    cinvs = self._get_contexts_invariants(contexts)
                     for c in contexts:
-                        lines.append((" " * indent) + str(c))
-                        lines.append((" " * indent) + ("-" * len(str(c))))
-                        lines.append(str(self._get_context_invariants(c)))
+                        cstr = str(c)
+                        lines.append((" " * indent) + cstr)
+                        lines.append((" " * indent) + ("-" * len(cstr)))
+                        lines.append(cinvs[c])
                         lines.append(" ")
                 lines.append("-" * 80)
                 if self.sourcecodeavailable:
@@ -391,9 +489,8 @@ class FunctionDisplay:
                 lines.append((" " * indent) + str(expl))
                 deps = po.dependencies.invs
                 lines.append(
-                    ("\n" + " " * indent).join(str(
-                        self.cfunction.invdictionary.get_invariant_fact(i))
-                                               for i in deps))
+                    ("\n" + " " * indent).join(
+                        self._invariant_fact_string(i) for i in deps))
             else:
                 contexts.add(po.context)
                 lines.append("\n<?> " + str(po))
@@ -433,27 +530,38 @@ class FunctionDisplay:
         if len(contexts) > 0 and showinvs:
             lines.append(
                 "\n" + (" " * indent) + "-------- context invariants --------")
+            cinvs = self._get_contexts_invariants(contexts)
             for c in contexts:
                 lines.append((" " * indent) + "=== " + str(c) + " ===")
-                lines.append(str(self._get_context_invariants(c)))
+                lines.append(cinvs[c])
                 lines.append(" ")
 
         self._currentline = self.fline + 1
         return "\n".join(lines)
 
     def _get_po_invariants(self, context: "ProgramContext", poId: int) -> str:
-        lines: List[str] = []
         invs = self.cfunction.invarianttable.get_po_invariants(context, poId)
-        for inv in invs:
-            lines.append((" " * 18) + str(inv))
-        return "\n".join(lines)
+        return "\n".join(
+            (" " * 18) + self._invariant_fact_string(inv.index) for inv in invs)
 
-    def _get_context_invariants(self, context: "ProgramContext") -> str:
-        lines: List[str] = []
-        invs = self.cfunction.invarianttable.get_sorted_invariants(context)
-        for inv in invs:
-            lines.append((" " * 18) + str(inv))
-        return "\n".join(lines)
+    def _get_contexts_invariants(
+            self, contexts: Iterable["ProgramContext"]
+    ) -> Dict["ProgramContext", str]:
+        """Returns the rendered invariants of the given contexts.
+
+        The invariants of contexts not rendered before are retrieved from the
+        invariant table in a single batch.
+        """
+
+        missing = [c for c in contexts if c not in self._contextinvariants]
+        if len(missing) > 0:
+            invtable = self.cfunction.invarianttable
+            cinvs = invtable.get_contexts_sorted_invariants(missing)
+            for (c, invs) in cinvs.items():
+                self._contextinvariants[c] = "\n".join(
+                    (" " * 18) + self._invariant_fact_string(inv.index)
+                    for inv in invs)
+        return {c: self._contextinvariants[c] for c in contexts}
 
 
 def function_pos_to_string(
@@ -477,9 +585,8 @@ def function_code_tostring(
         showinvs: bool = False,
         showpreamble: bool = True) -> str:
     lines: List[str] = []
-    ppos = fn.get_ppos()
-    # ppos = [x for x in ppos if pofilter(x)]
-    spos = fn.get_spos()
+    ppos = fn.get_ppos_by_line()
+    spos = fn.get_spos_by_line()
     if fn.has_line_number():
         fnstartlinenr = fn.get_line_number()
         fnstartline = fn.cfile.get_source_line(fnstartlinenr)
@@ -504,13 +611,15 @@ def function_code_tostring(
     if len(ppos) > 0:
         lines.append("Primary Proof Obligations:")
         lines.append(
-            fd.pos_on_code_tostring(ppos, pofilter=pofilter, showinvs=showinvs)
+            fd.lines_on_code_tostring(
+                ppos, pofilter=pofilter, showinvs=showinvs)
         )
         lines.append("-" * 80)
     if len(spos) > 0:
         lines.append("Supporting Proof Obligations:")
         lines.append(
-            fd.pos_on_code_tostring(spos, pofilter=pofilter, showinvs=showinvs)
+            fd.lines_on_code_tostring(
+                spos, pofilter=pofilter, showinvs=showinvs)
         )
         lines.append("-" * 80)
     return "\n".join(lines)
@@ -602,12 +711,9 @@ def project_proofobligation_stats_tostring(
         filefilter: Callable[[str], bool] = lambda f: True,
         extradsmethods: List[str] = []) -> str:
     lines: List[str] = []
-    ppos = capp.get_ppos()
-    spos = capp.get_spos()
-    pporesults = get_file_method_count(
-        ppos, extradsmethods=extradsmethods, filefilter=filefilter)
-    sporesults = get_file_method_count(
-        spos, extradsmethods=extradsmethods, filefilter=filefilter)
+    (pporesults, tagpporesults, sporesults, tagsporesults) = (
+        get_project_method_counts(
+            capp, filefilter=filefilter, extradsmethods=extradsmethods))
 
     rhlen = capp.get_max_filename_length() + 3
     lines.append(
@@ -617,10 +723,6 @@ def project_proofobligation_stats_tostring(
             rhlen=rhlen,
             header1="c files",
             extradsmethods=extradsmethods))
-    tagpporesults = get_tag_method_count(
-        ppos, filefilter=filefilter, extradsmethods=extradsmethods)
-    tagsporesults = get_tag_method_count(
-        spos, filefilter=filefilter, extradsmethods=extradsmethods)
 
     lines.append("\n\nProof Obligation Statistics")
     lines.append("~" * 80)
@@ -634,16 +736,14 @@ def project_proofobligation_stats_to_dict(
         capp: "CApplication",
         filefilter: Callable[[str], bool] = lambda f: True,
         extradsmethods: List[str] = []) -> Dict[str, Any]:
-    ppos = capp.get_ppos()
-    spos = capp.get_spos()
-    pporesults = get_file_method_count(
-        ppos, extradsmethods=extradsmethods, filefilter=filefilter)
-    sporesults = get_file_method_count(
-        spos, extradsmethods=extradsmethods, filefilter=filefilter)
-    tagpporesults = get_tag_method_count(
-        ppos, filefilter=filefilter, extradsmethods=extradsmethods)
-    tagsporesults = get_tag_method_count(
-        spos, filefilter=filefilter, extradsmethods=extradsmethods)
+    """Returns the proof obligation statistics of the project.
+
+    The proof obligations are released once they have been counted (see
+    get_project_method_counts).
+    """
+    (pporesults, tagpporesults, sporesults, tagsporesults) = (
+        get_project_method_counts(
+            capp, filefilter=filefilter, extradsmethods=extradsmethods))
 
     result: Dict[str, Any] = {}
     result["tagresults"] = {}
@@ -710,9 +810,7 @@ def file_global_assumptions_tostring(cfile: "CFile") -> str:
     lines.append("\nGlobal assumptions")
     lines.append(("-" * 80))
     polines = set([])
-    ppos = cfile.get_ppos()
-    spos = cfile.get_spos()
-    for po in ppos + spos:
+    for po in itertools.chain(cfile.iter_ppos(), cfile.iter_spos()):
         for a in po.get_global_assumptions():
             polines.add(str(a))
     return "\n".join(sorted(lines) + sorted(list(polines)))
@@ -723,9 +821,7 @@ def file_postcondition_assumptions_tostring(cfile: "CFile") -> str:
     lines.append("\nPostcondition assumptions")
     lines.append(("-" * 80))
     polines = set([])
-    ppos = cfile.get_ppos()
-    spos = cfile.get_spos()
-    for po in ppos + spos:
+    for po in itertools.chain(cfile.iter_ppos(), cfile.iter_spos()):
         for a in po.get_postcondition_assumptions():
             polines.add(str(a))
     return "\n".join(lines + sorted(list(polines)))
@@ -27,8 +27,22 @@
 # SOFTWARE.
 # ------------------------------------------------------------------------------
 
+"""Access to the lines of a C source file.
+
+Source lines are read through a CSrcLineIndex: the file is memory-mapped
+and an index of line start offsets (an array of unsigned 64-bit integers)
+is built once; individual lines are decoded only when requested. Indices
+are shared per filename through a small registry, so the same index serves
+the report display (via CSrcFile) and the parse manager; the registry keeps
+a bounded number of files mapped at any time.
+"""
+
+import collections
+import mmap
 import os
-from typing import Dict, TYPE_CHECKING, Optional
+
+from array import array
+from typing import Dict, Iterator, Optional, Tuple, TYPE_CHECKING
 
 import chc.util.fileutil as UF
 from chc.util.loggingutil import chklogger
@@ -37,13 +51,141 @@ if TYPE_CHECKING:
     from chc.app.CApplication import CApplication
 
 
+class CSrcLineIndex:
+    """Line-offset index over a memory-mapped text file.
+
+    Lines are separated by newline characters; a carriage return before
+    the newline is dropped, as with universal newlines. The mapping is
+    opened on demand and can be released with close(); the index itself
+    stays valid and the file is mapped again on the next access.
+
+    Args:
+        filename: name of the file; OSError is raised if it cannot be read
+    """
+
+    def __init__(self, filename: str) -> None:
+        self._filename = filename
+        self._mmap: Optional[mmap.mmap] = None
+        stat = os.stat(filename)
+        self._size = stat.st_size
+        self._mtime = stat.st_mtime_ns
+        self._offsets = array("Q")
+        data = self._data()
+        if data is not None:
+            offsets = self._offsets
+            pos = 0
+            while pos < self._size:
+                offsets.append(pos)
+                nl = data.find(b"\n", pos)
+                if nl < 0:
+                    break
+                pos = nl + 1
+        # sentinel: end of the last line
+        self._offsets.append(self._size)
+
+    @property
+    def filename(self) -> str:
+        return self._filename
+
+    @property
+    def line_count(self) -> int:
+        return len(self._offsets) - 1
+
+    def is_current(self) -> bool:
+        """Returns true if the file has the size and mtime it was indexed at."""
+
+        try:
+            stat = os.stat(self.filename)
+        except OSError:
+            return False
+        return stat.st_size == self._size and stat.st_mtime_ns == self._mtime
+
+    def _data(self) -> Optional[mmap.mmap]:
+        if self._mmap is None and self._size > 0:
+            with open(self.filename, "rb") as fp:
+                self._mmap = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._mmap
+
+    def get_line(self, n: int) -> Optional[str]:
+        """Returns line n (1-based), including its newline, if it exists."""
+
+        if n < 1 or n > self.line_count:
+            return None
+        data = self._data()
+        if data is None:
+            return None
+        line = data[self._offsets[n - 1]:self._offsets[n]]
+        if line.endswith(b"\r\n"):
+            line = line[:-2] + b"\n"
+        return line.decode("utf-8", errors="replace")
+
+    def iter_lines(self) -> Iterator[Tuple[int, str]]:
+        for n in range(1, self.line_count + 1):
+            line = self.get_line(n)
+            if line is not None:
+                yield (n, line)
+
+    def close(self) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+
+class _LineIndexRegistry:
+    """Shared line indices, of which at most maxopen are kept mapped.
+
+    An index is rebuilt when the size or mtime of its file has changed
+    since it was built.
+    """
+
+    def __init__(self, maxopen: int = 32) -> None:
+        self._maxopen = maxopen
+        self._indices: "collections.OrderedDict[str, CSrcLineIndex]" = (
+            collections.OrderedDict())
+
+    def get(self, filename: str) -> CSrcLineIndex:
+        key = os.path.abspath(filename)
+        index = self._indices.get(key)
+        if index is not None and not index.is_current():
+            self.remove(key)
+            index = None
+        if index is None:
+            index = CSrcLineIndex(key)
+            self._indices[key] = index
+            if len(self._indices) > self._maxopen:
+                (_, evicted) = self._indices.popitem(last=False)
+                evicted.close()
+        else:
+            self._indices.move_to_end(key)
+        return index
+
+    def remove(self, filename: str) -> None:
+        index = self._indices.pop(os.path.abspath(filename), None)
+        if index is not None:
+            index.close()
+
+    def clear(self) -> None:
+        for index in self._indices.values():
+            index.close()
+        self._indices.clear()
+
+
+lineindices = _LineIndexRegistry()
+
+
+def get_line_index(filename: str) -> CSrcLineIndex:
+    """Returns the shared line index of filename (raises OSError if absent)."""
+
+    return lineindices.get(filename)
+
+
 class CSrcFile:
     """Represents the text file that holds the C source code."""
 
     def __init__(self, capp: "CApplication", fname: str) -> None:
         self._capp = capp
         self._fname = fname
-        self._lines: Optional[Dict[int, str]] = None
+        self._missing = False
 
     @property
     def capp(self) -> "CApplication":
@@ -55,25 +197,37 @@ class CSrcFile:
 
         return self._fname
 
+    @property
+    def lineindex(self) -> Optional[CSrcLineIndex]:
+        if self._missing:
+            return None
+        try:
+            return get_line_index(self.fname)
+        except OSError:
+            self._missing = True
+            chklogger.logger.warning("Source file %s not found", self.fname)
+            return None
+
     @property
     def lines(self) -> Dict[int, str]:
-        if self._lines is None:
-            self._lines = {}
-            if os.path.isfile(self.fname):
-                n: int = 1
-                with open(self.fname) as fp:
-                    for line in fp:
-                        self._lines[n] = line
-                        n += 1
-            else:
-                chklogger.logger.warning(
-                    "Source file %s not found", self.fname)
-        return self._lines
+        """Returns all lines; prefer iter_lines or get_line for large files."""
+
+        return dict(self.iter_lines())
+
+    def iter_lines(self) -> Iterator[Tuple[int, str]]:
+        lineindex = self.lineindex
+        if lineindex is not None:
+            return lineindex.iter_lines()
+        return iter([])
 
     def get_line_count(self) -> int:
-        return len(self.lines)
+        lineindex = self.lineindex
+        return 0 if lineindex is None else lineindex.line_count
 
     def get_line(self, n: int) -> Optional[str]:
-        if self.get_line_count() > n:
-            return str(n) + "  " + self.lines[n]
+        lineindex = self.lineindex
+        if lineindex is not None and lineindex.line_count > n:
+            line = lineindex.get_line(n)
+            if line is not None:
+                return str(n) + "  " + line
         return None
@@ -27,11 +27,13 @@
 # SOFTWARE.
 # ------------------------------------------------------------------------------
 
+import weakref
 import xml.etree.ElementTree as ET
 
 import chc.util.fileutil as UF
 
-from typing import Callable, Dict, List, Generic, Optional, Tuple, TypeVar
+from typing import (
+    Any, Callable, Dict, Hashable, List, Generic, Optional, Tuple, TypeVar)
 
 
 class IndexedTableError(UF.CHCError):
@@ -117,6 +119,25 @@ def get_rep(node: ET.Element) -> Tuple[int, List[str], List[int]]:
         raise
 
 
+# Compact form of the records of a table: indices, joined tags, joined args.
+# It can be passed between processes much more cheaply than the records.
+TableImage = Tuple[List[int], List[str], List[str]]
+
+
+def get_table_image(node: ET.Element, tag: str = "n") -> TableImage:
+    """Returns the image of the records of an xml table node."""
+
+    indices: List[int] = []
+    tagstrs: List[str] = []
+    argstrs: List[str] = []
+    for snode in node.findall(tag):
+        (index, tags, args) = get_rep(snode)
+        indices.append(index)
+        tagstrs.append(",".join(tags))
+        argstrs.append(",".join([str(x) for x in args]))
+    return (indices, tagstrs, argstrs)
+
+
 def get_key(tags: List[str], args: List[int]) -> Tuple[str, str]:
     return (",".join(tags), ",".join([str(x) for x in args]))
 
@@ -376,6 +397,18 @@ class IndexedTable(IndexedTableSuperclass):
             if index >= self.next:
                 self.next = index + 1
 
+    def read_image(self, image: TableImage) -> None:
+        """Adds the records of an image produced by get_table_image."""
+
+        (indices, tagstrs, argstrs) = image
+        for (index, tagstr, argstr) in zip(indices, tagstrs, argstrs):
+            tags = tagstr.split(",") if tagstr else []
+            args = [int(x) for x in argstr.split(",")] if argstr else []
+            self.keytable[(tagstr, argstr)] = index
+            self.indextable[index] = IndexedTableValue(index, tags, args)
+            if index >= self.next:
+                self.next = index + 1
+
     def objectmap(
             self,
             p: Callable[[int], IndexedTableValue]) -> Dict[int, IndexedTableValue]:
@@ -397,3 +430,67 @@ class IndexedTable(IndexedTableSuperclass):
         if self.checkpoint is not None:
             lines.append("Checkpoint: " + str(self.checkpoint))
         return "\n".join(lines)
+
+
+class IndexTranslationMemo:
+    """Memo of the translation of indexed objects into a target dictionary.
+
+    Translating an object from one dictionary (e.g., a file dictionary) into
+    another (e.g., the global dictionary) recursively re-indexes all of its
+    subterms. The memo records, per source dictionary, the target index
+    obtained for each (table name, source index, context) triple, so that
+    subterms shared between objects are translated only once. The context
+    holds any additional arguments the translation depends on (e.g., the
+    file index and substitution).
+
+    Source dictionaries are held by weak reference, so the memo does not keep
+    dictionaries of unloaded files alive. Entries must be discarded (with
+    reset) whenever the cross references the translation relies on change.
+    """
+
+    def __init__(self) -> None:
+        self._memo: "weakref.WeakKeyDictionary[Any, Dict[Tuple[str, int, Hashable], int]]" = (
+            weakref.WeakKeyDictionary())
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    def translate(
+            self,
+            source: Any,
+            table: str,
+            index: int,
+            f: Callable[[], int],
+            context: Hashable = None) -> int:
+        """Returns the target index for index in table of source.
+
+        The translation function f is called only if no translation has been
+        recorded yet; failed translations (exceptions) are not recorded.
+        """
+
+        entries = self._memo.get(source)
+        if entries is None:
+            entries = {}
+            self._memo[source] = entries
+        key = (table, index, context)
+        result = entries.get(key)
+        if result is not None:
+            self._hits += 1
+            return result
+        self._misses += 1
+        result = f()
+        entries[key] = result
+        return result
+
+    def size(self) -> int:
+        return sum(len(entries) for entries in self._memo.values())
+
+    def reset(self) -> None:
+        self._memo = weakref.WeakKeyDictionary()
@@ -27,7 +27,7 @@
 # SOFTWARE.
 # ------------------------------------------------------------------------------
 
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 import xml.etree.ElementTree as ET
 
 import chc.util.IndexedTable as IT
@@ -84,6 +84,20 @@ def encode(s: str) -> Tuple[bool, str]:
         return (False, s)
 
 
+def get_string_table_image(node: ET.Element) -> List[Tuple[int, str]]:
+    """Returns the (index, decoded string) pairs of an xml string table."""
+
+    result: List[Tuple[int, str]] = []
+    for snode in node.findall("n"):
+        xml_ix = snode.get("ix")
+        xml_v = snode.get("v")
+        if xml_ix is None or xml_v is None:
+            raise IndexedTableError("`ix` or `v` missing from element")
+        ishex = snode.get("hex", "no") == "yes"
+        result.append((int(xml_ix), decode(ishex, xml_v)))
+    return result
+
+
 class IndexedTableError(Exception):
     def __init__(self, msg: str) -> None:
         self.msg = msg
@@ -155,6 +169,15 @@ class StringIndexedTable:
             if index >= self.next:
                 self.next = index + 1
 
+    def read_image(self, image: List[Tuple[int, str]]) -> None:
+        """Adds the (index, string) pairs produced by get_string_table_image."""
+
+        for (index, s) in image:
+            self.stringtable[s] = index
+            self.indextable[index] = s
+            if index >= self.next:
+                self.next = index + 1
+
     def write_xml(self, node: ET.Element) -> None:
         for index in sorted(self.indextable):
             s = self.indextable[index]
@@ -73,6 +73,7 @@ multiple stages:
     producing the files:
 
     - tp/pn.cch/a/fp/x/x_gxrefs.xml
+    - tp/pn.cch/a/pn_gxrefs.bin
     - tp/pn.cch/a/globaldefinitions.xml
     - tp/pn.cch/a/target_files.xml
 
@@ -129,6 +130,7 @@ import chc.util.xmlutil as UX
 
 from chc.util.Config import Config
 from chc.util.loggingutil import chklogger
+from chc.util.profileutil import chcprofiler
 
 if TYPE_CHECKING:
     from chc.app.CFile import CFile
@@ -452,6 +454,9 @@ def get_xnode(
     filename: str, rootnode: str, desc: str, show: bool = True
 ) -> Optional[ET.Element]:
     if os.path.isfile(filename):
+        if chcprofiler.enabled:
+            chcprofiler.count("xml-files", rootnode)
+            chcprofiler.count("xml-bytes", rootnode, os.path.getsize(filename))
         try:
             tree = ET.parse(filename)
             root = tree.getroot()
@@ -730,6 +735,21 @@ def get_global_definitions_filename(targetpath: str, projectname: str) -> str:
     return os.path.join(path, "globaldefinitions.xml")
 
 
+def get_xref_tables_filename(targetpath: str, projectname: str) -> str:
+    path = get_analysisresults_path(targetpath, projectname)
+    return os.path.join(path, projectname + "_gxrefs.bin")
+
+
+def get_snapshot_filename(targetpath: str, projectname: str) -> str:
+    path = get_analysisresults_path(targetpath, projectname)
+    return os.path.join(path, projectname + "_snapshot.bin")
+
+
+def get_analysis_stamp_filename(targetpath: str, projectname: str) -> str:
+    path = get_analysisresults_path(targetpath, projectname)
+    return os.path.join(path, projectname + "_analysisstamp.txt")
+
+
 def archive_project_summary_results(path: str, projectname: str) -> None:
     if os.path.isdir(path):
         projectsummary = projectname + "_summaryresults"
@@ -755,6 +775,43 @@ def save_project_summary_results(
         json.dump(d, fp)
 
 
+def get_project_profile_filename(path: str, projectname: str) -> str:
+    return os.path.join(path, projectname + "_profile.json")
+
+
+def load_project_profile(path: str, projectname: str) -> Dict[str, Any]:
+    """Returns the saved profiles of the project, keyed by command."""
+
+    filename = get_project_profile_filename(path, projectname)
+    if os.path.isfile(filename):
+        with open(filename) as fp:
+            return json.load(fp)
+    return {}
+
+
+def save_project_profile(
+        path: str, projectname: str, command: str, d: Dict[str, Any]) -> None:
+    """Saves the profile of a command, retaining those of other commands."""
+
+    profiles = load_project_profile(path, projectname)
+    profiles[command] = d
+    filename = get_project_profile_filename(path, projectname)
+    with open(filename, "w") as fp:
+        json.dump(profiles, fp, indent=2)
+
+
+def get_analysis_history_filename(path: str, projectname: str) -> str:
+    return os.path.join(path, projectname + "_analysishistory.json")
+
+
+def get_analyzer_runs_filename(path: str, projectname: str) -> str:
+    return os.path.join(path, projectname + "_analyzerruns.ndjson")
+
+
+def get_analyzer_report_filename(path: str, projectname: str) -> str:
+    return os.path.join(path, projectname + "_analyzerreport.json")
+
+
 def save_project_summary_results_as_xml(
         path: str, projectname: str, d: Dict[str, Any]) -> None:
     projectsummary = projectname + "_summaryresults"
@@ -1044,6 +1101,15 @@ def get_cfile_directory(path: str, cfilename: str) -> str:
     return os.path.join(path, get_cfilenamebase(cfilename))
 
 
+def get_cfile_poindex_filename(
+        targetpath: str,
+        projectname: str,
+        cfilepath: Optional[str],
+        cfilename: str) -> str:
+    filepath = get_cfile_filepath(targetpath, projectname, cfilepath, cfilename)
+    return os.path.join(filepath, cfilename + "_poindex.json")
+
+
 def get_cfile_logfiles_directory(
         targetpath: str,
         projectname: str,
@@ -1573,6 +1639,10 @@ def get_kendra_cpath(cfilename: str) -> str:
         raise CHCFileNotFoundError(cfilename)
 
 
+def get_kendra_results_cache_filename() -> str:
+    return os.path.join(get_kendra_path(), "kendra_results_cache.json")
+
+
 # --------------------------------------------------------- regression tests ---
 
 def get_regression_test_path() -> str:
@@ -1590,6 +1660,11 @@ def get_regression_tests_json_file() -> str:
     return os.path.join(get_regression_test_path(), "tests.json")
 
 
+def get_regression_results_cache_filename() -> str:
+    return os.path.join(
+        get_regression_test_path(), "regression_results_cache.json")
+
+
 # --------------------------------------------------------libc summary tests ---
 
 
@@ -1744,7 +1819,14 @@ def chtime(t: float) -> str:
     return time.strftime("%Y-%m-%d %H:%m", time.localtime(t))
 
 
-def get_juliet_result_times(cwe: str, test: str) -> Tuple[str, str]:
+def get_juliet_result_mtimes(cwe: str, test: str) -> Tuple[float, float]:
+    """Returns the modification times of the analysis results and the score.
+
+    The analysis time is the latest modification time of any file in the
+    analysis directory, as results are rewritten in place by the analyzer.
+    A time of 0.0 indicates that the results (or score) are not present.
+    """
+
     t1 = 0.0
     t2 = 0.0
     path = get_juliet_testpath(cwe, test)
@@ -1754,12 +1836,32 @@ def get_juliet_result_times(cwe: str, test: str) -> Tuple[str, str]:
         analysispath = os.path.join(cchpath, "a")
         if os.path.isdir(analysispath):
             t1 = os.path.getmtime(analysispath)
+            for (d, _, fnames) in os.walk(analysispath):
+                for fname in fnames:
+                    t1 = max(t1, os.path.getmtime(os.path.join(d, fname)))
     resultsfile = os.path.join(path, "jsummaryresults.json")
     if os.path.isfile(resultsfile):
         t2 = os.path.getmtime(resultsfile)
+    return (t1, t2)
+
+
+def get_juliet_result_times(cwe: str, test: str) -> Tuple[str, str]:
+    (t1, t2) = get_juliet_result_mtimes(cwe, test)
     return (chtime(t1), chtime(t2))
 
 
+def is_juliet_score_current(cwe: str, test: str) -> bool:
+    """Returns true if the score is newer than the analysis results and key."""
+
+    (t1, t2) = get_juliet_result_mtimes(cwe, test)
+    if t1 == 0.0 or t2 == 0.0:
+        return False
+    scorekey = os.path.join(get_juliet_testpath(cwe, test), "scorekey.json")
+    if os.path.isfile(scorekey) and os.path.getmtime(scorekey) > t2:
+        return False
+    return t2 > t1
+
+
 # ----------------------------------------------------------- itc tests  ------
 
 
@@ -28,7 +28,7 @@
 
 import logging
 from enum import Enum
-from typing import Optional, Union
+from typing import Any, Dict, Optional, Union
 
 
 class LogLevel(str, Enum):
@@ -57,11 +57,69 @@ class CHKLogger:
     def __init__(self) -> None:
         self._logger = logging.getLogger("silent")
         self._logger.addHandler(logging.NullHandler())
+        self._warninglimit: Optional[int] = None
+        self._aggregated: Dict[str, int] = {}
 
     @property
     def logger(self) -> logging.Logger:
         return self._logger
 
+    @property
+    def debug_enabled(self) -> bool:
+        return self._logger.isEnabledFor(logging.DEBUG)
+
+    @property
+    def info_enabled(self) -> bool:
+        return self._logger.isEnabledFor(logging.INFO)
+
+    @property
+    def warning_limit(self) -> Optional[int]:
+        """Number of aggregated warnings per key that are logged in full.
+
+        None (the default) means that aggregation is disabled.
+        """
+
+        return self._warninglimit
+
+    def set_warning_limit(self, limit: Optional[int]) -> None:
+        self._warninglimit = limit
+
+    @property
+    def aggregated_warnings(self) -> Dict[str, int]:
+        """Returns the number of aggregated warnings per key."""
+
+        return self._aggregated
+
+    def aggregate_warning(self, key: str, msg: str, *args: Any) -> None:
+        """Logs a warning that belongs to a (possibly large) class of warnings.
+
+        If a warning limit is set (and the log level is above DEBUG) the
+        first warning_limit warnings with the same key are logged in full;
+        the remaining ones are only counted (their arguments are not
+        rendered) and reported by flush_aggregated_warnings. Otherwise all
+        warnings are logged.
+        """
+
+        if self._warninglimit is None or self.debug_enabled:
+            self._logger.warning(msg, *args, stacklevel=2)
+            return
+
+        count = self._aggregated.get(key, 0) + 1
+        self._aggregated[key] = count
+        if count <= self._warninglimit:
+            self._logger.warning(msg, *args, stacklevel=2)
+
+    def flush_aggregated_warnings(self) -> None:
+        """Logs the number of suppressed warnings per key and resets counts."""
+
+        limit = self._warninglimit
+        if limit is not None:
+            for (key, count) in sorted(self._aggregated.items()):
+                if count > limit:
+                    self._logger.warning(
+                        "%d %s (%d not shown)", count, key, count - limit)
+        self._aggregated = {}
+
     def set_chkc_logger(
             self,
             initmsg: str = "",
@@ -0,0 +1,226 @@
+# ------------------------------------------------------------------------------
+# CodeHawk C Analyzer
+# Author: Henny Sipma
+# ------------------------------------------------------------------------------
+# The MIT License (MIT)
+#
+# Copyright (c) 2026  Aarno Labs LLC
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ------------------------------------------------------------------------------
+"""Phase profiler for analysis runs.
+
+The profiler records nested, named spans of wall-clock time and named
+counters (e.g., xml files and bytes read, objects created per dictionary).
+Spans with the same name at the same position in the span tree are
+aggregated. When the profiler is disabled (the default) opening a span
+returns a shared no-op context manager and counting is guarded by a single
+attribute test at the call site, so instrumentation can stay in place.
+
+Usage:
+
+  with chcprofiler.span("link"):
+      ...
+
+  if chcprofiler.enabled:
+      chcprofiler.count("xml-files", "function")
+"""
+
+import time
+
+from typing import Any, Dict, List, Optional
+
+
+class ProfileSpan:
+    """Aggregated timing of all occurrences of a span at one tree position."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.count = 0
+        self.total = 0.0
+        self.maxtime = 0.0
+        self.children: Dict[str, "ProfileSpan"] = {}
+
+    def child(self, name: str) -> "ProfileSpan":
+        result = self.children.get(name)
+        if result is None:
+            result = ProfileSpan(name)
+            self.children[name] = result
+        return result
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        if seconds > self.maxtime:
+            self.maxtime = seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        result: Dict[str, Any] = {}
+        result["name"] = self.name
+        result["count"] = self.count
+        result["total"] = round(self.total, 6)
+        result["max"] = round(self.maxtime, 6)
+        if len(self.children) > 0:
+            result["children"] = [
+                c.to_dict() for c in self.children.values()]
+        return result
+
+
+class _ActiveSpan:
+
+    def __init__(self, profiler: "PhaseProfiler", name: str) -> None:
+        self._profiler = profiler
+        self._name = name
+        self._t0 = 0.0
+
+    def __enter__(self) -> "_ActiveSpan":
+        self._profiler._push(self._name)
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self._profiler._pop(time.perf_counter() - self._t0)
+
+
+class _NullSpan:
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        pass
+
+
+_nullspan = _NullSpan()
+
+
+class PhaseProfiler:
+    """Collects spans and counters for one run of a command."""
+
+    def __init__(self) -> None:
+        self._enabled = False
+        self.reset()
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    def enable(self) -> None:
+        self.reset()
+        self._enabled = True
+
+    def disable(self) -> None:
+        self._enabled = False
+
+    def reset(self) -> None:
+        self._root = ProfileSpan("total")
+        self._stack: List[ProfileSpan] = [self._root]
+        self._counters: Dict[str, Dict[str, int]] = {}
+        self._starttime = time.time()
+        self._t0 = time.perf_counter()
+
+    @property
+    def current(self) -> ProfileSpan:
+        return self._stack[-1]
+
+    def span(self, name: str) -> Any:
+        """Returns a context manager that times the enclosed block."""
+
+        if not self._enabled:
+            return _nullspan
+        return _ActiveSpan(self, name)
+
+    def _push(self, name: str) -> None:
+        self._stack.append(self.current.child(name))
+
+    def _pop(self, seconds: float) -> None:
+        if len(self._stack) > 1:
+            self._stack.pop().add(seconds)
+
+    def record(self, name: str, seconds: float) -> None:
+        """Adds a span measured elsewhere (e.g., in a worker process)."""
+
+        if self._enabled:
+            self.current.child(name).add(seconds)
+
+    def count(self, category: str, name: str, n: int = 1) -> None:
+        if self._enabled:
+            counters = self._counters.setdefault(category, {})
+            counters[name] = counters.get(name, 0) + n
+
+    def to_dict(self) -> Dict[str, Any]:
+        root = self._root
+        root.count = 1
+        root.total = time.perf_counter() - self._t0
+        root.maxtime = root.total
+        result: Dict[str, Any] = {}
+        result["starttime"] = self._starttime
+        result["spans"] = root.to_dict()
+        result["counters"] = self._counters
+        return result
+
+
+chcprofiler = PhaseProfiler()
+
+
+def spans_to_string(
+        span: Dict[str, Any],
+        indent: int = 0,
+        parenttotal: Optional[float] = None) -> List[str]:
+    total = span["total"]
+    if parenttotal is not None and parenttotal > 0.0:
+        pct = "{:6.1f}%".format(100.0 * total / parenttotal)
+    else:
+        pct = " " * 7
+    count = span["count"]
+    name = (" " * indent) + span["name"]
+    lines: List[str] = []
+    lines.append(
+        name.ljust(48)
+        + str(count).rjust(7)
+        + "{:12.3f}".format(total)
+        + "{:12.3f}".format(span["max"] if count > 1 else total)
+        + "  " + pct)
+    children = sorted(
+        span.get("children", []), key=lambda c: c["total"], reverse=True)
+    for c in children:
+        lines.extend(spans_to_string(c, indent + 2, total))
+    return lines
+
+
+def profile_to_string(d: Dict[str, Any]) -> str:
+    """Returns a text rendering of a profile produced by to_dict."""
+
+    lines: List[str] = []
+    lines.append(
+        "span".ljust(48)
+        + "count".rjust(7)
+        + "total (s)".rjust(12)
+        + "max (s)".rjust(12)
+        + "  of parent")
+    lines.append("-" * 88)
+    lines.extend(spans_to_string(d["spans"]))
+    for (category, counters) in sorted(d.get("counters", {}).items()):
+        lines.append("")
+        lines.append(category)
+        lines.append("-" * 88)
+        for (name, n) in sorted(
+                counters.items(), key=lambda p: p[1], reverse=True):
+            lines.append("  " + name.ljust(60) + str(n).rjust(16))
+    return "\n".join(lines)